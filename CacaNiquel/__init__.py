@@ -1,3 +1,10 @@
 """Pacote do jogo de caça-níquel."""
 
-from .gui import run_app  # noqa: F401
+
+def __getattr__(nome: str) -> object:
+    # Carrega a interface só quando pedida, para que ``CacaNiquel.game`` não importe o tkinter.
+    if nome in {"run_app"}:
+        from . import gui
+
+        return getattr(gui, nome)
+    raise AttributeError(f"módulo {__name__!r} não possui o atributo {nome!r}")
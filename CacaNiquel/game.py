@@ -3,31 +3,41 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cache
+from itertools import compress
+from operator import getitem
 import random
+import struct
+from typing import TYPE_CHECKING
 
-Symbol = tuple[str, int, float]
+import tabelas
+from dinheiro import Centavos, para_centavos
 
-SYMBOLS: tuple[Symbol, ...] = (
-    ("CHERRY", 22, 5.0),
-    ("LEMON", 20, 3.0),
-    ("ORANGE", 18, 3.5),
-    ("PLUM", 16, 4.5),
-    ("BELL", 12, 7.0),
-    ("STAR", 10, 9.0),
-    ("BAR", 8, 12.0),
-    ("SEVEN", 4, 20.0),
-)
+if TYPE_CHECKING:
+    from jackpot import Jackpot
 
-SYMBOL_NAMES = [s[0] for s in SYMBOLS]
-SYMBOL_WEIGHTS = [s[1] for s in SYMBOLS]
-SYMBOL_MULTIPLIERS = {s[0]: s[2] for s in SYMBOLS}
+_BYTES = {"H": 2, "I": 4}
 
 
 @dataclass
 class SpinResult:
-    symbols: tuple[str, str, str]
+    """Um giro; ``aposta`` é o total, somando a aposta de todas as linhas.
+
+    ``symbols`` são os da linha de pagamento principal e ``grade`` os
+    símbolos à vista, rolo a rolo, de cima para baixo, a partir da parada de
+    cada faixa em ``paradas``. ``linhas_premiadas`` numera, a partir de
+    zero, as linhas que pagaram entre as ``linhas`` jogadas. ``jackpot`` é
+    o fundo progressivo levado no giro, já incluído em ``ganho``.
+    """
+
+    symbols: tuple[str, ...]
     aposta: float
     ganho: float
+    grade: tuple[tuple[str, ...], ...] = ()
+    linhas: int = 1
+    linhas_premiadas: tuple[int, ...] = ()
+    paradas: tuple[int, ...] = ()
+    jackpot: float = 0.0
 
     @property
     def venceu(self) -> bool:
@@ -37,47 +47,143 @@ class SpinResult:
     def lucro(self) -> float:
         return self.ganho - self.aposta
 
+    @property
+    def aposta_por_linha(self) -> float:
+        return self.aposta / self.linhas
 
-class SlotMachine:
-    """Gerencia o saldo e resolve resultados de giros."""
 
-    def __init__(self, saldo_inicial: float) -> None:
-        if saldo_inicial <= 0:
-            raise ValueError("O saldo inicial precisa ser maior que zero.")
-        self._saldo = float(saldo_inicial)
+def premios_por_linha(tabela: tabelas.TabelaSlot, paradas: list[int], quantidade: int) -> list[int]:
+    """Prêmio em décimos de cada uma das ``quantidade`` primeiras linhas com os rolos em ``paradas``.
 
-    @property
-    def saldo(self) -> float:
-        return round(self._saldo, 2)
+    Uma soma sobre as colunas monta os índices de todas as linhas, cada um
+    no seu campo do inteiro; só a consulta aos prêmios é feita linha a linha.
+    """
+    indices = sum(map(getitem, tabela.colunas, paradas))
+    # A linha 0 ocupa os bits baixos: os campos saem em little-endian em qualquer máquina.
+    empacotados = indices.to_bytes(len(tabela.linhas) * _BYTES[tabela.tipo_campo], "little")
+    premios = tabela.premios
+    return [premios[indice] for indice in _campos(tabela.tipo_campo, quantidade).unpack_from(empacotados)]
 
-    def pode_apostar(self, valor: float) -> bool:
-        return 0 < valor <= self._saldo
 
-    def girar(self, aposta: float) -> SpinResult:
-        if not self.pode_apostar(aposta):
-            raise ValueError("A aposta precisa ser positiva e menor ou igual ao saldo.")
+@cache
+def _campos(tipo_campo: str, quantidade: int) -> struct.Struct:
+    return struct.Struct(f"<{quantidade}{tipo_campo}")
 
-        simbolos = tuple(random.choices(SYMBOL_NAMES, weights=SYMBOL_WEIGHTS, k=3))
-        ganho = self._calcular_premio(simbolos, aposta)
 
-        self._saldo -= aposta
-        if ganho > 0:
-            self._saldo += ganho
+class SlotMachine:
+    """Gerencia o saldo e resolve resultados de giros.
+
+    Símbolos, faixas dos rolos, prêmios, a grade e as linhas de pagamento vêm de
+    ``tabela`` (a de ``tabelas/slot.toml`` por padrão); ela pode ser trocada
+    entre giros. A aposta vale por linha e ``linhas`` escolhe quantas das
+    primeiras linhas da tabela são jogadas (``None``: todas); ao ser
+    definido precisa estar entre 1 e as linhas da tabela, e se a tabela
+    trocada depois tiver menos linhas, o giro joga todas as dela. Com um
+    ``jackpot``, cada giro contribui para ele com a parte da aposta que a
+    tabela define e leva o fundo na combinação de jackpot. As paradas saem
+    de ``rng`` (um ``random.Random`` próprio por padrão).
+    """
+
+    def __init__(
+        self,
+        saldo_inicial: float,
+        tabela: tabelas.TabelaSlot | None = None,
+        linhas: int | None = None,
+        jackpot: Jackpot | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        if saldo_inicial <= 0:
+            raise ValueError("O saldo inicial precisa ser maior que zero.")
+        self._centavos: Centavos = para_centavos(saldo_inicial)
+        self.tabela: tabelas.TabelaSlot = tabela if tabela is not None else tabelas.padrao("slot")
+        self.linhas = linhas
+        self.jackpot = jackpot
+        self.rng = rng if rng is not None else random.Random()
+
+    @property
+    def saldo(self) -> float:
+        return self._centavos / 100
 
-        return SpinResult(symbols=simbolos, aposta=float(aposta), ganho=ganho)
+    @property
+    def saldo_centavos(self) -> Centavos:
+        return self._centavos
 
-    @staticmethod
-    def _calcular_premio(simbolos: tuple[str, str, str], aposta: float) -> float:
-        c1, c2, c3 = simbolos
+    @property
+    def linhas(self) -> int | None:
+        return self._linhas
 
-        if c1 == c2 == c3:
-            multiplicador = SYMBOL_MULTIPLIERS.get(c1, 0)
-            return aposta * multiplicador
+    @linhas.setter
+    def linhas(self, linhas: int | None) -> None:
+        disponiveis = len(self.tabela.linhas)
+        if linhas is not None and not 1 <= linhas <= disponiveis:
+            raise ValueError(f"As linhas jogadas precisam estar entre 1 e {disponiveis}.")
+        self._linhas = linhas
 
-        if c1 == c2 or c2 == c3 or c1 == c3:
-            return aposta * 0.5
+    @property
+    def linhas_ativas(self) -> int:
+        """Quantas linhas um giro joga; limitado às linhas da tabela atual."""
+        disponiveis = len(self.tabela.linhas)
+        return disponiveis if self.linhas is None else min(self.linhas, disponiveis)
 
-        if {c1, c2, c3} == {"BAR", "STAR", "SEVEN"}:
-            return aposta * 5
+    def pode_apostar(self, valor: float) -> bool:
+        aposta = para_centavos(valor)
+        return 0 < aposta and aposta * self.linhas_ativas <= self._centavos
 
-        return 0.0
+    def girar(self, aposta: float) -> SpinResult:
+        """Gira com ``aposta`` em cada linha ativa; o ganho é a soma das linhas."""
+        aposta_centavos = para_centavos(aposta)
+        quantidade = self.linhas_ativas
+        total = aposta_centavos * quantidade
+        if not 0 < aposta_centavos or total > self._centavos:
+            raise ValueError("A aposta precisa ser positiva e o total das linhas não pode passar do saldo.")
+        return self._girar(aposta_centavos, quantidade, total)
+
+    def girar_lote(self, aposta: float, quantidade: int) -> list[SpinResult]:
+        """``quantidade`` giros seguidos com a mesma aposta, como ``girar`` repetido.
+
+        A aposta e as linhas são conferidas uma vez; para no primeiro giro
+        cujo total o saldo não cobre.
+        """
+        aposta_centavos = para_centavos(aposta)
+        linhas = self.linhas_ativas
+        total = aposta_centavos * linhas
+        if not 0 < aposta_centavos or total > self._centavos:
+            raise ValueError("A aposta precisa ser positiva e o total das linhas não pode passar do saldo.")
+        girar = self._girar
+        resultados = []
+        for _ in range(quantidade):
+            if total > self._centavos:
+                break
+            resultados.append(girar(aposta_centavos, linhas, total))
+        return resultados
+
+    def _girar(self, aposta_centavos: Centavos, quantidade: int, total: Centavos) -> SpinResult:
+        tabela = self.tabela
+        # Uma parada por rolo, com a mesma chance para cada posição da faixa.
+        paradas = list(map(self.rng.randrange, map(len, tabela.faixas)))
+        por_linha = premios_por_linha(tabela, paradas, quantidade)
+        decimos = sum(por_linha)
+        # Frações de centavo do prêmio são descartadas.
+        ganho = aposta_centavos * decimos // 10
+
+        grade = tuple(map(getitem, tabela.janelas, paradas))
+        symbols = tuple(map(getitem, grade, tabela.linhas[0]))
+        fundo = 0
+        if self.jackpot is not None and tabela.jackpot_pontos_base:
+            self.jackpot.contribuir(total * tabela.jackpot_pontos_base)
+            if symbols == tabela.jackpot_simbolos:
+                fundo = self.jackpot.premiar()
+                ganho += fundo
+
+        self._centavos += ganho - total
+
+        return SpinResult(
+            symbols=symbols,
+            aposta=total / 100,
+            ganho=ganho / 100,
+            grade=grade,
+            linhas=quantidade,
+            linhas_premiadas=tuple(compress(range(quantidade), por_linha)) if decimos else (),
+            paradas=tuple(paradas),
+            jackpot=fundo / 100,
+        )
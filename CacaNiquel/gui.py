@@ -4,10 +4,17 @@ from __future__ import annotations
 
 import random
 import tkinter as tk
-from tkinter import messagebox, ttk
-from typing import Callable, Protocol
+from tkinter import ttk
+from typing import Callable, Collection
 
-from .game import SYMBOL_NAMES, SlotMachine, SpinResult
+from dinheiro import formatar_reais
+from eventos import assinar_por_quadro
+from painel_automatico import Jogar, PainelAutomatico
+from sessao import CarteiraProtocol, ErroSessao
+from tema import aplicar_tema, fonte, mostrar_erro
+
+from .game import SpinResult
+from .sessao import SessaoSlot, TelaSlot
 
 SYMBOL_EMOJIS = {
     "CHERRY": "🍒",
@@ -21,16 +28,6 @@ SYMBOL_EMOJIS = {
 }
 
 
-def formatar_reais(valor: float) -> str:
-    return f"R${valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-
-
-class CarteiraProtocol(Protocol):
-    saldo: float
-    def depositar(self, valor: float) -> None: ...
-    def retirar(self, valor: float) -> bool: ...
-
-
 class SlotMachineApp:
     """Janela e animação do caça-níquel."""
 
@@ -40,30 +37,27 @@ class SlotMachineApp:
         self.master.resizable(False, False)
         self.master.configure(bg="#1f1f2e")
 
-        self.game: SlotMachine | None = None
+        self.sessao = SessaoSlot()
+        # A grade desenhada é a da tabela com que a janela abre.
+        self._tabela = self.sessao.tabela_atual()
         self._animando = False
-        self._passos_reel: list[int] = [0, 0, 0]
-        self._limites_reel: list[int] = [0, 0, 0]
+        self._passos_reel: list[int] = [0] * self._tabela.rolos
+        self._limites_reel: list[int] = [0] * self._tabela.rolos
         self._resultado_pendente: SpinResult | None = None
-        self._ultima_aposta = 0.0
+        self._tela_pendente: TelaSlot | None = None
+        self._agendamento: str | None = None
+        self._ao_parar: Callable[[], None] | None = None
+        self._aposta_exibida = ""
         self.wallet: CarteiraProtocol | None = None
-        self._saldo_factory: Callable[[], float] | None = None
-        self._reel_states: list[tuple[str, str, str]] = [
-            ("❓", "❓", "❓") for _ in range(3)
-        ]
+        self._cancelar_assinatura: Callable[[], None] | None = None
+        self._reel_states: list[tuple[str, ...]] = [("❓",) * self._tabela.altura for _ in range(self._tabela.rolos)]
 
         self._montar_interface()
+        self.sessao.assinar(self._renderizar)
+        self._renderizar(self.sessao.tela())
 
     def _montar_interface(self) -> None:
-        estilo = ttk.Style()
-        estilo.theme_use("clam")
-        
-        estilo.configure("TFrame", background="#1f1f2e")
-        estilo.configure("TLabel", background="#1f1f2e", foreground="#ffffff", font=("Segoe UI", 10))
-        estilo.configure("TButton", font=("Segoe UI", 10, "bold"), background="#3d3d5c", foreground="#ffffff", borderwidth=0)
-        estilo.map("TButton", background=[("active", "#4d4d70")])
-        estilo.configure("Action.TButton", background="#ffcc00", foreground="#0f0f1a", font=("Segoe UI", 12, "bold"))
-        estilo.map("Action.TButton", background=[("active", "#ffaa00")])
+        aplicar_tema(self.master)
 
         main_frame = ttk.Frame(self.master, padding=20)
         main_frame.pack(fill="both", expand=True)
@@ -71,7 +65,7 @@ class SlotMachineApp:
         # Título Estilizado
         title_lbl = tk.Label(
             main_frame, text="🎰 SUPER SLOTS 🎰", 
-            font=("Segoe UI", 24, "bold"), bg="#1f1f2e", fg="#ffcc00"
+            font=fonte(self.master, "Segoe UI", 24, "bold"), bg="#1f1f2e", fg="#ffcc00"
         )
         title_lbl.pack(pady=(0, 20))
 
@@ -84,21 +78,19 @@ class SlotMachineApp:
         reels_container.pack()
 
         self.reel_columns: list[list[tk.Label]] = []
-        for idx in range(3):
+        for idx in range(self._tabela.rolos):
             coluna_frame = tk.Frame(reels_container, bg="#ffffff", padx=2, pady=0)
             coluna_frame.pack(side="left", padx=2)
 
             coluna_labels: list[tk.Label] = []
-            for linha in range(3):
-                # Linha do meio é a linha de pagamento
-                is_payline = (linha == 1)
+            for linha in range(self._tabela.altura):
                 bg_color = "#ffffff"
                 fg_color = "#000000"
                 
                 label = tk.Label(
                     coluna_frame,
                     text="❓",
-                    font=("Segoe UI Emoji", 40),
+                    font=fonte(self.master, "Segoe UI Emoji", 40),
                     width=2,
                     height=1,
                     bg=bg_color,
@@ -117,8 +109,8 @@ class SlotMachineApp:
         payline_indicator.destroy() # Remove previous attempt
         
         # Setas indicando o meio
-        tk.Label(machine_frame, text="▶", bg="#2c3e50", fg="#ff0000", font=("Arial", 20)).place(x=-5, y=110)
-        tk.Label(machine_frame, text="◀", bg="#2c3e50", fg="#ff0000", font=("Arial", 20)).place(x=330, y=110) # Ajustar X conforme necessário
+        tk.Label(machine_frame, text="▶", bg="#2c3e50", fg="#ff0000", font=fonte(self.master, "Arial", 20)).place(x=-5, y=110)
+        tk.Label(machine_frame, text="◀", bg="#2c3e50", fg="#ff0000", font=fonte(self.master, "Arial", 20)).place(x=330, y=110) # Ajustar X conforme necessário
 
 
         # --- Painel de Controle ---
@@ -130,86 +122,132 @@ class SlotMachineApp:
         info_frame.pack(fill="x", pady=5)
         
         self.saldo_var = tk.StringVar(value="Saldo: R$0,00")
-        ttk.Label(info_frame, textvariable=self.saldo_var, font=("Segoe UI", 14, "bold"), foreground="#00ff88").pack()
+        ttk.Label(info_frame, textvariable=self.saldo_var, font=fonte(self.master, "Segoe UI", 14, "bold"), foreground="#00ff88").pack()
+
+        # Fundo do jackpot progressivo, quando a tabela tem um
+        self.jackpot_var = tk.StringVar(value="")
+        if self._tabela.jackpot_pontos_base:
+            ttk.Label(info_frame, textvariable=self.jackpot_var, font=fonte(self.master, "Segoe UI", 12, "bold"), foreground="#ffcc00").pack()
 
         # Aposta e Botão
         action_frame = ttk.Frame(control_panel)
         action_frame.pack(fill="x", pady=10)
 
-        ttk.Label(action_frame, text="Aposta:").pack(side="left")
+        varias_linhas = len(self._tabela.linhas) > 1
+        ttk.Label(action_frame, text="Aposta por linha:" if varias_linhas else "Aposta:").pack(side="left")
         self.aposta_var = tk.StringVar(value="10,00")
         self.aposta_entry = ttk.Entry(action_frame, textvariable=self.aposta_var, width=10)
         self.aposta_entry.pack(side="left", padx=5)
 
-        self.spin_button = ttk.Button(action_frame, text="GIRAR!", command=self._girar, state="disabled", style="Action.TButton")
+        self.linhas_var = tk.StringVar(value=str(len(self._tabela.linhas)))
+        self.linhas_combo: ttk.Combobox | None = None
+        if varias_linhas:
+            ttk.Label(action_frame, text="Linhas:").pack(side="left")
+            self.linhas_combo = ttk.Combobox(
+                action_frame,
+                textvariable=self.linhas_var,
+                values=[str(n) for n in range(1, len(self._tabela.linhas) + 1)],
+                state="readonly",
+                width=3,
+            )
+            self.linhas_combo.pack(side="left", padx=5)
+            self.linhas_combo.bind("<<ComboboxSelected>>", self._selecionar_linhas)
+
+        self.spin_button = ttk.Button(action_frame, text="GIRAR!", command=self._girar, state="disabled", style="Jackpot.TButton")
         self.spin_button.pack(side="left", padx=20, fill="x", expand=True)
 
+        self.automatico = PainelAutomatico(
+            control_panel,
+            self.sessao,
+            self.aposta_var.get,
+            self._girar_automatico,
+            lambda _ativo: self._renderizar(self.sessao.tela()),
+        )
+        self.automatico.pack(fill="x", pady=(0, 5))
+
         # Status
         self.status_var = tk.StringVar(value="Insira saldo para jogar.")
-        status_lbl = tk.Label(main_frame, textvariable=self.status_var, bg="#1f1f2e", fg="#aaaaaa", font=("Segoe UI", 10), wraplength=350)
+        status_lbl = tk.Label(main_frame, textvariable=self.status_var, bg="#1f1f2e", fg="#aaaaaa", font=fonte(self.master, "Segoe UI", 10), wraplength=350)
         status_lbl.pack(pady=5)
 
-        # Config Inicial (Hidden)
-        self.saldo_inicial_var = tk.StringVar(value="200,00")
 
-
-    def set_wallet(self, wallet: CarteiraProtocol, saldo_factory: Callable[[], float]) -> None:
+    def set_wallet(self, wallet: CarteiraProtocol) -> None:
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
         self.wallet = wallet
-        self._saldo_factory = saldo_factory
-        self._atualizar_saldo_compartilhado()
-        self.status_var.set("Pronto para jogar!")
-        self._iniciar_jogo_auto() # Auto-init se tiver carteira
-
-    def _iniciar_jogo_auto(self) -> None:
-        if self.wallet and self._saldo_factory:
-            saldo = self._saldo_factory()
-            if saldo > 0:
-                self.game = SlotMachine(saldo)
-                self._atualizar_saldo()
-                self._habilitar_controles(True)
-                self._resetar_reels()
+        self._cancelar_assinatura = assinar_por_quadro(self.master, wallet, self._atualizar_saldo_compartilhado)
+        self.sessao.conectar_carteira(wallet)  # Com saldo, o jogo já começa
+
+    def resetar(self) -> None:
+        """Devolve a janela ao estado inicial para ser reaproveitada pelo Hub.
+
+        O resultado de um giro já vai para a carteira e o histórico quando os
+        rolos começam a girar; aqui só a animação é interrompida.
+        """
+        if self._agendamento is not None:
+            self.master.after_cancel(self._agendamento)
+            self._agendamento = None
+        self.automatico.cancelar()
+        self._animando = False
+        self._resultado_pendente = None
+        self._tela_pendente = None
+        self._ao_parar = None
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
+            self._cancelar_assinatura = None
+        self.wallet = None
+        self.sessao.resetar()
 
     def _habilitar_controles(self, habilitar: bool) -> None:
         estado = "normal" if habilitar else "disabled"
         self.aposta_entry.configure(state=estado)
         self.spin_button.configure(state=estado)
+        if self.linhas_combo is not None:
+            self.linhas_combo.configure(state="readonly" if habilitar else "disabled")
+
+    def _selecionar_linhas(self, _evento: object = None) -> None:
+        try:
+            self.sessao.selecionar_linhas(self.linhas_var.get())
+        except ErroSessao as erro:
+            mostrar_erro(erro)
 
     def _girar(self) -> None:
-        if self.game is None:
-            # Tentar iniciar se não tiver jogo (caso sem carteira)
-            try:
-                saldo = float(self.saldo_inicial_var.get().replace(",", "."))
-                self.game = SlotMachine(saldo)
-            except:
-                pass
-
-        if self.game is None or self._animando:
+        if self._animando:
             return
-            
+
+        # A tela com o resultado chega durante ``girar``; ela só é desenhada
+        # quando os rolos pararem.
+        self._animando = True
         try:
-            aposta = self._converter_para_float(self.aposta_var.get())
-        except ValueError:
-            messagebox.showerror("Erro", "Aposta inválida.")
-            return
-            
-        if not self.game.pode_apostar(aposta):
-            messagebox.showwarning("Saldo", "Saldo insuficiente.")
+            resultado = self.sessao.girar(self.aposta_var.get())
+        except ErroSessao as erro:
+            self._animando = False
+            mostrar_erro(erro)
             return
+        self._animar_reels(resultado)
 
-        self._ultima_aposta = aposta
-        resultado = self.game.girar(aposta)
-        self._resultado_pendente = resultado
-        self._animar_reels()
+    def _girar_automatico(self, jogar: Jogar, continuar: Callable[[], None]) -> None:
+        """Rodada do jogo automático sem turbo: mesma animação de um giro manual."""
+        self._animando = True
+        self._ao_parar = continuar
+        resultados = jogar()
+        if resultados:
+            self._animar_reels(resultados[-1])
+        else:
+            self._finalizar_spin()
 
-    def _animar_reels(self) -> None:
+    def _animar_reels(self, resultado: SpinResult) -> None:
         self._animando = True
+        self._resultado_pendente = resultado
         self._habilitar_controles(False)
         self.status_var.set("Girando...")
-        self._passos_reel = [0, 0, 0]
-        self._limites_reel = [random.randint(15, 25), random.randint(25, 35), random.randint(35, 45)]
+        self._passos_reel = [0] * len(self.reel_columns)
+        # Cada rolo para um pouco depois do anterior.
+        self._limites_reel = [random.randint(15 + 10 * idx, 25 + 10 * idx) for idx in range(len(self.reel_columns))]
         self._rotacionar()
 
     def _rotacionar(self) -> None:
+        self._agendamento = None
         if not self._animando:
             return
 
@@ -220,16 +258,14 @@ class SlotMachineApp:
                 prestes_a_parar = self._passos_reel[idx] + 1 >= self._limites_reel[idx]
                 
                 if prestes_a_parar and self._resultado_pendente is not None:
-                    # Preparar parada no símbolo correto
-                    topo, _, base = self._reel_states[idx] # Mantém contexto visual anterior? Não, gera aleatório
-                    # Precisamos garantir que o símbolo do meio seja o resultado
-                    simbolo_final = self._resultado_pendente.symbols[idx]
-                    # Gerar vizinhos aleatórios
-                    vizinho_cima = random.choice(list(SYMBOL_EMOJIS.values()))
-                    vizinho_baixo = random.choice(list(SYMBOL_EMOJIS.values()))
-                    strip = (vizinho_cima, SYMBOL_EMOJIS.get(simbolo_final, "❓"), vizinho_baixo)
+                    # O rolo para na coluna sorteada, com todas as fileiras.
+                    strip = self._emojis(self._resultado_pendente.grade[idx])
+                elif self._resultado_pendente is not None and self._resultado_pendente.paradas:
+                    # A faixa de verdade desce um símbolo por passo até a parada sorteada.
+                    faltam = self._limites_reel[idx] - 1 - self._passos_reel[idx]
+                    strip = self._janela(idx, self._resultado_pendente.paradas[idx] + faltam)
                 else:
-                    strip = self._gerar_strip_animacao()
+                    strip = self._janela(idx, random.randrange(len(self._tabela.faixas[idx])))
                 
                 self._atualizar_coluna(idx, coluna, strip)
                 self._passos_reel[idx] += 1
@@ -241,95 +277,81 @@ class SlotMachineApp:
         # Velocidade variável (efeito de parada)
         progresso = max(self._passos_reel) / max(self._limites_reel)
         delay = int(50 + progresso * 100)
-        self.master.after(delay, self._rotacionar)
+        self._agendamento = self.master.after(delay, self._rotacionar)
 
     def _finalizar_spin(self) -> None:
         self._animando = False
-        if self._resultado_pendente is None:
-            self._habilitar_controles(True)
-            return
-
-        # Garantir visual final correto
-        for idx, (coluna, simbolo) in enumerate(zip(self.reel_columns, self._resultado_pendente.symbols)):
-            # Recuperar o que está na tela
-            current_strip = self._reel_states[idx]
-            # O meio já deve estar certo pela lógica do _rotacionar, mas vamos forçar
-            topo, _, base = current_strip
-            centro = SYMBOL_EMOJIS.get(simbolo, "❓")
-            self._atualizar_coluna(idx, coluna, (topo, centro, base), highlight=True)
-
-        self._mostrar_resultado(self._resultado_pendente)
         self._resultado_pendente = None
-
-        if self.game and self.game.saldo > 0:
-            self._habilitar_controles(True)
-        else:
-            self._habilitar_controles(False)
-            self.status_var.set("Saldo esgotado.")
+        if self._tela_pendente is not None:
+            tela, self._tela_pendente = self._tela_pendente, None
+            self._renderizar(tela)
+        if self._ao_parar is not None:
+            continuar, self._ao_parar = self._ao_parar, None
+            continuar()
 
     def _mostrar_resultado(self, resultado: SpinResult) -> None:
-        if resultado.venceu:
-            ganho_liquido = resultado.ganho - resultado.aposta
-            msg = f"VENCEU! Ganhou {formatar_reais(resultado.ganho)}!"
-            self.status_var.set(msg)
-            # Efeito visual de vitória (piscar?) - simplificado aqui
-        else:
-            self.status_var.set(f"Tente novamente. Perdeu {formatar_reais(self._ultima_aposta)}.")
+        # Destaca as células das linhas premiadas; sem prêmio, as da linha principal.
+        linhas = [self._tabela.linhas[numero] for numero in resultado.linhas_premiadas] or self._tabela.linhas[:1]
+        for idx, (coluna, simbolos) in enumerate(zip(self.reel_columns, resultado.grade)):
+            destaques = {linha[idx] for linha in linhas}
+            self._atualizar_coluna(idx, coluna, self._emojis(simbolos), destaques)
+
+    def _renderizar(self, tela: TelaSlot) -> None:
+        if self._animando:
+            self._tela_pendente = tela
+            return
 
-        self._atualizar_saldo()
-        if self.wallet and self.game:
-            self._sincronizar_carteira()
+        self.saldo_var.set(f"Saldo: {formatar_reais(tela.saldo)}")
+        self.jackpot_var.set(f"JACKPOT: {formatar_reais(tela.jackpot)}" if tela.jackpot else "")
+        self.status_var.set(tela.status)
+        # Sem carteira, o primeiro giro cria o jogo com o saldo avulso.
+        pode_jogar = tela.jogando or not (tela.iniciado or tela.com_carteira)
+        self._habilitar_controles(pode_jogar and not self.automatico.ativo)
+        self.automatico.habilitar(pode_jogar)
+        if tela.aposta != self._aposta_exibida:
+            self.aposta_var.set(tela.aposta)
+            self._aposta_exibida = tela.aposta
+        self.linhas_var.set(str(tela.linhas))
+        if tela.resultado is None:
+            self._resetar_reels()
+        else:
+            self._mostrar_resultado(tela.resultado)
 
     def _resetar_reels(self) -> None:
-        self._reel_states = [("❓", "❓", "❓") for _ in range(3)]
+        vazio = ("❓",) * self._tabela.altura
+        self._reel_states = [vazio for _ in self.reel_columns]
         for idx, coluna in enumerate(self.reel_columns):
-            self._atualizar_coluna(idx, coluna, ("❓", "❓", "❓"))
-
-    def _gerar_strip_animacao(self) -> tuple[str, str, str]:
-        simbolos = random.choices(list(SYMBOL_EMOJIS.values()), k=3)
-        return (simbolos[0], simbolos[1], simbolos[2])
+            self._atualizar_coluna(idx, coluna, vazio)
 
-    def _atualizar_coluna(self, indice: int, coluna: list[tk.Label], strip: tuple[str, str, str], highlight: bool = False) -> None:
-        topo, centro, base = strip
-        
-        # Cores normais
-        bg_normal = "#ffffff"
-        fg_normal = "#cccccc" # Desfocado
-        
-        # Cores destaque (linha do meio)
-        bg_highlight = "#fff8e1" if highlight else "#ffffff"
-        fg_highlight = "#000000"
-        
-        coluna[0].configure(text=topo, fg=fg_normal, bg=bg_normal)
-        coluna[1].configure(text=centro, fg=fg_highlight, bg=bg_highlight)
-        coluna[2].configure(text=base, fg=fg_normal, bg=bg_normal)
-        
-        self._reel_states[indice] = strip
+    def _janela(self, indice: int, parada: int) -> tuple[str, ...]:
+        """O que o rolo ``indice`` mostra parado em ``parada`` (com a volta da faixa)."""
+        janelas = self._tabela.janelas[indice]
+        return self._emojis(janelas[parada % len(janelas)])
 
-    def _atualizar_saldo(self) -> None:
-        if self.game:
-            self.saldo_var.set(f"Saldo: {formatar_reais(self.game.saldo)}")
+    @staticmethod
+    def _emojis(simbolos: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(SYMBOL_EMOJIS.get(simbolo, "❓") for simbolo in simbolos)
+
+    def _atualizar_coluna(
+        self, indice: int, coluna: list[tk.Label], strip: tuple[str, ...], destaques: Collection[int] = ()
+    ) -> None:
+        # Fileiras por onde passa alguma linha de pagamento ficam nítidas; as
+        # demais, desfocadas. ``destaques`` ganham o fundo do resultado.
+        pagas = {linha[indice] for linha in self._tabela.linhas}
+        for fileira, (label, simbolo) in enumerate(zip(coluna, strip)):
+            label.configure(
+                text=simbolo,
+                fg="#000000" if fileira in pagas else "#cccccc",
+                bg="#fff8e1" if fileira in destaques else "#ffffff",
+            )
 
-    def _sincronizar_carteira(self) -> None:
-        if not (self.wallet and self.game):
-            return
-        diferenca = round(self.game.saldo - self.wallet.saldo, 2)
-        if diferenca > 0:
-            self.wallet.depositar(diferenca)
-        elif diferenca < 0:
-            self.wallet.retirar(-diferenca)
-        self._atualizar_saldo_compartilhado()
+        self._reel_states[indice] = strip
 
     def _atualizar_saldo_compartilhado(self) -> None:
-        if not self.wallet:
+        if not self.wallet or self._animando:
             return
         self.saldo_var.set(f"Saldo: {formatar_reais(self.wallet.saldo)}")
 
-    @staticmethod
-    def _converter_para_float(texto: str) -> float:
-        limpo = texto.replace("R$", "").strip().replace(".", "").replace(",", ".")
-        return float(limpo)
-
 def run_app() -> None:
     raiz = tk.Tk()
     app = SlotMachineApp(raiz)
@@ -0,0 +1,162 @@
+"""Sessão do caça-níquel sem dependência de interface."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import tabelas
+from dinheiro import Centavos, formatar_reais, para_centavos
+from sessao import CarteiraProtocol, ErroSessao, JogoAutomatico, Parada, Sessao, Tela
+
+from .game import SlotMachine, SpinResult
+
+if TYPE_CHECKING:
+    from estrategias import ModeloJogo
+    from jackpot import Jackpot
+
+
+@dataclass(frozen=True)
+class TelaSlot(Tela):
+    resultado: SpinResult | None = None
+    linhas: int = 1
+    linhas_disponiveis: int = 1
+    # Fundo do jackpot progressivo (0: a tabela não tem jackpot).
+    jackpot: float = 0.0
+
+
+class SessaoSlot(Sessao[SlotMachine, TelaSlot]):
+    """Gira os rolos e repassa o saldo à carteira.
+
+    Com carteira o jogo começa sozinho; sem ela, o primeiro giro usa
+    ``SALDO_AVULSO``. A aposta vale por linha; ``selecionar_linhas`` escolhe
+    quantas linhas da tabela jogar (``linhas`` ``None``: todas). Se a tabela
+    tem jackpot, os giros alimentam ``jackpot`` ou, sem ele, o fundo
+    compartilhado por todas as sessões do processo.
+    """
+
+    jogo = "slot"
+    ACOES = ("iniciar", "selecionar_linhas", "girar")
+    APOSTA_PADRAO = 10.0
+    SALDO_AVULSO = 200.0
+    STATUS_INICIAL = "Insira saldo para jogar."
+    STATUS_CARTEIRA = "Pronto para jogar!"
+    STATUS_INICIO = "Pronto para jogar!"
+
+    resultado: SpinResult | None = None
+    linhas: int | None = None
+    jackpot: Jackpot | None = None
+
+    def conectar_carteira(self, carteira: CarteiraProtocol) -> None:
+        super().conectar_carteira(carteira)
+        if carteira.saldo > 0:
+            self.iniciar()
+
+    def selecionar_linhas(self, quantidade: int | str) -> None:
+        disponiveis = self.tabela_atual().linhas
+        try:
+            linhas = int(quantidade)
+        except (TypeError, ValueError, OverflowError):
+            raise ErroSessao("Linhas", "Informe quantas linhas jogar.") from None
+        if not 1 <= linhas <= len(disponiveis):
+            raise ErroSessao("Linhas", f"Escolha de 1 a {len(disponiveis)} linhas.", aviso=True)
+        self.linhas = linhas
+        if self.motor is not None:
+            self.motor.linhas = linhas
+        self._emitir()
+
+    def girar(self, aposta: str | float) -> SpinResult:
+        if self.motor is None:
+            self.iniciar(self.SALDO_AVULSO)
+        valor = self.ler_aposta(aposta)
+        resultado = self._jogar(valor)
+        self._anunciar(resultado)
+        self._concluir_rodada(resultado)
+        self._emitir()
+        return resultado
+
+    def automatico(self, aposta: str | float, parada: Parada, estrategia: str | None = None) -> JogoAutomatico:
+        if self.motor is None:
+            self.iniciar(self.SALDO_AVULSO)
+        return super().automatico(aposta, parada, estrategia)
+
+    def tela(self) -> TelaSlot:
+        tabela = self.tabela_atual()
+        disponiveis = len(tabela.linhas)
+        return TelaSlot(
+            **self._campos_tela(),
+            resultado=self.resultado,
+            linhas=disponiveis if self.linhas is None else min(self.linhas, disponiveis),
+            linhas_disponiveis=disponiveis,
+            jackpot=self.fundo().valor if tabela.jackpot_pontos_base else 0.0,
+        )
+
+    def modelo(self) -> ModeloJogo:
+        from estrategias import modelo_slot
+
+        return modelo_slot(self.tabela_atual())
+
+    def tabela_atual(self) -> tabelas.TabelaSlot:
+        """A tabela do motor ou, antes dele existir, a que ele vai usar."""
+        if self.motor is not None:
+            return self.motor.tabela
+        return self.tabela if self.tabela is not None else tabelas.padrao("slot")  # type: ignore[return-value]
+
+    def fundo(self) -> Jackpot:
+        """O jackpot desta sessão: o próprio ou o compartilhado do processo."""
+        if self.jackpot is not None:
+            return self.jackpot
+        from jackpot import compartilhado
+
+        return compartilhado()
+
+    def _criar_motor(self, saldo: float) -> SlotMachine:
+        tabela = self.tabela if self.tabela is not None else tabelas.padrao("slot")
+        # A escolha vale para a tabela em que foi feita; numa tabela trocada com menos linhas, todas.
+        linhas = None if self.linhas is None else min(self.linhas, len(tabela.linhas))
+        return SlotMachine(saldo, tabela, linhas, self.fundo())  # type: ignore[arg-type]
+
+    def _maior_aposta(self, saldo: Centavos) -> Centavos:
+        assert self.motor is not None
+        return saldo // self.motor.linhas_ativas
+
+    def _risco(self, aposta: float) -> Centavos:
+        assert self.motor is not None
+        return para_centavos(aposta) * self.motor.linhas_ativas
+
+    def _rodada(self, aposta: float) -> SpinResult:
+        assert self.motor is not None
+        return self.motor.girar(aposta)
+
+    def _rodadas(self, aposta: float, quantidade: int) -> list[SpinResult]:
+        assert self.motor is not None
+        return self.motor.girar_lote(aposta, quantidade)
+
+    def _maior_ganho(self, aposta: float) -> Centavos | None:
+        assert self.motor is not None
+        tabela = self.motor.tabela
+        if self.motor.jackpot is not None and tabela.jackpot_pontos_base:
+            return None
+        risco = self._risco(aposta)
+        return para_centavos(aposta) * max(tabela.premios) * self.motor.linhas_ativas // 10 - risco
+
+    def _anunciar(self, resultado: SpinResult) -> None:
+        assert self.motor is not None
+        self.resultado = resultado
+        premiadas = len(resultado.linhas_premiadas)
+        if resultado.jackpot:
+            self.status = f"JACKPOT! Ganhou {formatar_reais(resultado.ganho)}!"
+        elif premiadas > 1:
+            self.status = f"VENCEU em {premiadas} linhas! Ganhou {formatar_reais(resultado.ganho)}!"
+        elif resultado.venceu:
+            self.status = f"VENCEU! Ganhou {formatar_reais(resultado.ganho)}!"
+        else:
+            self.status = f"Tente novamente. Perdeu {formatar_reais(resultado.aposta)}."
+        if self.motor.saldo_centavos <= 0:
+            self.status = "Saldo esgotado."
+
+    def _limpar_rodada(self) -> None:
+        self.resultado = None
+
+
+__all__ = ["SessaoSlot", "TelaSlot"]
@@ -0,0 +1,137 @@
+"""Fórmulas fechadas da ruína do jogador para sessões de Cara ou Coroa.
+
+Uma sessão com aposta fixa é um passeio aleatório em unidades de aposta:
+cada rodada soma uma unidade com probabilidade ``p`` e tira uma com
+``q = 1 - p``. Começando com ``i`` unidades, o jogador para ao não conseguir
+cobrir a aposta (ruína) ou ao alcançar ``meta`` (``N`` unidades). Com
+``r = q / p``::
+
+    P(meta) = (1 - r**i) / (1 - r**N)          (p != q)
+            = i / N                            (p == q)
+    E[rodadas] = i / (q - p) - N / (q - p) * P(meta)   (p != q)
+               = i * (N - i)                           (p == q)
+
+Sem meta (``N`` infinito) a ruína é certa quando ``p <= q``, com duração
+esperada ``i / (q - p)`` (infinita no jogo justo), e tem probabilidade
+``r**i`` quando ``p > q``. A moeda do jogo é justa, então ``p`` vale 0,5 por
+padrão. Saldo, aposta e meta são em reais, como nos motores.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from dinheiro import para_centavos
+
+PROBABILIDADE_PADRAO = 0.5
+_JUSTO = 1e-12
+
+
+@dataclass(frozen=True)
+class AnaliseSessao:
+    unidades: int
+    alvo: int | None
+    probabilidade_meta: float
+    probabilidade_ruina: float
+    rodadas_esperadas: float
+
+
+def unidades(saldo: float, aposta: float, meta: float | None = None) -> tuple[int, int | None]:
+    """Converte saldo e meta em unidades de aposta: ``(i, N)``.
+
+    ``i`` é quantas derrotas seguidas o saldo aguenta; ``N`` é ``i`` mais as
+    vitórias líquidas necessárias para o saldo chegar a ``meta``.
+    """
+    saldo_centavos = para_centavos(saldo)
+    aposta_centavos = para_centavos(aposta)
+    if aposta_centavos <= 0 or saldo_centavos < 0:
+        raise ValueError("A aposta precisa ser positiva e o saldo não pode ser negativo.")
+    i = saldo_centavos // aposta_centavos
+    if meta is None:
+        return i, None
+    faltam = para_centavos(meta) - saldo_centavos
+    return i, i + max(0, -(-faltam // aposta_centavos))
+
+
+def _validar(p: float) -> None:
+    if not 0 < p < 1:
+        raise ValueError("A probabilidade de vitória precisa estar entre 0 e 1.")
+
+
+def _chance_meta(i: int, n: int, p: float) -> float:
+    if i <= 0:
+        return 0.0
+    if i >= n:
+        return 1.0
+    q = 1 - p
+    if abs(p - q) < _JUSTO:
+        return i / n
+    log_r = math.log(q / p)
+    if log_r < 0:
+        # r < 1: forma direta, com expm1 para não perder precisão perto do jogo justo.
+        return math.expm1(i * log_r) / math.expm1(n * log_r)
+    # r > 1: divide por r**N para não estourar.
+    return math.exp((i - n) * log_r) * -math.expm1(-i * log_r) / -math.expm1(-n * log_r)
+
+
+def probabilidade_meta(saldo: float, aposta: float, meta: float, p: float = PROBABILIDADE_PADRAO) -> float:
+    """Chance de o saldo chegar a ``meta`` antes de não cobrir mais a aposta."""
+    _validar(p)
+    i, n = unidades(saldo, aposta, meta)
+    assert n is not None
+    return _chance_meta(i, n, p)
+
+
+def probabilidade_ruina(
+    saldo: float, aposta: float, meta: float | None = None, p: float = PROBABILIDADE_PADRAO
+) -> float:
+    """Chance de quebrar (saldo abaixo da aposta) antes da ``meta``; sem meta, em algum momento."""
+    _validar(p)
+    i, n = unidades(saldo, aposta, meta)
+    if n is not None:
+        return 1.0 - _chance_meta(i, n, p)
+    q = 1 - p
+    if p <= q + _JUSTO:
+        return 1.0
+    return math.exp(i * math.log(q / p))
+
+
+def rodadas_esperadas(
+    saldo: float, aposta: float, meta: float | None = None, p: float = PROBABILIDADE_PADRAO
+) -> float:
+    """Duração média da sessão em rodadas; ``math.inf`` quando ela não termina em média."""
+    _validar(p)
+    i, n = unidades(saldo, aposta, meta)
+    q = 1 - p
+    if n is None:
+        return i / (q - p) if q - p > _JUSTO else math.inf
+    if i <= 0 or i >= n:
+        return 0.0
+    if abs(p - q) < _JUSTO:
+        return float(i * (n - i))
+    return i / (q - p) - n / (q - p) * _chance_meta(i, n, p)
+
+
+def analisar(saldo: float, aposta: float, meta: float | None = None, p: float = PROBABILIDADE_PADRAO) -> AnaliseSessao:
+    """Tudo de uma vez, para exibir ou comparar com simulações."""
+    i, n = unidades(saldo, aposta, meta)
+    ruina = probabilidade_ruina(saldo, aposta, meta, p)
+    return AnaliseSessao(
+        unidades=i,
+        alvo=n,
+        probabilidade_meta=1.0 - ruina if n is not None else 0.0,
+        probabilidade_ruina=ruina,
+        rodadas_esperadas=rodadas_esperadas(saldo, aposta, meta, p),
+    )
+
+
+__all__ = [
+    "AnaliseSessao",
+    "PROBABILIDADE_PADRAO",
+    "analisar",
+    "probabilidade_meta",
+    "probabilidade_ruina",
+    "rodadas_esperadas",
+    "unidades",
+]
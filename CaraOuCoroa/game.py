@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 import random
 
+from dinheiro import Centavos, para_centavos
+
+LADOS = ("coroa", "cara")  # índice = bit sorteado
+
 
 @dataclass
 class RoundResult:
@@ -14,39 +19,159 @@ class RoundResult:
     venceu: bool
 
 
+@dataclass(slots=True)
+class LoteMoeda:
+    """Resultado de ``CoinGame.jogar_lote`` em máscaras de bits.
+
+    O bit ``i`` de ``moedas`` é 1 quando a ``i``-ésima moeda deu cara; o de
+    ``acertos``, quando a aposta ``i`` venceu. Só as ``jogadas`` primeiras
+    apostas foram resolvidas: o lote para na primeira que o saldo não cobre.
+    """
+
+    jogadas: int
+    moedas: int
+    acertos: int
+    escolhas: int
+    apostas: tuple[Centavos, ...]
+    lucro_centavos: Centavos
+    saldo: float
+
+    @property
+    def vitorias(self) -> int:
+        return self.acertos.bit_count()
+
+    def rodadas(self) -> list[RoundResult]:
+        """Expande o lote em ``RoundResult``, por exemplo para o histórico."""
+        n = self.jogadas
+        return [
+            RoundResult(
+                escolha=LADOS[escolha == "1"],
+                aposta=aposta / 100,
+                resultado_moeda=LADOS[moeda == "1"],
+                venceu=acerto == "1",
+            )
+            for escolha, moeda, acerto, aposta in zip(
+                _bits(self.escolhas, n), _bits(self.moedas, n), _bits(self.acertos, n), self.apostas
+            )
+        ]
+
+
 class CoinGame:
-    """Controla o saldo e o resultado das apostas."""
+    """Controla o saldo e o resultado das apostas.
 
-    def __init__(self, saldo_inicial: float) -> None:
+    As moedas saem de ``rng`` (um ``random.Random`` próprio por padrão); com
+    a mesma semente, as mesmas apostas dão os mesmos resultados.
+    """
+
+    def __init__(self, saldo_inicial: float, rng: random.Random | None = None) -> None:
         if saldo_inicial <= 0:
             raise ValueError("O saldo inicial precisa ser maior que zero.")
-        self._saldo = float(saldo_inicial)
+        self._centavos: Centavos = para_centavos(saldo_inicial)
+        self.rng = rng if rng is not None else random.Random()
 
     @property
     def saldo(self) -> float:
-        return round(self._saldo, 2)
+        return self._centavos / 100
+
+    @property
+    def saldo_centavos(self) -> Centavos:
+        return self._centavos
 
     def pode_apostar(self, valor: float) -> bool:
-        return 0 < valor <= self._saldo
+        return 0 < para_centavos(valor) <= self._centavos
 
     def jogar(self, escolha: str, aposta: float) -> RoundResult:
-        escolha_normalizada = escolha.strip().lower()
-        if escolha_normalizada not in {"cara", "coroa"}:
-            raise ValueError("A escolha precisa ser 'cara' ou 'coroa'.")
-        if not self.pode_apostar(aposta):
+        escolha_normalizada = _normalizar(escolha)
+        aposta_centavos = para_centavos(aposta)
+        if not 0 < aposta_centavos <= self._centavos:
             raise ValueError("A aposta precisa ser positiva e menor ou igual ao saldo.")
 
-        resultado = random.choice(["cara", "coroa"])
+        resultado = LADOS[self.rng.getrandbits(1)]
         venceu = escolha_normalizada == resultado
 
         if venceu:
-            self._saldo += aposta
+            self._centavos += aposta_centavos
         else:
-            self._saldo -= aposta
+            self._centavos -= aposta_centavos
 
         return RoundResult(
             escolha=escolha_normalizada,
-            aposta=float(aposta),
+            aposta=aposta_centavos / 100,
             resultado_moeda=resultado,
             venceu=venceu,
         )
+
+    def jogar_lote(
+        self,
+        escolhas: str | Sequence[str],
+        apostas: float | Sequence[float],
+        quantidade: int | None = None,
+    ) -> LoteMoeda:
+        """Resolve várias apostas em ordem com um único ``getrandbits``.
+
+        ``escolhas`` e ``apostas`` podem ser sequências do mesmo tamanho ou
+        um valor único repetido; com os dois únicos, informe ``quantidade``.
+        Uma sequência com ``quantidade`` informada precisa ter esse tamanho.
+        """
+        tamanhos = {len(v) for v in (escolhas, apostas) if not isinstance(v, (str, int, float))}
+        if quantidade is None:
+            if len(tamanhos) != 1:
+                raise ValueError("Informe sequências do mesmo tamanho ou a quantidade de apostas.")
+            quantidade = tamanhos.pop()
+        elif tamanhos - {quantidade}:
+            raise ValueError("As sequências de escolhas e apostas precisam ter a quantidade de apostas informada.")
+        if quantidade <= 0:
+            return LoteMoeda(0, 0, 0, 0, (), 0, self.saldo)
+        cheio = (1 << quantidade) - 1
+
+        if isinstance(escolhas, str):
+            mascara_escolhas = cheio if _normalizar(escolhas) == "cara" else 0
+        else:
+            # Monta a máscara de uma vez: acumular ``|= 1 << i`` seria quadrático.
+            digitos = "".join("1" if _normalizar(e) == "cara" else "0" for e in reversed(escolhas))
+            mascara_escolhas = int(digitos, 2)
+
+        aposta_unica = isinstance(apostas, (int, float))
+        if aposta_unica:
+            valores: tuple[Centavos, ...] = (para_centavos(apostas),) * quantidade  # type: ignore[arg-type]
+        else:
+            valores = tuple(para_centavos(a) for a in apostas)  # type: ignore[union-attr]
+        if min(valores) <= 0:
+            raise ValueError("A aposta precisa ser positiva e menor ou igual ao saldo.")
+
+        moedas = self.rng.getrandbits(quantidade)
+        acertos = ~(moedas ^ mascara_escolhas) & cheio
+
+        if aposta_unica and self._centavos >= valores[0] * quantidade:
+            # Nem perdendo tudo o saldo acaba no meio do lote.
+            jogadas = quantidade
+            lucro = (2 * acertos.bit_count() - quantidade) * valores[0]
+        else:
+            saldo = self._centavos
+            jogadas = quantidade
+            for i, (valor, acertou) in enumerate(zip(valores, _bits(acertos, quantidade))):
+                if valor > saldo:
+                    jogadas = i
+                    break
+                saldo += valor if acertou == "1" else -valor
+            lucro = saldo - self._centavos
+            if jogadas < quantidade:
+                resolvidas = (1 << jogadas) - 1
+                moedas &= resolvidas
+                acertos &= resolvidas
+                mascara_escolhas &= resolvidas
+
+        self._centavos += lucro
+        return LoteMoeda(jogadas, moedas, acertos, mascara_escolhas, valores[:jogadas], lucro, self.saldo)
+
+
+def _normalizar(escolha: str) -> str:
+    normalizada = escolha.strip().lower()
+    if normalizada not in {"cara", "coroa"}:
+        raise ValueError("A escolha precisa ser 'cara' ou 'coroa'.")
+    return normalizada
+
+
+def _bits(mascara: int, tamanho: int) -> str:
+    """Bits de ``mascara`` do menos ao mais significativo, como texto de ``"0"``/``"1"``."""
+    return format(mascara, f"0{tamanho}b")[::-1]
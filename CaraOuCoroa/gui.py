@@ -3,50 +3,48 @@
 from __future__ import annotations
 
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import ttk
 
-from typing import Callable, Protocol
+from typing import Callable
 
-from .game import CoinGame, RoundResult
+from dinheiro import formatar_reais
+from eventos import assinar_por_quadro
+from painel_automatico import Jogar, PainelAutomatico
+from sessao import CarteiraProtocol, ErroSessao, formatar_entrada
+from tema import aplicar_tema, fonte, mostrar_erro
 
-
-def formatar_reais(valor: float) -> str:
-    return f"R${valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-
-
-class CarteiraProtocol(Protocol):
-    saldo: float
-
-    def depositar(self, valor: float) -> None: ...
-
-    def retirar(self, valor: float) -> bool: ...
+from .sessao import SessaoCara, TelaCara
 
 
 class CoinGameApp:
-    """Janela principal do jogo."""
+    """Janela principal do jogo; o fluxo de apostas fica em ``SessaoCara``."""
 
     def __init__(self, master: tk.Tk) -> None:
         self.master = master
         self.master.title("Cara ou Coroa")
         self.master.resizable(False, False)
 
-        self.game: CoinGame | None = None
+        self.sessao = SessaoCara()
         self.wallet: CarteiraProtocol | None = None
-        self._saldo_factory: Callable[[], float] | None = None
+        self._cancelar_assinatura: Callable[[], None] | None = None
         self.em_animacao = False
         self._aposta_em_andamento: float | None = None
         self._escolha_em_andamento: str | None = None
+        self._jogada_automatica: tuple[Jogar, Callable[[], None]] | None = None
+        self._agendamento: str | None = None
+        self._aposta_exibida = ""
 
         self._montar_interface()
+        self.sessao.assinar(self._renderizar)
+        self._renderizar(self.sessao.tela())
 
     def _montar_interface(self) -> None:
-        estilo = ttk.Style()
-        estilo.theme_use("clam")
+        aplicar_tema(self.master)
 
         quadro = ttk.Frame(self.master, padding=20)
         quadro.grid(row=0, column=0, sticky="NSEW")
 
-        titulo = ttk.Label(quadro, text="Jogo de Cara ou Coroa", font=("Segoe UI", 16, "bold"))
+        titulo = ttk.Label(quadro, text="Jogo de Cara ou Coroa", font=fonte(self.master, "Segoe UI", 16, "bold"))
         titulo.grid(row=0, column=0, columnspan=3, pady=(0, 15))
 
         # Saldo inicial
@@ -66,12 +64,12 @@ class CoinGameApp:
             110,
             text="",
             fill="#1f1f2e",
-            font=("Segoe UI", 28, "bold"),
+            font=fonte(self.master, "Segoe UI", 28, "bold"),
         )
 
         # Saldo atual
         self.saldo_var = tk.StringVar(value="Saldo: R$0,00")
-        saldo_label = ttk.Label(quadro, textvariable=self.saldo_var, font=("Segoe UI", 12, "bold"))
+        saldo_label = ttk.Label(quadro, textvariable=self.saldo_var, font=fonte(self.master, "Segoe UI", 12, "bold"))
         saldo_label.grid(row=3, column=0, columnspan=3, pady=(0, 10))
 
         # Aposta
@@ -87,70 +85,73 @@ class CoinGameApp:
         self.botao_coroa = ttk.Button(botoes_frame, text="Coroa", state="disabled", command=lambda: self._apostar("coroa"))
         self.botao_coroa.grid(row=0, column=1)
 
+        # O automático repete a última escolha (Cara, se ainda não houve aposta).
+        self.automatico = PainelAutomatico(
+            quadro,
+            self.sessao,
+            self.aposta_var.get,
+            self._apostar_automatico,
+            lambda _ativo: self._renderizar(self.sessao.tela()),
+        )
+        self.automatico.grid(row=5, column=0, columnspan=3, sticky="EW", pady=(10, 0))
+
         self.status_var = tk.StringVar(value="Informe um saldo inicial para jogar.")
         status_label = ttk.Label(
             quadro,
             textvariable=self.status_var,
             wraplength=320,
-            font=("Segoe UI", 10),
+            font=fonte(self.master, "Segoe UI", 10),
         )
-        status_label.grid(row=5, column=0, columnspan=3, pady=(15, 10))
+        status_label.grid(row=6, column=0, columnspan=3, pady=(15, 10))
 
         sair_btn = ttk.Button(quadro, text="Sair", command=self.master.destroy)
-        sair_btn.grid(row=6, column=2, sticky="E")
+        sair_btn.grid(row=7, column=2, sticky="E")
 
-    def set_wallet(self, wallet: CarteiraProtocol, saldo_factory: Callable[[], float]) -> None:
+    def set_wallet(self, wallet: CarteiraProtocol) -> None:
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
         self.wallet = wallet
-        self._saldo_factory = saldo_factory
-        self.saldo_inicial_entry.configure(state="disabled")
-        self.saldo_inicial_var.set(f"{wallet.saldo:.2f}".replace(".", ","))
-        self.saldo_var.set(f"Saldo: {formatar_reais(wallet.saldo)}")
-        self.status_var.set("Saldo compartilhado carregado. Clique em Iniciar.")
+        self._cancelar_assinatura = assinar_por_quadro(self.master, wallet, self._atualizar_saldo_compartilhado)
+        self.saldo_inicial_var.set(formatar_entrada(wallet.saldo))
+        self.sessao.conectar_carteira(wallet)
+
+    def resetar(self) -> None:
+        """Devolve a janela ao estado inicial para ser reaproveitada pelo Hub.
+
+        Uma aposta ainda em animação é descartada: o lance só é aplicado ao
+        motor no fim da animação.
+        """
+        if self._agendamento is not None:
+            self.master.after_cancel(self._agendamento)
+            self._agendamento = None
+        self.automatico.cancelar()
+        self.em_animacao = False
+        self._aposta_em_andamento = None
+        self._escolha_em_andamento = None
+        self._jogada_automatica = None
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
+            self._cancelar_assinatura = None
+        self.wallet = None
+        self.saldo_inicial_var.set("100,00")
+        self.sessao.resetar()
 
     def _iniciar_jogo(self) -> None:
-        if self.em_animacao:
+        if self.em_animacao or self.automatico.ativo:
             return
-
-        if self.wallet and self._saldo_factory:
-            saldo = self._saldo_factory()
-            if saldo <= 0:
-                messagebox.showwarning("Carteira vazia", "Adicione saldo na tela principal para continuar jogando.")
-                return
-            self.game = CoinGame(saldo)
-        else:
-            try:
-                saldo = self._converter_para_float(self.saldo_inicial_var.get())
-            except ValueError:
-                messagebox.showerror("Valor inválido", "Informe um número válido para o saldo inicial.")
-                return
-
-            if saldo <= 0:
-                messagebox.showerror("Saldo inválido", "O saldo inicial precisa ser maior que zero.")
-                return
-
-            self.game = CoinGame(saldo)
-        self._atualizar_saldo()
-        self.status_var.set("Saldo definido! Faça sua aposta.")
-        self._habilitar_apostas(True)
-        self._resetar_moeda()
-        valor_sugerido = min(self.game.saldo, 10.0)
-        self.aposta_var.set(self._formatar_entrada(valor_sugerido))
+        try:
+            self.sessao.iniciar(self.saldo_inicial_var.get())
+        except ErroSessao as erro:
+            mostrar_erro(erro)
 
     def _apostar(self, escolha: str) -> None:
-        if self.game is None or self.em_animacao:
+        if self.sessao.motor is None or self.em_animacao:
             return
 
         try:
-            aposta = self._converter_para_float(self.aposta_var.get())
-        except ValueError:
-            messagebox.showerror("Valor inválido", "Informe um número válido para a aposta.")
-            return
-
-        if not self.game.pode_apostar(aposta):
-            messagebox.showwarning(
-                "Aposta inválida",
-                "A aposta precisa ser maior que zero e não pode ultrapassar o saldo atual.",
-            )
+            aposta = self.sessao.ler_aposta(self.aposta_var.get())
+        except ErroSessao as erro:
+            mostrar_erro(erro)
             return
 
         self._aposta_em_andamento = aposta
@@ -159,6 +160,12 @@ class CoinGameApp:
         self._habilitar_apostas(False)
         self._inicio_animacao()
 
+    def _apostar_automatico(self, jogar: Jogar, continuar: Callable[[], None]) -> None:
+        """Rodada do jogo automático sem turbo: a moeda gira e só então a jogada é resolvida."""
+        self._jogada_automatica = (jogar, continuar)
+        self.status_var.set("Girando a moeda...")
+        self._inicio_animacao()
+
     def _inicio_animacao(self) -> None:
         self.em_animacao = True
         self._passos_animacao = 18
@@ -180,50 +187,48 @@ class CoinGameApp:
 
         self._indice_animacao += 1
         if self._indice_animacao <= self._passos_animacao:
-            self.master.after(80, self._animar_moeda)
+            self._agendamento = self.master.after(80, self._animar_moeda)
         else:
             self.em_animacao = False
-            self.master.after(120, self._finalizar_aposta)
+            self._agendamento = self.master.after(120, self._finalizar_aposta)
 
     def _finalizar_aposta(self) -> None:
-        if self.game is None or self._aposta_em_andamento is None or self._escolha_em_andamento is None:
+        self._agendamento = None
+        if self._jogada_automatica is not None:
+            (jogar, continuar), self._jogada_automatica = self._jogada_automatica, None
+            jogar()
+            continuar()
+            return
+        if self._aposta_em_andamento is None or self._escolha_em_andamento is None:
             return
 
-        resultado = self.game.jogar(self._escolha_em_andamento, self._aposta_em_andamento)
-        self._exibir_resultado(resultado)
-
+        aposta, escolha = self._aposta_em_andamento, self._escolha_em_andamento
         self._aposta_em_andamento = None
         self._escolha_em_andamento = None
-
-        if self.game.saldo > 0:
-            self._habilitar_apostas(True)
+        try:
+            self.sessao.apostar(escolha, aposta)
+        except ErroSessao as erro:
+            mostrar_erro(erro)
+            return
+        if self.sessao.tela().jogando:
             self.aposta_entry.focus_set()
-        else:
-            self.status_var.set("Seu saldo zerou. Defina um novo saldo inicial para continuar jogando.")
-            self._habilitar_apostas(False)
 
-    def _exibir_resultado(self, resultado: RoundResult) -> None:
-        cor = "#4caf50" if resultado.venceu else "#f44336"
+    def _renderizar(self, tela: TelaCara) -> None:
+        self.saldo_var.set(f"Saldo: {formatar_reais(tela.saldo)}")
+        self.status_var.set(tela.status)
+        self.saldo_inicial_entry.configure(state="disabled" if tela.com_carteira else "normal")
+        self._habilitar_apostas(tela.jogando and not self.automatico.ativo)
+        self.automatico.habilitar(tela.jogando)
+        if tela.aposta != self._aposta_exibida:
+            self.aposta_var.set(tela.aposta)
+            self._aposta_exibida = tela.aposta
+
+        if tela.resultado is None:
+            self._resetar_moeda()
+            return
+        cor = "#4caf50" if tela.resultado.venceu else "#f44336"
         self.canvas.itemconfig(self.moeda, fill="#d4af37")
-        self.canvas.itemconfig(self.texto_moeda, text=resultado.resultado_moeda.upper(), fill=cor)
-
-        if resultado.venceu:
-            mensagem = (
-                f"Você ganhou {formatar_reais(resultado.aposta)}! "
-                f"Novo saldo: {formatar_reais(self.game.saldo)}."
-            )
-        else:
-            mensagem = (
-                f"Você perdeu {formatar_reais(resultado.aposta)}. "
-                f"Novo saldo: {formatar_reais(self.game.saldo)}."
-            )
-
-        self.status_var.set(mensagem)
-        self._atualizar_saldo()
-        proxima_aposta = min(self.game.saldo, resultado.aposta)
-        self.aposta_var.set(self._formatar_entrada(max(proxima_aposta, 0)))
-        if self.wallet:
-            self._sincronizar_carteira()
+        self.canvas.itemconfig(self.texto_moeda, text=tela.resultado.resultado_moeda.upper(), fill=cor)
 
     def _habilitar_apostas(self, habilitar: bool) -> None:
         estado = "normal" if habilitar else "disabled"
@@ -231,45 +236,13 @@ class CoinGameApp:
         self.botao_cara.configure(state=estado)
         self.botao_coroa.configure(state=estado)
 
-    def _atualizar_saldo(self) -> None:
-        if self.game:
-            self.saldo_var.set(f"Saldo: {formatar_reais(self.game.saldo)}")
-        else:
-            self.saldo_var.set("Saldo: R$0,00")
-
     def _resetar_moeda(self) -> None:
         self.canvas.itemconfig(self.moeda, fill="#d4af37")
         self.canvas.itemconfig(self.texto_moeda, text="")
 
-    def _sincronizar_carteira(self) -> None:
-        if self.wallet and self.game:
-            diferenca = round(self.game.saldo - self.wallet.saldo, 2)
-            if diferenca > 0:
-                self.wallet.depositar(diferenca)
-            elif diferenca < 0:
-                self.wallet.retirar(-diferenca)
-
-            novo_saldo = self.wallet.saldo
-            self.saldo_var.set(f"Saldo: {formatar_reais(novo_saldo)}")
-
-            try:
-                aposta_atual = self._converter_para_float(self.aposta_var.get())
-            except ValueError:
-                aposta_atual = 0.0
-
-            if novo_saldo <= 0:
-                self.aposta_var.set("0,00")
-            else:
-                self.aposta_var.set(self._formatar_entrada(min(novo_saldo, aposta_atual)))
-
-    @staticmethod
-    def _converter_para_float(texto: str) -> float:
-        limpou = texto.replace("R$", "").strip().replace(".", "").replace(",", ".")
-        return float(limpou)
-
-    @staticmethod
-    def _formatar_entrada(valor: float) -> str:
-        return f"{valor:.2f}".replace(".", ",")
+    def _atualizar_saldo_compartilhado(self) -> None:
+        if self.wallet and not self.em_animacao:
+            self.saldo_var.set(f"Saldo: {formatar_reais(self.wallet.saldo)}")
 
 
 def run_app() -> None:
@@ -0,0 +1,85 @@
+"""Sessão de Cara ou Coroa sem dependência de interface."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from dinheiro import Centavos, formatar_reais, para_centavos
+from sessao import ErroSessao, Sessao, Tela
+
+from .game import LADOS, CoinGame, RoundResult
+
+if TYPE_CHECKING:
+    from estrategias import ModeloJogo
+
+
+@dataclass(frozen=True)
+class TelaCara(Tela):
+    resultado: RoundResult | None = None
+
+
+class SessaoCara(Sessao[CoinGame, TelaCara]):
+    """Valida apostas, joga a moeda e mantém carteira e histórico em dia."""
+
+    jogo = "cara"
+    ACOES = ("iniciar", "apostar")
+    APOSTA_PADRAO = 10.0
+    STATUS_INICIAL = "Informe um saldo inicial para jogar."
+    STATUS_CARTEIRA = "Saldo compartilhado carregado. Clique em Iniciar."
+    STATUS_INICIO = "Saldo definido! Faça sua aposta."
+
+    resultado: RoundResult | None = None
+    escolha = "cara"
+
+    def apostar(self, escolha: str, aposta: str | float) -> RoundResult:
+        lado = str(escolha).strip().lower()
+        if lado not in LADOS:
+            raise ErroSessao("Escolha", "Escolha cara ou coroa.", aviso=True)
+        valor = self.ler_aposta(aposta)
+        self.escolha = lado
+        resultado = self._jogar(valor)
+        self._anunciar(resultado)
+        self._concluir_rodada(resultado)
+        self._emitir()
+        return resultado
+
+    def tela(self) -> TelaCara:
+        return TelaCara(**self._campos_tela(), resultado=self.resultado)
+
+    def modelo(self) -> ModeloJogo:
+        from estrategias import modelo_moeda
+
+        return modelo_moeda()
+
+    def _criar_motor(self, saldo: float) -> CoinGame:
+        return CoinGame(saldo)
+
+    def _rodada(self, aposta: float) -> RoundResult:
+        assert self.motor is not None
+        return self.motor.jogar(self.escolha, aposta)
+
+    def _rodadas(self, aposta: float, quantidade: int) -> list[RoundResult]:
+        assert self.motor is not None
+        return self.motor.jogar_lote(self.escolha, aposta, quantidade).rodadas()
+
+    def _maior_ganho(self, aposta: float) -> Centavos:
+        return para_centavos(aposta)
+
+    def _anunciar(self, resultado: RoundResult) -> None:
+        assert self.motor is not None
+        self.resultado = resultado
+        novo_saldo = formatar_reais(self.motor.saldo)
+        if resultado.venceu:
+            self.status = f"Você ganhou {formatar_reais(resultado.aposta)}! Novo saldo: {novo_saldo}."
+        else:
+            self.status = f"Você perdeu {formatar_reais(resultado.aposta)}. Novo saldo: {novo_saldo}."
+        if self.motor.saldo_centavos <= 0:
+            self.status = "Seu saldo zerou. Defina um novo saldo inicial para continuar jogando."
+        self.aposta_sugerida = min(self.motor.saldo, resultado.aposta)
+
+    def _limpar_rodada(self) -> None:
+        self.resultado = None
+
+
+__all__ = ["SessaoCara", "TelaCara"]
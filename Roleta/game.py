@@ -5,29 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 import random
 
-VERMELHOS = {
-    1,
-    3,
-    5,
-    7,
-    9,
-    12,
-    14,
-    16,
-    18,
-    19,
-    21,
-    23,
-    25,
-    27,
-    30,
-    32,
-    34,
-    36,
-}
-
-PRETOS = set(range(1, 37)) - VERMELHOS
-
+import tabelas
+from dinheiro import Centavos, para_centavos
 
 @dataclass
 class SpinResult:
@@ -39,53 +18,84 @@ class SpinResult:
 
 
 class RouletteGame:
-    """Mantém o saldo e resolve jogadas da roleta europeia."""
+    """Mantém o saldo e resolve jogadas da roleta europeia.
+
+    Casas, cores e pagamentos vêm de ``tabela`` (a de ``tabelas/roleta.toml``
+    por padrão); ela pode ser trocada entre giros. As casas saem de ``rng``
+    (um ``random.Random`` próprio por padrão).
+    """
 
-    def __init__(self, saldo_inicial: float) -> None:
+    def __init__(
+        self, saldo_inicial: float, tabela: tabelas.TabelaRoleta | None = None, rng: random.Random | None = None
+    ) -> None:
         if saldo_inicial <= 0:
             raise ValueError("O saldo inicial precisa ser maior que zero.")
-        self._saldo = float(saldo_inicial)
+        self._centavos: Centavos = para_centavos(saldo_inicial)
+        self.tabela: tabelas.TabelaRoleta = tabela if tabela is not None else tabelas.padrao("roleta")
+        self.rng = rng if rng is not None else random.Random()
 
     @property
     def saldo(self) -> float:
-        return round(self._saldo, 2)
+        return self._centavos / 100
+
+    @property
+    def saldo_centavos(self) -> Centavos:
+        return self._centavos
 
     def pode_apostar(self, valor: float) -> bool:
-        return 0 < valor <= self._saldo
+        return 0 < para_centavos(valor) <= self._centavos
 
     def girar(self, cor_escolhida: str, aposta: float) -> SpinResult:
+        tabela = self.tabela
         cor_normalizada = cor_escolhida.strip().lower()
-        if cor_normalizada not in {"vermelho", "preto", "verde"}:
-            raise ValueError("A cor precisa ser 'vermelho', 'preto' ou 'verde'.")
-        if not self.pode_apostar(aposta):
+        retornos = tabela.retornos.get(cor_normalizada)
+        if retornos is None:
+            raise ValueError(f"A cor precisa ser uma de: {', '.join(map(repr, tabela.retornos))}.")
+        aposta_centavos = para_centavos(aposta)
+        if not 0 < aposta_centavos <= self._centavos:
             raise ValueError("A aposta precisa ser positiva e menor ou igual ao saldo.")
 
-        numero = random.randint(0, 36)
-        cor_resultado = self._cor_do_numero(numero)
-        venceu = cor_resultado == cor_normalizada
+        numero = self.rng.randrange(len(retornos))
+        venceu = retornos[numero] > 0
 
-        ganho = 0.0
+        ganho = 0
         if venceu:
-            if cor_normalizada == "verde":
-                ganho = aposta * 35
-            else:
-                ganho = aposta
-            self._saldo += ganho
+            ganho = aposta_centavos * retornos[numero] // 10 - aposta_centavos
+            self._centavos += ganho
         else:
-            self._saldo -= aposta
+            self._centavos -= aposta_centavos
 
         return SpinResult(
             numero=numero,
-            cor=cor_resultado,
+            cor=tabela.cores[numero],
             aposta_cor=cor_normalizada,
             venceu=venceu,
-            ganho=ganho,
+            ganho=ganho / 100,
         )
 
-    @staticmethod
-    def _cor_do_numero(numero: int) -> str:
-        if numero == 0:
-            return "verde"
-        if numero in VERMELHOS:
-            return "vermelho"
-        return "preto"
+    def girar_lote(self, cor_escolhida: str, aposta: float, quantidade: int) -> list[SpinResult]:
+        """``quantidade`` giros seguidos com a mesma aposta, como ``girar`` repetido.
+
+        Para no primeiro giro que o saldo não cobre; os sorteios são os mesmos
+        de ``quantidade`` chamadas a ``girar``.
+        """
+        tabela = self.tabela
+        cor_normalizada = cor_escolhida.strip().lower()
+        retornos = tabela.retornos.get(cor_normalizada)
+        if retornos is None:
+            raise ValueError(f"A cor precisa ser uma de: {', '.join(map(repr, tabela.retornos))}.")
+        aposta_centavos = para_centavos(aposta)
+        if not 0 < aposta_centavos <= self._centavos:
+            raise ValueError("A aposta precisa ser positiva e menor ou igual ao saldo.")
+
+        sortear, casas, cores = self.rng.randrange, len(retornos), tabela.cores
+        resultados = []
+        for _ in range(quantidade):
+            if aposta_centavos > self._centavos:
+                break
+            numero = sortear(casas)
+            retorno = retornos[numero]
+            ganho = aposta_centavos * retorno // 10 - aposta_centavos if retorno else 0
+            self._centavos += ganho if retorno else -aposta_centavos
+            resultados.append(SpinResult(numero, cores[numero], cor_normalizada, retorno > 0, ganho / 100))
+        return resultados
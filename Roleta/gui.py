@@ -4,10 +4,20 @@ from __future__ import annotations
 
 import math
 import tkinter as tk
-from tkinter import messagebox, ttk
-from typing import Callable, Protocol
+from tkinter import ttk
+from typing import Callable
 
-from .game import PRETOS, VERMELHOS, RouletteGame, SpinResult
+import tabelas
+from dinheiro import formatar_reais
+from eventos import assinar_por_quadro
+from painel_automatico import Jogar, PainelAutomatico
+from sessao import CarteiraProtocol, ErroSessao, formatar_entrada
+from tema import aplicar_tema, fonte, mostrar_erro
+
+from .sessao import SessaoRoleta, TelaRoleta
+
+# A mesa desenhada é a da roleta europeia da tabela padrão.
+VERMELHOS = tabelas.padrao("roleta").numeros("vermelho")
 
 WHEEL_SEQUENCE = [
     0, 32, 15, 19, 4, 21, 2, 25, 17, 34, 6, 27, 13, 36, 11, 30, 8, 23, 10, 5, 24, 16, 33, 1, 20, 14, 31, 9, 22, 18, 29, 7, 28, 12, 35, 3, 26
@@ -18,16 +28,6 @@ POINTER_ANGLE = 90.0
 NUMBER_TO_INDEX = {numero: indice for indice, numero in enumerate(WHEEL_SEQUENCE)}
 
 
-def formatar_reais(valor: float) -> str:
-    return f"R${valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-
-
-class CarteiraProtocol(Protocol):
-    saldo: float
-    def depositar(self, valor: float) -> None: ...
-    def retirar(self, valor: float) -> bool: ...
-
-
 class RouletteApp:
     """Janela com controles para jogar a roleta."""
 
@@ -37,12 +37,15 @@ class RouletteApp:
         self.master.resizable(False, False)
         self.master.configure(bg="#1f1f2e")
 
-        self.game: RouletteGame | None = None
-        self._ultima_aposta = 0.0
-        self._resultado_pendente: SpinResult | None = None
+        self.sessao = SessaoRoleta()
         self._angulo_atual = 0.0
         self._animacao_offsets: list[float] = []
         self._animacao_total = 0
+        self._agendamento: str | None = None
+        self._girando = False
+        self._tela_pendente: TelaRoleta | None = None
+        self._ao_parar: Callable[[], None] | None = None
+        self._aposta_exibida = ""
 
         self.canvas_center = 150
         self.raio_externo = 120
@@ -51,23 +54,14 @@ class RouletteApp:
         self.pointer: int | None = None
         self.texto_numero: int | None = None
         self.wallet: CarteiraProtocol | None = None
-        self._saldo_factory: Callable[[], float] | None = None
-        
-        self.selected_bet_type = tk.StringVar(value="") # "vermelho", "preto", "verde"
+        self._cancelar_assinatura: Callable[[], None] | None = None
 
         self._montar_interface()
+        self.sessao.assinar(self._renderizar)
+        self._renderizar(self.sessao.tela())
 
     def _montar_interface(self) -> None:
-        estilo = ttk.Style()
-        estilo.theme_use("clam")
-        
-        # Configuração de estilos
-        estilo.configure("TFrame", background="#1f1f2e")
-        estilo.configure("TLabel", background="#1f1f2e", foreground="#ffffff", font=("Segoe UI", 10))
-        estilo.configure("TButton", font=("Segoe UI", 10, "bold"), background="#3d3d5c", foreground="#ffffff", borderwidth=0)
-        estilo.map("TButton", background=[("active", "#4d4d70")])
-        estilo.configure("Action.TButton", background="#00ff88", foreground="#0f0f1a")
-        estilo.map("Action.TButton", background=[("active", "#00cc6a")])
+        aplicar_tema(self.master)
         
         # Layout Principal: Esquerda (Mesa), Direita (Roda e Controles)
         main_frame = ttk.Frame(self.master, padding=20)
@@ -77,7 +71,7 @@ class RouletteApp:
         left_panel = ttk.Frame(main_frame)
         left_panel.grid(row=0, column=0, padx=(0, 20), sticky="n")
 
-        ttk.Label(left_panel, text="Mesa de Apostas", font=("Segoe UI", 14, "bold")).pack(pady=(0, 10))
+        ttk.Label(left_panel, text="Mesa de Apostas", font=fonte(self.master, "Segoe UI", 14, "bold")).pack(pady=(0, 10))
         
         self.board_frame = tk.Frame(left_panel, bg="#0f0f1a", padx=10, pady=10, relief="sunken", bd=2)
         self.board_frame.pack()
@@ -119,7 +113,7 @@ class RouletteApp:
         self.iniciar_btn.pack(fill="x")
 
         self.saldo_var = tk.StringVar(value="Saldo: R$0,00")
-        ttk.Label(info_frame, textvariable=self.saldo_var, font=("Segoe UI", 12, "bold"), foreground="#00ff88").pack(pady=(10, 0))
+        ttk.Label(info_frame, textvariable=self.saldo_var, font=fonte(self.master, "Segoe UI", 12, "bold"), foreground="#00ff88").pack(pady=(10, 0))
 
         # Canvas Roda
         self.canvas = tk.Canvas(right_panel, width=300, height=300, highlightthickness=0, bg="#1f1f2e")
@@ -129,7 +123,7 @@ class RouletteApp:
         # Pointer e Texto Central
         self.texto_numero = self.canvas.create_text(
             self.canvas_center, self.canvas_center,
-            text="", fill="#fafafa", font=("Segoe UI", 28, "bold"), tags="pointer"
+            text="", fill="#fafafa", font=fonte(self.master, "Segoe UI", 28, "bold"), tags="pointer"
         )
         self.pointer = self.canvas.create_polygon(
             self.canvas_center - 10, 15,
@@ -148,12 +142,21 @@ class RouletteApp:
         self.aposta_entry = ttk.Entry(control_frame, textvariable=self.aposta_var, state="disabled")
         self.aposta_entry.pack(fill="x", pady=(2, 10))
 
-        self.lbl_selecao = ttk.Label(control_frame, text="Selecione na mesa...", font=("Segoe UI", 10, "italic"))
+        self.lbl_selecao = ttk.Label(control_frame, text="Selecione na mesa...", font=fonte(self.master, "Segoe UI", 10, "italic"))
         self.lbl_selecao.pack(pady=(0, 10))
 
         self.botao_girar = ttk.Button(control_frame, text="GIRAR ROLETA", command=self._girar, state="disabled", style="Action.TButton")
         self.botao_girar.pack(fill="x", ipady=5)
 
+        self.automatico = PainelAutomatico(
+            control_frame,
+            self.sessao,
+            self.aposta_var.get,
+            self._girar_automatico,
+            lambda _ativo: self._renderizar(self.sessao.tela()),
+        )
+        self.automatico.pack(fill="x", pady=(10, 0))
+
         self.status_var = tk.StringVar(value="Bem-vindo à Roleta.")
         ttk.Label(right_panel, textvariable=self.status_var, wraplength=300, justify="center").pack(pady=10)
 
@@ -169,7 +172,7 @@ class RouletteApp:
             bg_color = "#2e7d32"
         
         btn = tk.Button(
-            parent, text=text, font=("Segoe UI", 9, "bold"),
+            parent, text=text, font=fonte(self.master, "Segoe UI", 9, "bold"),
             bg=bg_color, fg=text_color,
             activebackground="#ffffff", activeforeground=bg_color,
             relief="raised", bd=1, width=width, height=1,
@@ -179,58 +182,46 @@ class RouletteApp:
         self.bet_buttons.append(btn)
 
     def _selecionar_aposta(self, tipo: str, texto: str) -> None:
-        if self.game is None:
-            return
-        
-        self.selected_bet_type.set(tipo)
-        
-        # Feedback visual
-        display_text = f"Apostando em: {texto} ({tipo.upper()})"
-        if tipo == "vermelho":
-            self.lbl_selecao.configure(text=display_text, foreground="#ff6b6b")
-        elif tipo == "preto":
-            self.lbl_selecao.configure(text=display_text, foreground="#aaaaaa")
-        else:
-            self.lbl_selecao.configure(text=display_text, foreground="#00ff88")
-            
-        # Atualizar bordas dos botões (simples highlight)
-        # (Opcional: Implementar highlight mais complexo se sobrar tempo)
+        if not self._girando and not self.automatico.ativo:
+            self.sessao.selecionar(tipo, texto)
 
-    def set_wallet(self, wallet: CarteiraProtocol, saldo_factory: Callable[[], float]) -> None:
+    def set_wallet(self, wallet: CarteiraProtocol) -> None:
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
         self.wallet = wallet
-        self._saldo_factory = saldo_factory
-        self.saldo_inicial_entry.configure(state="disabled")
-        self.saldo_inicial_var.set(f"{wallet.saldo:.2f}".replace(".", ","))
-        self.saldo_var.set(f"Saldo: {formatar_reais(wallet.saldo)}")
-        self.status_var.set("Saldo carregado. Clique em Carregar Saldo.")
+        self._cancelar_assinatura = assinar_por_quadro(self.master, wallet, self._atualizar_saldo_compartilhado)
+        self.saldo_inicial_var.set(formatar_entrada(wallet.saldo))
+        self.sessao.conectar_carteira(wallet)
+
+    def resetar(self) -> None:
+        """Devolve a janela ao estado inicial para ser reaproveitada pelo Hub.
+
+        O resultado de um giro já vai para a carteira e o histórico quando a
+        roda começa a girar; aqui só a animação é interrompida.
+        """
+        if self._agendamento is not None:
+            self.master.after_cancel(self._agendamento)
+            self._agendamento = None
+        self.automatico.cancelar()
+        self._animacao_offsets = []
+        self._animacao_total = 0
+        self._girando = False
+        self._tela_pendente = None
+        self._ao_parar = None
+        if self._cancelar_assinatura:
+            self._cancelar_assinatura()
+            self._cancelar_assinatura = None
+        self.wallet = None
+        self.saldo_inicial_var.set("200,00")
+        self.sessao.resetar()
 
     def _iniciar_jogo(self) -> None:
-        if self._animacao_offsets:
+        if self._girando or self.automatico.ativo:
             return
-        if self.wallet and self._saldo_factory:
-            saldo = self._saldo_factory()
-            if saldo <= 0:
-                messagebox.showwarning("Carteira vazia", "Adicione saldo no Hub.")
-                return
-            self.game = RouletteGame(saldo)
-        else:
-            try:
-                saldo = self._converter_para_float(self.saldo_inicial_var.get())
-            except ValueError:
-                messagebox.showerror("Erro", "Saldo inválido.")
-                return
-            if saldo <= 0:
-                messagebox.showerror("Erro", "Saldo deve ser positivo.")
-                return
-            self.game = RouletteGame(saldo)
-            
-        self._atualizar_saldo()
-        self._habilitar_controles(True)
-        self.status_var.set("Faça sua aposta na mesa e clique em Girar.")
-        self._resetar_roleta()
-        sugestao = min(20.0, self.game.saldo)
-        self.aposta_var.set(self._formatar_entrada(sugestao))
-        self.iniciar_btn.configure(state="disabled")
+        try:
+            self.sessao.iniciar(self.saldo_inicial_var.get())
+        except ErroSessao as erro:
+            mostrar_erro(erro)
 
     def _habilitar_controles(self, habilitar: bool) -> None:
         estado = "normal" if habilitar else "disabled"
@@ -241,36 +232,36 @@ class RouletteApp:
             btn.configure(state=estado)
 
     def _girar(self) -> None:
-        if self.game is None or self._animacao_offsets:
-            return
-
-        tipo_aposta = self.selected_bet_type.get()
-        if not tipo_aposta:
-            messagebox.showwarning("Aposta", "Selecione uma opção na mesa de apostas!")
+        if self.sessao.motor is None or self._girando:
             return
 
+        # A tela com o resultado chega durante ``girar``; ela só é desenhada
+        # quando a roda parar.
+        self._girando = True
         try:
-            aposta = self._converter_para_float(self.aposta_var.get())
-        except ValueError:
-            messagebox.showerror("Erro", "Valor de aposta inválido.")
-            return
-
-        if not self.game.pode_apostar(aposta):
-            messagebox.showwarning("Saldo Insuficiente", "Aposta maior que o saldo.")
+            resultado = self.sessao.girar(self.aposta_var.get())
+        except ErroSessao as erro:
+            self._girando = False
+            mostrar_erro(erro)
             return
+        self._animar_giro(resultado.numero)
+
+    def _girar_automatico(self, jogar: Jogar, continuar: Callable[[], None]) -> None:
+        """Rodada do jogo automático sem turbo: mesma animação de um giro manual."""
+        self._girando = True
+        self._ao_parar = continuar
+        resultados = jogar()
+        if resultados:
+            self._animar_giro(resultados[-1].numero)
+        else:
+            self._finalizar_animacao()
 
-        self._ultima_aposta = aposta
-        # O jogo atual só suporta apostar em COR.
-        # A mesa permite clicar em números, mas mapeamos para a cor do número.
-        # Isso é uma limitação do backend que mantivemos para não quebrar a lógica.
-        # O usuário clica no "14" (Vermelho) -> Aposta no Vermelho.
-        
-        self._resultado_pendente = self.game.girar(tipo_aposta, aposta)
+    def _animar_giro(self, numero: int) -> None:
         self.status_var.set("Girando...")
         self._habilitar_controles(False)
         if self.texto_numero is not None:
             self.canvas.itemconfig(self.texto_numero, text="")
-        self._preparar_animacao(self._resultado_pendente.numero)
+        self._preparar_animacao(numero)
 
     def _preparar_animacao(self, numero: int) -> None:
         alvo_base = self._offset_para_numero(numero)
@@ -288,6 +279,7 @@ class RouletteApp:
         self._executar_animacao()
 
     def _executar_animacao(self) -> None:
+        self._agendamento = None
         if not self._animacao_offsets:
             self._finalizar_animacao()
             return
@@ -299,51 +291,52 @@ class RouletteApp:
         passos_restantes = len(self._animacao_offsets)
         progresso = 1 - (passos_restantes / self._animacao_total if self._animacao_total else 1)
         delay = int(20 + progresso * 100)
-        self.master.after(delay, self._executar_animacao)
+        self._agendamento = self.master.after(delay, self._executar_animacao)
 
     def _finalizar_animacao(self) -> None:
-        if self._resultado_pendente is None:
-            self._habilitar_controles(True)
-            return
-
-        self._desenhar_roleta(self._angulo_atual)
-        self._exibir_resultado(self._resultado_pendente)
-        self._resultado_pendente = None
+        self._girando = False
         self._animacao_total = 0
+        self._desenhar_roleta(self._angulo_atual)
+        if self._tela_pendente is not None:
+            tela, self._tela_pendente = self._tela_pendente, None
+            self._renderizar(tela)
+        if self._ao_parar is not None:
+            continuar, self._ao_parar = self._ao_parar, None
+            continuar()
+
+    def _renderizar(self, tela: TelaRoleta) -> None:
+        if self._girando:
+            self._tela_pendente = tela
+            return
 
-        if self.game and self.game.saldo > 0:
-            self._habilitar_controles(True)
-        else:
-            self._habilitar_controles(False)
-            self.status_var.set("Saldo zerado.")
-
-    def _exibir_resultado(self, resultado: SpinResult) -> None:
-        if self.texto_numero is not None:
-            self.canvas.itemconfig(self.texto_numero, text=str(resultado.numero))
-
-        saldo_atual = self.game.saldo if self.game else 0.0
-
-        if resultado.venceu:
-            msg = f"VENCEU! Caiu {resultado.numero} ({resultado.cor}). Ganhou {formatar_reais(resultado.ganho)}."
-            self.status_var.set(msg)
+        self.saldo_var.set(f"Saldo: {formatar_reais(tela.saldo)}")
+        self.status_var.set(tela.status)
+        self.saldo_inicial_entry.configure(state="disabled" if tela.com_carteira else "normal")
+        self.iniciar_btn.configure(state="disabled" if tela.iniciado or self.automatico.ativo else "normal")
+        self._habilitar_controles(tela.jogando and not self.automatico.ativo)
+        self.automatico.habilitar(tela.jogando)
+        if tela.aposta != self._aposta_exibida:
+            self.aposta_var.set(tela.aposta)
+            self._aposta_exibida = tela.aposta
+
+        if tela.selecao:
+            cores = {"vermelho": "#ff6b6b", "preto": "#aaaaaa"}
+            self.lbl_selecao.configure(
+                text=f"Apostando em: {tela.rotulo_selecao} ({tela.selecao.upper()})",
+                foreground=cores.get(tela.selecao, "#00ff88"),
+            )
         else:
-            msg = f"Perdeu. Caiu {resultado.numero} ({resultado.cor})."
-            self.status_var.set(msg)
-            
-        self._atualizar_saldo()
-        if self.wallet and self.game:
-            self._sincronizar_carteira()
-
-    def _resetar_roleta(self) -> None:
-        self._desenhar_roleta(self._angulo_atual)
+            self.lbl_selecao.configure(text="Selecione na mesa...", foreground="")
         if self.texto_numero is not None:
-            self.canvas.itemconfig(self.texto_numero, text="")
+            texto = str(tela.resultado.numero) if tela.resultado else ""
+            self.canvas.itemconfig(self.texto_numero, text=texto)
 
     def _desenhar_roleta(self, offset: float) -> None:
         self.canvas.delete("wheel")
         cx = cy = self.canvas_center
         raio_ext = self.raio_externo
         raio_int = self.raio_interno
+        fonte_numeros = fonte(self.master, "Segoe UI", 9, "bold")
 
         # Borda externa
         self.canvas.create_oval(
@@ -370,7 +363,7 @@ class RouletteApp:
             cor_texto = "#ffffff" if numero != 0 else "#000000"
             self.canvas.create_text(
                 x, y, text=str(numero), fill=cor_texto,
-                font=("Segoe UI", 9, "bold"), tags="wheel", angle=0
+                font=fonte_numeros, tags="wheel", angle=0
             )
 
         # Centro
@@ -381,33 +374,14 @@ class RouletteApp:
         )
         self.canvas.tag_raise("pointer")
 
-    def _sincronizar_carteira(self) -> None:
-        if not (self.wallet and self.game):
-            return
-        diferenca = round(self.game.saldo - self.wallet.saldo, 2)
-        if diferenca > 0:
-            self.wallet.depositar(diferenca)
-        elif diferenca < 0:
-            self.wallet.retirar(-diferenca)
-        self.saldo_var.set(f"Saldo: {formatar_reais(self.wallet.saldo)}")
-
     def _offset_para_numero(self, numero: int) -> float:
         indice = NUMBER_TO_INDEX[numero]
         centro_segmento = indice * SEGMENT_ANGLE + SEGMENT_ANGLE / 2
         return POINTER_ANGLE - centro_segmento
 
-    def _atualizar_saldo(self) -> None:
-        if self.game:
-            self.saldo_var.set(f"Saldo: {formatar_reais(self.game.saldo)}")
-
-    @staticmethod
-    def _converter_para_float(texto: str) -> float:
-        limpo = texto.replace("R$", "").strip().replace(".", "").replace(",", ".")
-        return float(limpo)
-
-    @staticmethod
-    def _formatar_entrada(valor: float) -> str:
-        return f"{valor:.2f}".replace(".", ",")
+    def _atualizar_saldo_compartilhado(self) -> None:
+        if self.wallet and not self._girando:
+            self.saldo_var.set(f"Saldo: {formatar_reais(self.wallet.saldo)}")
 
     @staticmethod
     def _cor_para_segmento(numero: int) -> str:
@@ -0,0 +1,114 @@
+"""Sessão da Roleta sem dependência de interface."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from dinheiro import Centavos, formatar_reais, para_centavos
+from sessao import ErroSessao, JogoAutomatico, Parada, Sessao, Tela
+
+from .game import RouletteGame, SpinResult
+
+if TYPE_CHECKING:
+    from estrategias import ModeloJogo
+
+
+@dataclass(frozen=True)
+class TelaRoleta(Tela):
+    selecao: str = ""
+    rotulo_selecao: str = ""
+    resultado: SpinResult | None = None
+
+
+class SessaoRoleta(Sessao[RouletteGame, TelaRoleta]):
+    """Guarda a seleção da mesa, gira a roda e repassa o saldo à carteira.
+
+    O jogo só aceita apostas em cor: escolher um número na mesa aposta na
+    cor daquele número.
+    """
+
+    jogo = "roleta"
+    ACOES = ("iniciar", "selecionar", "girar")
+    APOSTA_PADRAO = 20.0
+    STATUS_INICIAL = "Bem-vindo à Roleta."
+    STATUS_CARTEIRA = "Saldo carregado. Clique em Carregar Saldo."
+    STATUS_INICIO = "Faça sua aposta na mesa e clique em Girar."
+
+    selecao = ""
+    rotulo_selecao = ""
+    resultado: SpinResult | None = None
+
+    def selecionar(self, tipo: str, rotulo: str) -> None:
+        """Marca a aposta em ``tipo`` (cor); ``rotulo`` é o que o jogador clicou."""
+        if self.motor is None:
+            return
+        self.selecao = tipo
+        self.rotulo_selecao = rotulo
+        self._emitir()
+
+    def girar(self, aposta: str | float) -> SpinResult:
+        self._exigir_selecao()
+        valor = self.ler_aposta(aposta)
+        resultado = self._jogar(valor)
+        self._anunciar(resultado)
+        self._concluir_rodada(resultado, aposta=valor)
+        self._emitir()
+        return resultado
+
+    def automatico(self, aposta: str | float, parada: Parada, estrategia: str | None = None) -> JogoAutomatico:
+        self._exigir_selecao()
+        return super().automatico(aposta, parada, estrategia)
+
+    def tela(self) -> TelaRoleta:
+        return TelaRoleta(
+            **self._campos_tela(),
+            selecao=self.selecao,
+            rotulo_selecao=self.rotulo_selecao,
+            resultado=self.resultado,
+        )
+
+    def modelo(self) -> ModeloJogo:
+        from estrategias import modelo_roleta
+
+        return modelo_roleta(self.selecao, self.motor.tabela if self.motor is not None else self.tabela)
+
+    def _criar_motor(self, saldo: float) -> RouletteGame:
+        return RouletteGame(saldo, self.tabela)
+
+    def _exigir_selecao(self) -> None:
+        if self.motor is not None and not self.selecao:
+            raise ErroSessao("Aposta", "Selecione uma opção na mesa de apostas!", aviso=True)
+
+    def _rodada(self, aposta: float) -> SpinResult:
+        assert self.motor is not None
+        return self.motor.girar(self.selecao, aposta)
+
+    def _rodadas(self, aposta: float, quantidade: int) -> list[SpinResult]:
+        assert self.motor is not None
+        return self.motor.girar_lote(self.selecao, aposta, quantidade)
+
+    def _maior_ganho(self, aposta: float) -> Centavos:
+        assert self.motor is not None
+        centavos = para_centavos(aposta)
+        return centavos * max(self.motor.tabela.retornos[self.selecao]) // 10 - centavos
+
+    def _anunciar(self, resultado: SpinResult) -> None:
+        assert self.motor is not None
+        self.resultado = resultado
+        if resultado.venceu:
+            self.status = (
+                f"VENCEU! Caiu {resultado.numero} ({resultado.cor}). Ganhou {formatar_reais(resultado.ganho)}."
+            )
+        else:
+            self.status = f"Perdeu. Caiu {resultado.numero} ({resultado.cor})."
+        if self.motor.saldo_centavos <= 0:
+            self.status = "Saldo zerado."
+
+    def _limpar_rodada(self) -> None:
+        self.selecao = ""
+        self.rotulo_selecao = ""
+        self.resultado = None
+
+
+__all__ = ["SessaoRoleta", "TelaRoleta"]
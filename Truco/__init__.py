@@ -1,5 +1,13 @@
 """Pacote do jogo de Truco."""
 
-from .gui import TrucoApp, run_app  # pragma: no cover
+
+def __getattr__(nome: str) -> object:
+    # Carrega a interface só quando pedida, para que ``Truco.game`` não importe o tkinter.
+    if nome in {"TrucoApp", "run_app"}:
+        from . import gui
+
+        return getattr(gui, nome)
+    raise AttributeError(f"módulo {__name__!r} não possui o atributo {nome!r}")
+
 
 __all__ = ["TrucoApp", "run_app"]
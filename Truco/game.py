@@ -6,6 +6,9 @@ import random
 from dataclasses import dataclass
 from typing import Iterable, List, Optional
 
+import tabelas
+from dinheiro import Centavos, para_centavos
+
 RANK_ORDER = ["4", "5", "6", "7", "Q", "J", "K", "A", "2", "3"]
 SUITS = ["ouros", "espadas", "copas", "paus"]
 SUIT_NAMES = {
@@ -73,16 +76,25 @@ class TrucoRaiseResult:
 
 
 class TrucoGame:
-    """Gerencia uma mão rápida de Truco contra um adversário virtual."""
-
-    def __init__(self, saldo: float) -> None:
-        self.saldo = round(float(saldo), 2)
+    """Gerencia uma mão rápida de Truco contra um adversário virtual.
+
+    A meta da partida e os valores da mão a cada truco vêm de ``tabela`` (a de
+    ``tabelas/truco.toml`` por padrão). O embaralhamento e as decisões do
+    adversário usam ``rng`` (um ``random.Random`` próprio por padrão).
+    """
+
+    def __init__(
+        self, saldo: float, tabela: tabelas.TabelaTruco | None = None, rng: random.Random | None = None
+    ) -> None:
+        self._centavos: Centavos = para_centavos(saldo)
+        self.tabela: tabelas.TabelaTruco = tabela if tabela is not None else tabelas.padrao("truco")
+        self.rng = rng if rng is not None else random.Random()
         self._deck: list[Card] = []
         self.player_hand: list[Card] = []
         self.ai_hand: list[Card] = []
         self.vira: Card | None = None
         self.manilha_rank: str | None = None
-        self.aposta_base: float = 0.0
+        self._aposta_centavos: Centavos = 0
         self.multiplicador: int = 1
         self.rodada_atual: int = 1
         self.player_points = 0
@@ -91,19 +103,38 @@ class TrucoGame:
         self._ativa = False
         self.player_match_points = 0
         self.ai_match_points = 0
-        self.match_goal = 12
         self._partida_finalizada = False
         self._vencedor_partida: str | None = None
 
+    @property
+    def match_goal(self) -> int:
+        return self.tabela.meta_partida
+
+    @property
+    def saldo(self) -> float:
+        return self._centavos / 100
+
+    @saldo.setter
+    def saldo(self, valor: float) -> None:
+        self._centavos = para_centavos(valor)
+
+    @property
+    def saldo_centavos(self) -> Centavos:
+        return self._centavos
+
+    @property
+    def aposta_base(self) -> float:
+        return self._aposta_centavos / 100
+
     def pode_apostar(self, valor: float) -> bool:
-        return valor > 0 and valor <= self.saldo
+        return 0 < para_centavos(valor) <= self._centavos
 
     def iniciar_partida(self, aposta: float) -> None:
         if not self.pode_apostar(aposta):
             raise ValueError("Aposta inválida para o saldo atual.")
         if self._partida_finalizada:
             raise RuntimeError("A partida já terminou. Reinicie para jogar novamente.")
-        self.aposta_base = round(float(aposta), 2)
+        self._aposta_centavos = para_centavos(aposta)
         self._resetar_estado()
         self._distribuir_cartas()
         self._ativa = True
@@ -111,17 +142,18 @@ class TrucoGame:
     def pedir_truco(self) -> TrucoRaiseResult:
         if not self._ativa:
             return TrucoRaiseResult(False, False, self.multiplicador, "A rodada já terminou.")
-        if self.multiplicador >= 3:
+        novo_multiplicador = self.tabela.proximo_valor(self.multiplicador)
+        if novo_multiplicador is None:
             return TrucoRaiseResult(True, False, self.multiplicador, "O Truco já está valendo.")
 
-        novo_multiplicador = 3
-        potencial = self.aposta_base * novo_multiplicador
-        if potencial > self.saldo:
+        potencial = self._aposta_centavos * novo_multiplicador
+        if potencial > self._centavos:
             return TrucoRaiseResult(False, False, self.multiplicador, "Saldo insuficiente para aceitar o Truco.")
 
         self.multiplicador = novo_multiplicador
         if self._decidir_truco_ai():
-            return TrucoRaiseResult(True, False, self.multiplicador, "O adversário aceitou! Agora vale 3x.")
+            mensagem = f"O adversário aceitou! Agora vale {novo_multiplicador}x."
+            return TrucoRaiseResult(True, False, self.multiplicador, mensagem)
 
         self.player_points = 2
         self._finalizar_mao("player")
@@ -189,7 +221,7 @@ class TrucoGame:
 
     def _resetar_estado(self) -> None:
         self._deck = [Card(rank, suit) for rank in RANK_ORDER for suit in SUITS]
-        random.shuffle(self._deck)
+        self.rng.shuffle(self._deck)
         self.player_hand.clear()
         self.ai_hand.clear()
         self.vira = None
@@ -246,14 +278,13 @@ class TrucoGame:
         return "player"
 
     def _finalizar_mao(self, vencedor: str) -> None:
-        valor = round(self.aposta_base * self.multiplicador, 2)
+        valor = self._aposta_centavos * self.multiplicador
         if vencedor == "player":
-            self.saldo += valor
+            self._centavos += valor
             self.player_match_points = min(self.match_goal, self.player_match_points + self.multiplicador)
         else:
-            self.saldo -= valor
+            self._centavos -= valor
             self.ai_match_points = min(self.match_goal, self.ai_match_points + self.multiplicador)
-        self.saldo = round(self.saldo, 2)
         if self.player_match_points >= self.match_goal or self.ai_match_points >= self.match_goal:
             self._partida_finalizada = True
             self._vencedor_partida = "player" if self.player_match_points >= self.match_goal else "ai"
@@ -268,11 +299,11 @@ class TrucoGame:
             limiar += 4
         if media_ai >= limiar:
             return True
-        return random.random() < 0.4
+        return self.rng.random() < 0.4
 
     def reiniciar_partida(self, saldo: float | None = None) -> None:
         if saldo is not None:
-            self.saldo = round(float(saldo), 2)
+            self.saldo = saldo
         self.player_match_points = 0
         self.ai_match_points = 0
         self._partida_finalizada = False
@@ -281,7 +312,7 @@ class TrucoGame:
         self.player_hand.clear()
         self.ai_hand.clear()
         self._deck.clear()
-        self.aposta_base = 0.0
+        self._aposta_centavos = 0
         self.multiplicador = 1
         self.rodada_atual = 1
         self.player_points = 0
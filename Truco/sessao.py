@@ -0,0 +1,226 @@
+"""Sessão de Truco sem dependência de interface."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from dinheiro import formatar_reais, para_centavos
+from sessao import ErroSessao, Sessao, Tela, converter_valor
+
+from .game import TrucoGame, TrucoPlayResult, TrucoRaiseResult
+
+NOMES_VENCEDOR = {"player": "VOCÊ", "ai": "ADVERSÁRIO"}
+
+
+@dataclass(frozen=True)
+class TelaTruco(Tela):
+    cartas: tuple[str, ...] = ()
+    mao_ativa: bool = False
+    vira: str = ""
+    pontos: tuple[int, int] = (0, 0)
+    placar: tuple[int, int] = (0, 0)
+    multiplicador: int = 1
+    carta_jogador: str = ""
+    carta_adversario: str = ""
+    pode_pedir_truco: bool = False
+    pode_nova_mao: bool = False
+    pode_iniciar: bool = True
+    texto_iniciar: str = "Iniciar Jogo"
+    fim_de_partida: str | None = None
+
+
+class SessaoTruco(Sessao[TrucoGame, TelaTruco]):
+    """Conduz partidas de Truco: mãos, pedidos de truco e fim de partida.
+
+    A aposta da mão, e o acréscimo de cada truco pedido, fica reservada na
+    carteira até a mão terminar; é nesse momento que a reserva é acertada. ``fim_de_partida`` aparece em uma única tela, a que
+    anuncia o vencedor.
+    """
+
+    jogo = "truco"
+    ACOES = ("iniciar_partida", "nova_mao", "jogar_carta", "pedir_truco")
+    APOSTA_PADRAO = 20.0
+    SALDO_AVULSO = 250.0
+    STATUS_INICIAL = "Bem-vindo ao Truco."
+    STATUS_CARTEIRA = "Saldo carregado. Clique em Iniciar Jogo."
+    STATUS_INICIO = "Sua vez! Escolha uma carta."
+
+    aposta_base = 0.0
+    mao_ativa = False
+    pontos = (0, 0)
+    placar = (0, 0)
+    carta_jogador = ""
+    carta_adversario = ""
+    pode_pedir_truco = False
+    pode_nova_mao = False
+    texto_iniciar = "Iniciar Jogo"
+    fim_de_partida: str | None = None
+
+    def iniciar_partida(self, aposta: str | float, saldo_avulso: str | float | None = None) -> None:
+        """Começa uma partida nova, ou uma nova mão se a partida ainda não acabou."""
+        if self.mao_ativa:
+            return
+        saldo = self._saldo_inicial(saldo_avulso if saldo_avulso is not None else self.SALDO_AVULSO)
+        valor = self._ler_aposta_truco(aposta, saldo)
+
+        if self.motor is None or self.motor.partida_encerrada():
+            self.motor = self._novo_motor(saldo)
+        else:
+            self.motor.saldo = saldo
+        self._saldo_sincronizado = self.motor.saldo_centavos
+        self._limpar_rodada()
+        self._comecar_mao(valor)
+        self.status = self.STATUS_INICIO
+        self._emitir()
+
+    def nova_mao(self, aposta: str | float) -> None:
+        if self.motor is None:
+            return
+        valor = self._ler_aposta_truco(aposta, self.carteira.saldo if self.carteira else self.motor.saldo)
+        self._comecar_mao(valor)
+        self.carta_jogador = self.carta_adversario = ""
+        self.status = "Nova mão! Sua vez."
+        self._emitir()
+
+    def jogar_carta(self, indice: int) -> TrucoPlayResult:
+        if self.motor is None:
+            raise ErroSessao("Erro", "Nenhuma partida em andamento.")
+        try:
+            resultado = self.motor.jogar_carta(indice)
+        except (RuntimeError, IndexError) as exc:
+            raise ErroSessao("Erro", str(exc)) from None
+        self._registrar(resultado, aposta=self.aposta_base)
+
+        self.carta_jogador = resultado.player_card.label()
+        self.carta_adversario = resultado.ai_card.label()
+        self.pontos = (resultado.player_points, resultado.ai_points)
+        self.placar = (resultado.player_match_points, resultado.ai_match_points)
+        if resultado.round_winner == "player":
+            self.status = "Você venceu a rodada!"
+        elif resultado.round_winner == "ai":
+            self.status = "Adversário venceu a rodada."
+        else:
+            self.status = "Empate!"
+
+        if resultado.hand_finished:
+            valor = formatar_reais(self.aposta_base * resultado.multiplier)
+            if resultado.hand_winner == "player":
+                self.status = f"VOCÊ VENCEU A MÃO! (+{valor})"
+            elif resultado.hand_winner == "ai":
+                self.status = f"ADVERSÁRIO VENCEU A MÃO. (-{valor})"
+            else:
+                self.status = "Mão empatada."
+            self._encerrar_mao(
+                f"{NOMES_VENCEDOR[resultado.match_winner]} venceu a partida!" if resultado.match_winner else None
+            )
+        else:
+            self._emitir()
+        return resultado
+
+    def pedir_truco(self) -> TrucoRaiseResult | None:
+        if self.motor is None:
+            return None
+        resultado = self._reter_truco() or self.motor.pedir_truco()
+        self.status = resultado.message
+        if resultado.folded:
+            self._registrar(resultado, aposta=self.aposta_base)
+            self.carta_adversario = "CORREU"
+            self.placar = (self.motor.player_match_points, self.motor.ai_match_points)
+            self._encerrar_mao("Partida encerrada!" if self.motor.partida_encerrada() else None)
+            return resultado
+        if not resultado.accepted:
+            self.pode_pedir_truco = False
+        self._emitir()
+        return resultado
+
+    def tela(self) -> TelaTruco:
+        motor = self.motor
+        return TelaTruco(
+            **self._campos_tela(),
+            cartas=tuple(carta.label() for carta in motor.player_hand) if motor else (),
+            mao_ativa=self.mao_ativa,
+            vira=motor.vira.label() if motor and motor.vira else "",
+            pontos=self.pontos,
+            placar=self.placar,
+            multiplicador=motor.multiplicador if motor else 1,
+            carta_jogador=self.carta_jogador,
+            carta_adversario=self.carta_adversario,
+            pode_pedir_truco=self.pode_pedir_truco,
+            pode_nova_mao=self.pode_nova_mao,
+            pode_iniciar=not self.mao_ativa and (motor is None or motor.partida_encerrada()),
+            texto_iniciar=self.texto_iniciar,
+            fim_de_partida=self.fim_de_partida,
+        )
+
+    def _trocar_motor(self) -> None:
+        # A partida é do motor: depois de revelar a semente, a próxima começa do zero.
+        self._concluir_gravacao()
+        self.motor = None
+        self._limpar_rodada()
+
+    def _criar_motor(self, saldo: float) -> TrucoGame:
+        return TrucoGame(saldo, self.tabela)
+
+    def _limpar_rodada(self) -> None:
+        self.mao_ativa = False
+        self.pontos = (0, 0)
+        self.placar = (0, 0)
+        self.carta_jogador = self.carta_adversario = ""
+        self.pode_pedir_truco = self.pode_nova_mao = False
+        self.texto_iniciar = "Iniciar Jogo"
+        self.fim_de_partida = None
+
+    def _ler_aposta_truco(self, aposta: str | float, disponivel: float) -> float:
+        try:
+            valor = converter_valor(aposta)
+        except ValueError:
+            raise ErroSessao("Erro", "Aposta inválida.") from None
+        if valor <= 0:
+            raise ErroSessao("Aposta", "Aposta deve ser positiva.", aviso=True)
+        if valor > disponivel:
+            raise ErroSessao("Saldo", "Saldo insuficiente.", aviso=True)
+        return valor
+
+    def _reter_truco(self) -> TrucoRaiseResult | None:
+        """Reserva o acréscimo do próximo truco; se a carteira não cobre, a recusa no lugar do motor."""
+        assert self.motor is not None
+        novo = self.motor.tabela.proximo_valor(self.motor.multiplicador)
+        if not self.mao_ativa or novo is None:
+            return None
+        try:
+            self._reter(para_centavos(self.motor.aposta_base) * (novo - self.motor.multiplicador))
+        except ErroSessao:
+            return TrucoRaiseResult(False, False, self.motor.multiplicador, "Saldo insuficiente para aceitar o Truco.")
+        return None
+
+    def _comecar_mao(self, aposta: float) -> None:
+        assert self.motor is not None
+        self._reter(para_centavos(aposta))
+        try:
+            self.motor.iniciar_partida(aposta)
+        except (ValueError, RuntimeError) as exc:
+            self._sincronizar()
+            raise ErroSessao("Erro", str(exc)) from None
+        self.aposta_base = aposta
+        self.aposta_sugerida = aposta
+        self.mao_ativa = True
+        self.pontos = (0, 0)
+        self.placar = (self.motor.player_match_points, self.motor.ai_match_points)
+        self.pode_pedir_truco = True
+        self.pode_nova_mao = False
+
+    def _encerrar_mao(self, fim_de_partida: str | None) -> None:
+        """Fecha a mão e acerta a carteira; no fim da partida libera uma nova."""
+        self.mao_ativa = False
+        self.pode_pedir_truco = False
+        self._sincronizar()
+        if fim_de_partida:
+            self.fim_de_partida = fim_de_partida
+            self.texto_iniciar = "Nova Partida"
+        else:
+            self.pode_nova_mao = True
+        self._emitir()
+        self.fim_de_partida = None
+
+
+__all__ = ["SessaoTruco", "TelaTruco"]
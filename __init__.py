@@ -1,3 +1,9 @@
 """Coleção de jogos de aposta."""
 
-from .hub import run_app  # noqa: F401
+
+def __getattr__(nome: str) -> object:
+    if nome == "run_app":
+        from .hub import run_app
+
+        return run_app
+    raise AttributeError(f"módulo {__name__!r} não possui o atributo {nome!r}")
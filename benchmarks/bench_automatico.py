@@ -0,0 +1,79 @@
+"""Jogo automático com a estratégia padrão do painel: rodadas por segundo e lotes no motor.
+
+Joga ``--rodadas`` rodadas em cada jogo com a estratégia que o painel
+automático abre selecionada (``painel_automatico.ESTRATEGIA_PADRAO``), em
+lotes de ``--lote`` como o modo turbo, e conta as chamadas ao sorteio em
+lote do motor e ao de uma rodada. Com aposta fixa as rodadas precisam sair
+em lotes; se alguma passar pelo sorteio de uma rodada, o benchmark falha.
+
+Uso: ``python benchmarks/bench_automatico.py --rodadas 200000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CacaNiquel.sessao import SessaoSlot  # noqa: E402
+from CaraOuCoroa.sessao import SessaoCara  # noqa: E402
+from carteira import Wallet  # noqa: E402
+from painel_automatico import ESTRATEGIA_PADRAO, LOTE_TURBO_MAXIMO  # noqa: E402
+from Roleta.sessao import SessaoRoleta  # noqa: E402
+from sessao import Parada, Sessao  # noqa: E402
+
+# (sessão, sorteio em lote, sorteio de uma rodada, preparo)
+JOGOS: tuple[tuple[type[Sessao[Any, Any]], str, str, Callable[[Any], None]], ...] = (
+    (SessaoCara, "jogar_lote", "jogar", lambda sessao: None),
+    (SessaoRoleta, "girar_lote", "girar", lambda sessao: sessao.selecionar("preto", "Preto")),
+    (SessaoSlot, "girar_lote", "girar", lambda sessao: None),
+)
+
+
+def _contar(motor: Any, metodo: str, chamadas: dict[str, int]) -> None:
+    original = getattr(motor, metodo)
+
+    def contado(*args: Any, **kwargs: Any) -> Any:
+        chamadas[metodo] += 1
+        return original(*args, **kwargs)
+
+    setattr(motor, metodo, contado)
+
+
+def medir(
+    classe: type[Sessao[Any, Any]], lote: str, uma: str, preparar: Callable[[Any], None], rodadas: int, tamanho: int
+) -> None:
+    sessao = classe(Wallet(rodadas * 10))
+    sessao.iniciar()
+    preparar(sessao)
+    chamadas = {lote: 0, uma: 0}
+    _contar(sessao.motor, lote, chamadas)
+    _contar(sessao.motor, uma, chamadas)
+    jogo = sessao.automatico(1, Parada(rodadas=rodadas), ESTRATEGIA_PADRAO)
+    inicio = time.perf_counter()
+    while not jogo.encerrado:
+        jogo.proximo_lote(tamanho)
+    decorrido = time.perf_counter() - inicio
+    print(f"{sessao.jogo:<8} {jogo.jogadas / decorrido:12,.0f} rodadas/s  "
+          f"{lote} {chamadas[lote]:6}  {uma} {chamadas[uma]:6}  ({jogo.motivo})")
+    if chamadas[uma] or not chamadas[lote]:
+        raise SystemExit(f"{sessao.jogo}: a estratégia {ESTRATEGIA_PADRAO!r} não jogou em lotes no motor!")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Jogo automático com a estratégia padrão do painel.")
+    parser.add_argument("--rodadas", type=int, default=200_000)
+    parser.add_argument("--lote", type=int, default=LOTE_TURBO_MAXIMO, help="rodadas por proximo_lote")
+    args = parser.parse_args()
+
+    print(f"Estratégia padrão do painel: {ESTRATEGIA_PADRAO}")
+    for classe, lote, uma, preparar in JOGOS:
+        medir(classe, lote, uma, preparar, args.rodadas, args.lote)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Teste de estresse do ``CarteiraService`` com várias threads.
+
+Cada thread executa depósitos, retiradas, ajustes, transferências e reservas
+sobre um conjunto de contas. Ao final o total em circulação precisa bater
+exatamente com o saldo inicial mais o líquido movimentado por cada thread,
+o que detecta atualizações perdidas.
+
+Uso: ``python benchmarks/bench_carteira.py --threads 8 --operacoes 200000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from carteira import CarteiraService  # noqa: E402
+
+SALDO_INICIAL = 100_000_000  # centavos
+META_OPS_POR_SEGUNDO = 100_000
+
+
+def _trabalhador(
+    servico: CarteiraService,
+    contas: list[str],
+    operacoes: int,
+    semente: int,
+    liquidos: list[int],
+) -> None:
+    rng = random.Random(semente)
+    liquido = 0
+    for _ in range(operacoes):
+        conta = contas[rng.randrange(len(contas))]
+        tipo = rng.randrange(5)
+        if tipo == 0:
+            servico.depositar(conta, 100)
+            liquido += 100
+        elif tipo == 1:
+            if servico.retirar(conta, 100):
+                liquido -= 100
+        elif tipo == 2:
+            delta = 200 if rng.random() < 0.5 else -200
+            if servico.ajustar(conta, delta):
+                liquido += delta
+        elif tipo == 3:
+            servico.transferir(conta, contas[rng.randrange(len(contas))], 300)
+        else:
+            reserva = servico.reservar(conta, 500)
+            if reserva is not None:
+                servico.confirmar_reserva(reserva, credito=400)
+                liquido -= 100
+    liquidos.append(liquido)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estresse do serviço de carteiras.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operacoes", type=int, default=100_000, help="operações por thread")
+    parser.add_argument("--contas", type=int, default=16)
+    args = parser.parse_args()
+
+    servico = CarteiraService()
+    contas = [f"jogador-{i}" for i in range(args.contas)]
+    for conta in contas:
+        servico.abrir_conta(conta, SALDO_INICIAL)
+
+    liquidos: list[int] = []
+    threads = [
+        threading.Thread(target=_trabalhador, args=(servico, contas, args.operacoes, semente, liquidos))
+        for semente in range(args.threads)
+    ]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    total_ops = args.threads * args.operacoes
+    ops_por_segundo = total_ops / duracao
+    esperado = SALDO_INICIAL * len(contas) + sum(liquidos)
+    obtido = sum(servico.saldo(conta) for conta in contas)
+    print(f"{total_ops} operações em {duracao:.2f}s -> {ops_por_segundo:,.0f} ops/s")
+    print(f"Total esperado: {esperado} | total obtido: {obtido} (centavos)")
+
+    if esperado != obtido:
+        raise SystemExit("Atualização perdida detectada!")
+    if ops_por_segundo < META_OPS_POR_SEGUNDO:
+        raise SystemExit(f"Abaixo da meta de {META_OPS_POR_SEGUNDO:,} ops/s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Exatidão e custo do saldo em centavos inteiros comparado a ``float``.
+
+Simula ``--rodadas`` apostas com valores de centavos variados acumulando o
+saldo das duas formas, conferindo o saldo antes de cada aposta como os motores
+fazem em ``pode_apostar``. O acumulador inteiro precisa terminar exatamente no
+valor fechado calculado a partir das contagens; o ``float`` mostra a deriva.
+Também compara a formatação antiga (três ``replace``) com ``formatar_reais``,
+a chamada pelas janelas a cada atualização, e confere que as duas dão o
+mesmo texto, inclusive para negativos.
+
+Uso: ``python benchmarks/bench_dinheiro.py --rodadas 100000000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dinheiro import formatar_centavos, formatar_reais  # noqa: E402
+
+# Apostas em centavos repetidas em ciclo; ganhos e perdas se alternam.
+APOSTAS = (10, 25, 33, 50, 99, 101, 175, 1)
+SALDO_INICIAL = 1_000_000
+
+
+def _formatar_antigo(valor: float) -> str:
+    return f"R${valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _simular_float(rodadas: int) -> tuple[float, float]:
+    saldo = SALDO_INICIAL / 100
+    apostas = [a / 100 for a in APOSTAS]
+    ciclo = len(apostas)
+    inicio = time.perf_counter()
+    for i in range(rodadas):
+        aposta = apostas[i % ciclo]
+        if aposta > round(saldo, 2):
+            break
+        if i & 1:
+            saldo -= aposta
+        else:
+            saldo += aposta * 2
+    # Como os motores antigos: acumula em float e arredonda só na leitura.
+    return round(saldo, 2), time.perf_counter() - inicio
+
+
+def _simular_centavos(rodadas: int) -> tuple[int, float]:
+    saldo = SALDO_INICIAL
+    apostas = APOSTAS
+    ciclo = len(apostas)
+    inicio = time.perf_counter()
+    for i in range(rodadas):
+        aposta = apostas[i % ciclo]
+        if aposta > saldo:
+            break
+        if i & 1:
+            saldo -= aposta
+        else:
+            saldo += aposta * 2
+    return saldo, time.perf_counter() - inicio
+
+
+def _saldo_esperado(rodadas: int) -> int:
+    """Valor fechado: soma as contribuições de cada posição do ciclo."""
+    ciclo = len(APOSTAS)
+    total = SALDO_INICIAL
+    for posicao, aposta in enumerate(APOSTAS):
+        ocorrencias = rodadas // ciclo + (1 if posicao < rodadas % ciclo else 0)
+        total += ocorrencias * (-aposta if posicao & 1 else aposta * 2)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Centavos inteiros versus float.")
+    parser.add_argument("--rodadas", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    esperado = _saldo_esperado(args.rodadas)
+    saldo_int, tempo_int = _simular_centavos(args.rodadas)
+    saldo_float, tempo_float = _simular_float(args.rodadas)
+
+    print(f"Rodadas: {args.rodadas:,}")
+    print(f"Esperado:  {formatar_centavos(esperado)}")
+    print(f"Centavos:  {formatar_centavos(saldo_int)} em {tempo_int:.2f}s")
+    print(f"Float:     {formatar_reais(saldo_float)} em {tempo_float:.2f}s "
+          f"(deriva {saldo_float * 100 - esperado:+.0f} centavos)")
+    print(f"Aceleração do acumulador: {tempo_float / tempo_int:.2f}x")
+
+    for centavos in (*range(-200_000, 200_000, 997), -123_456_789, 123_456_789):
+        assert _formatar_antigo(centavos / 100) == formatar_reais(centavos / 100), centavos
+    for valor in (1_234_567.89, 87.5):
+        antigo = min(timeit.repeat(lambda: _formatar_antigo(valor), number=200_000, repeat=5))
+        novo = min(timeit.repeat(lambda: formatar_reais(valor), number=200_000, repeat=5))
+        print(f"Formatação de {formatar_reais(valor)}: antiga {antigo * 5:.3f}us, "
+              f"formatar_reais {novo * 5:.3f}us ({antigo / novo:.2f}x)")
+
+    if saldo_int != esperado:
+        raise SystemExit("Acumulador em centavos divergiu do valor esperado!")
+
+
+if __name__ == "__main__":
+    main()
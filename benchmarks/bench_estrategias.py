@@ -0,0 +1,79 @@
+"""Estratégias de aposta: ruína e retornos, avaliador em Python contra o vetorizado.
+
+Para cada estratégia avalia ``--sessoes`` sessões de até ``--rodadas``
+rodadas no jogo escolhido e imprime probabilidade de ruína, retorno médio e
+percentis do retorno. O avaliador em Python puro roda com ``--sessoes-python``
+sessões para comparar a vazão; sem NumPy, só ele roda.
+
+Uso: ``python benchmarks/bench_estrategias.py --jogo roleta --sessoes 1000000 --rodadas 200``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from estrategias import (  # noqa: E402
+    ESTRATEGIAS,
+    Avaliacao,
+    ModeloJogo,
+    avaliar,
+    avaliar_vetorizado,
+    modelo_moeda,
+    modelo_roleta,
+    modelo_slot,
+)
+
+MODELOS: dict[str, Callable[[], ModeloJogo]] = {"cara": modelo_moeda, "roleta": modelo_roleta, "slot": modelo_slot}
+
+
+def imprimir(rotulo: str, avaliacao: Avaliacao, duracao: float) -> None:
+    vazao = avaliacao.sessoes * avaliacao.rodadas_medias / duracao if duracao else 0.0
+    print(
+        f"{avaliacao.estrategia:11} {rotulo:8} ruína {avaliacao.probabilidade_ruina:6.3f}"
+        f"  retorno {avaliacao.retorno_medio:+8.3f} ± {avaliacao.desvio_retorno:7.3f}"
+        f"  p5 {avaliacao.percentil(5):+6.2f}  p50 {avaliacao.percentil(50):+6.2f}  p95 {avaliacao.percentil(95):+6.2f}"
+        f"  {vazao / 1e6:7.2f}M rodadas/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Avalia as estratégias de aposta em muitas sessões.")
+    parser.add_argument("--jogo", choices=sorted(MODELOS), default="roleta")
+    parser.add_argument("--sessoes", type=int, default=1_000_000)
+    parser.add_argument("--sessoes-python", type=int, default=5_000)
+    parser.add_argument("--rodadas", type=int, default=200)
+    parser.add_argument("--saldo", type=float, default=100.0)
+    parser.add_argument("--aposta", type=float, default=1.0)
+    parser.add_argument("--semente", type=int, default=None)
+    args = parser.parse_args()
+
+    modelo = MODELOS[args.jogo]()
+    print(f"{modelo.nome}: valor esperado {modelo.valor_esperado:+.4f} por unidade, Kelly {modelo.fracao_kelly():.3f}")
+    try:
+        import numpy  # noqa: F401
+
+        vetorizado = True
+    except ImportError:
+        vetorizado = False
+        print("NumPy ausente: só o avaliador em Python puro.")
+
+    for nome in ESTRATEGIAS:
+        inicio = time.perf_counter()
+        avaliacao = avaliar(nome, modelo, args.saldo, args.aposta, args.sessoes_python, args.rodadas, args.semente)
+        imprimir("python", avaliacao, time.perf_counter() - inicio)
+        if vetorizado:
+            inicio = time.perf_counter()
+            avaliacao = avaliar_vetorizado(
+                nome, modelo, args.saldo, args.aposta, args.sessoes, args.rodadas, args.semente
+            )
+            imprimir("numpy", avaliacao, time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    main()
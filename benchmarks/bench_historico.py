@@ -0,0 +1,65 @@
+"""Taxa sustentada de inserção do ``HistoricoStore``.
+
+Um simulador gira Cara ou Coroa, Roleta e Caça-Níquel sem parar e envia cada
+resultado ao histórico enquanto a thread de gravação agrupa as linhas em
+``executemany``. Ao final compara a taxa do simulador com a taxa de linhas
+confirmadas no SQLite e confere uma consulta por jogo usando os índices.
+
+Uso: ``python benchmarks/bench_historico.py --rodadas 3000000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CacaNiquel.game import SlotMachine  # noqa: E402
+from CaraOuCoroa.game import CoinGame  # noqa: E402
+from Roleta.game import RouletteGame  # noqa: E402
+from historico import HistoricoStore  # noqa: E402
+
+SALDO = 10**9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inserções sustentadas no histórico.")
+    parser.add_argument("--rodadas", type=int, default=300_000)
+    parser.add_argument("--lote", type=int, default=5_000)
+    args = parser.parse_args()
+
+    moeda, roleta, slot = CoinGame(SALDO), RouletteGame(SALDO), SlotMachine(SALDO)
+    with tempfile.TemporaryDirectory() as pasta:
+        historico = HistoricoStore(Path(pasta) / "historico.db", lote_maximo=args.lote)
+        inicio = time.perf_counter()
+        for indice in range(args.rodadas):
+            jogador = f"jogador-{indice % 100}"
+            tipo = indice % 3
+            if tipo == 0:
+                historico.registrar_rodada("cara", moeda.jogar("cara", 1), moeda.saldo_centavos, jogador)
+            elif tipo == 1:
+                historico.registrar_rodada("roleta", roleta.girar("preto", 1), roleta.saldo_centavos, jogador, aposta=1)
+            else:
+                historico.registrar_rodada("slot", slot.girar(1), slot.saldo_centavos, jogador)
+        produzido = time.perf_counter() - inicio
+        historico.aguardar()
+        gravado = time.perf_counter() - inicio
+
+        inicio_consulta = time.perf_counter()
+        linhas = historico.rodadas_do_jogador("jogador-7", 0, time.time_ns())
+        consulta = time.perf_counter() - inicio_consulta
+        historico.fechar()
+
+    print(f"Simulador: {args.rodadas / produzido:,.0f} rodadas/s")
+    print(f"Gravação sustentada: {historico.gravados / gravado:,.0f} linhas/s ({historico.gravados:,} linhas)")
+    print(f"Consulta por jogador: {len(linhas)} linhas em {consulta * 1000:.1f}ms")
+    if historico.gravados != args.rodadas:
+        raise SystemExit("Linhas perdidas no histórico!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Guarda de tempo de importação com ``python -X importtime``.
+
+Cada alvo é importado em um interpretador novo algumas vezes; usa-se a
+mediana do tempo cumulativo reportado para o módulo. Os motores ``*.game``
+e as sessões ``*.sessao`` não podem carregar o tkinter, e o hub não pode importar as interfaces dos
+jogos antes que alguém abra um deles.
+
+Uso: ``python benchmarks/bench_importacao.py --repeticoes 7``
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Orçamento de importação cumulativa em milissegundos.
+ORCAMENTOS_MS = {
+    "CaraOuCoroa.game": 40,
+    "Roleta.game": 40,
+    "CacaNiquel.game": 40,
+    "Truco.game": 40,
+    "CaraOuCoroa.sessao": 40,
+    "Roleta.sessao": 40,
+    "CacaNiquel.sessao": 40,
+    "Truco.sessao": 40,
+    "hub": 120,
+}
+PROIBIDOS = {
+    "CaraOuCoroa.game": {"tkinter"},
+    "Roleta.game": {"tkinter"},
+    "CacaNiquel.game": {"tkinter"},
+    "Truco.game": {"tkinter"},
+    "CaraOuCoroa.sessao": {"tkinter"},
+    "Roleta.sessao": {"tkinter"},
+    "CacaNiquel.sessao": {"tkinter"},
+    "Truco.sessao": {"tkinter"},
+    "hub": {"CaraOuCoroa.gui", "Roleta.gui", "CacaNiquel.gui", "Truco.gui"},
+}
+
+
+def medir(modulo: str) -> tuple[float, set[str]]:
+    """Devolve o tempo cumulativo em ms e os módulos importados."""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulativo = 0.0
+    importados: set[str] = set()
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        _, _, cumul, nome = (parte.strip() for parte in linha.replace("import time:", "|", 1).split("|"))
+        importados.add(nome)
+        if nome == modulo:
+            cumulativo = int(cumul) / 1000
+    return cumulativo, importados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tempo de importação dos módulos.")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    falhas: list[str] = []
+    for modulo, orcamento in ORCAMENTOS_MS.items():
+        tempos = []
+        importados: set[str] = set()
+        for _ in range(args.repeticoes):
+            tempo, importados = medir(modulo)
+            tempos.append(tempo)
+        mediana = statistics.median(tempos)
+        indevidos = PROIBIDOS[modulo] & importados
+        print(f"{modulo:<18} {mediana:7.1f}ms (orçamento {orcamento}ms)"
+              + (f"  importou {', '.join(sorted(indevidos))}" if indevidos else ""))
+        if mediana > orcamento:
+            falhas.append(f"{modulo} acima do orçamento")
+        if indevidos:
+            falhas.append(f"{modulo} importou {', '.join(sorted(indevidos))}")
+
+    if falhas:
+        raise SystemExit("; ".join(falhas))
+
+
+if __name__ == "__main__":
+    main()
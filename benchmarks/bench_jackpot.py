@@ -0,0 +1,102 @@
+"""Jackpot progressivo: custo por giro e conferência do fundo entre processos.
+
+Primeiro mede, num só processo, ``SlotMachine.girar`` sem jackpot e com um
+fundo local enviado a cada giro (``lote`` 1) ou em lotes. Depois sobe um
+``LivroDeContas``, como o servidor multiprocesso, e põe ``--processos``
+processos girando contra o mesmo fundo por proxy. No fim o fundo precisa
+bater exatamente com a semente, mais o que cada processo enviou, mais a
+semente de cada prêmio, menos os prêmios pagos; qualquer contribuição
+perdida aparece na diferença.
+
+Uso: ``python benchmarks/bench_jackpot.py --giros 200000 --processos 4``
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import tabelas  # noqa: E402
+from CacaNiquel.game import SlotMachine  # noqa: E402
+from carteira import CarteiraService  # noqa: E402
+from jackpot import FRACOES_POR_CENTAVO, Jackpot  # noqa: E402
+from servidor_multiprocesso import LivroDeContas  # noqa: E402
+
+APOSTA = 1.0
+
+
+def girar(maquina: SlotMachine, giros: int) -> tuple[float, list[int]]:
+    """Faz ``giros`` giros; devolve a duração e os prêmios de jackpot em centavos."""
+    premios = []
+    girar_ = maquina.girar
+    inicio = time.perf_counter()
+    for _ in range(giros):
+        resultado = girar_(APOSTA)
+        if resultado.jackpot:
+            premios.append(round(resultado.jackpot * 100))
+    return time.perf_counter() - inicio, premios
+
+
+def _processo(endereco: object, chave: bytes, lote: int, giros: int, semente: int) -> tuple[float, int, list[int]]:
+    """Gira contra o fundo do livro; devolve a duração, os centavos enviados e os prêmios."""
+    livro = LivroDeContas(address=endereco, authkey=chave)
+    livro.connect()
+    fundo = Jackpot(servico=livro.servico(), lote=lote)  # type: ignore[attr-defined]
+    maquina = SlotMachine(1e12, jackpot=fundo, rng=random.Random(semente))
+    duracao, premios = girar(maquina, giros)
+    fundo.descarregar()
+    contribuido = giros * round(APOSTA * 100) * maquina.tabela.jackpot_pontos_base
+    return duracao, (contribuido - fundo.fracoes_pendentes) // FRACOES_POR_CENTAVO, premios
+
+
+def entre_processos(lote: int, args: argparse.Namespace) -> None:
+    contexto = multiprocessing.get_context("fork")
+    with LivroDeContas(ctx=contexto) as livro:
+        chave = bytes(contexto.current_process().authkey)
+        servico = livro.servico()  # type: ignore[attr-defined]
+        semente_fundo = Jackpot(servico=servico).semente
+        tarefas = [(livro.address, chave, lote, args.giros, args.semente + k) for k in range(args.processos)]
+        inicio = time.perf_counter()
+        with contexto.Pool(args.processos) as grupo:
+            partes = grupo.starmap(_processo, tarefas)
+        duracao = time.perf_counter() - inicio
+        enviados = sum(enviado for _, enviado, _ in partes)
+        premios = [premio for _, _, lista in partes for premio in lista]
+        esperado = semente_fundo + enviados + len(premios) * semente_fundo - sum(premios)
+        final = servico.saldo("jackpot:slot")
+    giros = args.giros * args.processos
+    print(
+        f"lote {lote:>4}: {giros / duracao:>10.0f} giros/s em {args.processos} processos,"
+        f" {len(premios)} jackpot(s), fundo {final} == {esperado} centavos: {'ok' if final == esperado else 'ERRO'}"
+    )
+    assert final == esperado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo e consistência do jackpot progressivo.")
+    parser.add_argument("--giros", type=int, default=200_000, help="giros por processo")
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--semente", type=int, default=1)
+    args = parser.parse_args()
+
+    tabela = tabelas.padrao("slot")
+    base, _ = girar(SlotMachine(1e12, tabela, rng=random.Random(args.semente)), args.giros)
+    print(f"sem jackpot: {base / args.giros * 1e6:.2f}µs por giro")
+    for lote in (1, 256):
+        fundo = Jackpot(servico=CarteiraService(), lote=lote)
+        maquina = SlotMachine(1e12, tabela, jackpot=fundo, rng=random.Random(args.semente))
+        duracao, premios = girar(maquina, args.giros)
+        print(f"lote {lote:>4}: {duracao / args.giros * 1e6:.2f}µs por giro, {len(premios)} jackpot(s), um processo")
+
+    for lote in (1, 256):
+        entre_processos(lote, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Tempo para abrir a janela de cada jogo.
+
+Mede três situações por jogo:
+
+* ``sem cache``: tema e fontes reaplicados a cada abertura, como antes do
+  módulo ``tema`` (o cache é esvaziado antes de cada janela);
+* ``com cache``: tema aplicado uma vez por raiz e fontes compartilhadas;
+* ``reaberta``: janela recolhida reaproveitada pelo Hub (``resetar``).
+
+Precisa de um display; sem ``DISPLAY`` sobe um ``Xvfb``, como a suíte, e só
+é pulado se não houver nenhum dos dois.
+
+Uso: ``python benchmarks/bench_janelas.py --aberturas 20``
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import tema  # noqa: E402
+from registro import JOGOS_EMBUTIDOS  # noqa: E402
+from suite import display_virtual  # noqa: E402
+
+
+def _limpar_cache_tema() -> None:
+    tema._raizes_com_tema.clear()
+    tema._fontes.clear()
+
+
+def medir_aberturas(raiz: tk.Tk, interface: Callable[[tk.Misc], object], aberturas: int, limpar: bool) -> float:
+    """Mediana em ms de criar, desenhar e destruir a janela."""
+    tempos = []
+    for _ in range(aberturas):
+        if limpar:
+            _limpar_cache_tema()
+        inicio = time.perf_counter()
+        janela = tk.Toplevel(raiz)
+        interface(janela)
+        janela.update_idletasks()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        janela.destroy()
+    return statistics.median(tempos)
+
+
+def medir_reaberturas(raiz: tk.Tk, interface: Callable[[tk.Misc], object], aberturas: int) -> float:
+    janela = tk.Toplevel(raiz)
+    app = interface(janela)
+    janela.withdraw()
+    tempos = []
+    for _ in range(aberturas):
+        inicio = time.perf_counter()
+        app.resetar()  # type: ignore[attr-defined]
+        janela.deiconify()
+        janela.update_idletasks()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        janela.withdraw()
+    janela.destroy()
+    return statistics.median(tempos)
+
+
+def medir(aberturas: int) -> None:
+    raiz = tk.Tk()
+    raiz.withdraw()
+
+    print(f"{'jogo':<16} {'sem cache':>10} {'com cache':>10} {'reaberta':>10}")
+    for info in JOGOS_EMBUTIDOS:
+        interface = info.carregar_interface()
+        interface(tk.Toplevel(raiz)).master.destroy()  # aquece imports
+        sem_cache = medir_aberturas(raiz, interface, aberturas, limpar=True)
+        com_cache = medir_aberturas(raiz, interface, aberturas, limpar=False)
+        reaberta = medir_reaberturas(raiz, interface, aberturas)
+        print(f"{info.nome:<16} {sem_cache:8.2f}ms {com_cache:8.2f}ms {reaberta:8.2f}ms")
+    raiz.destroy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tempo de abertura das janelas dos jogos.")
+    parser.add_argument("--aberturas", type=int, default=20)
+    args = parser.parse_args()
+
+    with display_virtual() as display:
+        if display is None:
+            print("Sem display nem Xvfb, benchmark pulado.")
+            return
+        medir(args.aberturas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Modo justo: custo do HMAC por rodada contra o gerador comum.
+
+Mede primeiro só a derivação do primeiro bloco de ``--rodadas`` nonces:
+um ``hmac.digest`` por rodada contra ``justo.derivar`` em lote. Depois
+joga cada motor com ``random.Random`` e com ``justo.GeradorJusto`` ligado
+por ``aplicar``, com lote 1 e com o lote padrão, e por fim confere a
+uniformidade (qui-quadrado) das casas da roleta, dos lados da moeda, das
+paradas de cada rolo e da carta que o Truco põe no fundo do baralho.
+
+Uso: ``python benchmarks/bench_justo.py --rodadas 200000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import hmac
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CacaNiquel.game import SlotMachine  # noqa: E402
+from CaraOuCoroa.game import CoinGame  # noqa: E402
+from justo import LOTE_PADRAO, GeradorJusto, aplicar, derivar  # noqa: E402
+from Roleta.game import RouletteGame  # noqa: E402
+from Truco.game import TrucoGame  # noqa: E402
+
+SALDO = 1e12
+SEMENTE = bytes(range(32))
+
+
+def _mao(truco: TrucoGame) -> None:
+    truco.iniciar_partida(1)
+    while truco.player_hand:
+        try:
+            truco.jogar_carta(0)
+        except RuntimeError:  # a mão acabou antes das três cartas
+            break
+    if truco.partida_encerrada():
+        truco.reiniciar_partida()
+
+
+JOGOS: dict[str, tuple[Callable[[], Any], Callable[[Any], Any]]] = {
+    "cara": (lambda: CoinGame(SALDO), lambda motor: motor.jogar("cara", 1)),
+    "roleta": (lambda: RouletteGame(SALDO), lambda motor: motor.girar("vermelho", 1)),
+    "slot": (lambda: SlotMachine(SALDO), lambda motor: motor.girar(1)),
+    "truco": (lambda: TrucoGame(SALDO), _mao),
+}
+
+
+def medir(rodadas: int, jogar: Callable[[Any], Any], motor: Any) -> float:
+    inicio = time.perf_counter()
+    for _ in range(rodadas):
+        jogar(motor)
+    return (time.perf_counter() - inicio) / rodadas
+
+
+def qui_quadrado(contagem: Counter[Any], categorias: int) -> str:
+    total = sum(contagem.values())
+    esperado = total / categorias
+    estatistica = sum((contagem[c] - esperado) ** 2 / esperado for c in range(categorias))
+    return f"qui² {estatistica:8.1f} com {categorias - 1} graus de liberdade"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo e uniformidade do modo comprovadamente justo.")
+    parser.add_argument("--rodadas", type=int, default=200_000)
+    args = parser.parse_args()
+    n = args.rodadas
+
+    inicio = time.perf_counter()
+    avulsos = [hmac.digest(SEMENTE, f"cliente:{nonce}".encode(), "sha256") for nonce in range(1, n + 1)]
+    um_a_um = (time.perf_counter() - inicio) / n
+    inicio = time.perf_counter()
+    em_lote = derivar(SEMENTE, "cliente", range(1, n + 1))
+    lote = (time.perf_counter() - inicio) / n
+    assert em_lote == avulsos
+    print(f"HMAC por rodada: {um_a_um * 1e6:.2f}µs avulso, {lote * 1e6:.2f}µs em lote")
+
+    print(f"{'jogo':<8} {'random':>10} {'justo, lote 1':>14} {f'lote {LOTE_PADRAO}':>10}")
+    for jogo, (criar, jogar) in JOGOS.items():
+        rodadas = n // 20 if jogo == "truco" else n
+        comum = medir(rodadas, jogar, criar())
+        tempos = []
+        for tamanho in (1, LOTE_PADRAO):
+            motor = criar()
+            aplicar(jogo, motor, GeradorJusto(SEMENTE, "cliente", lote=tamanho))
+            tempos.append(medir(rodadas, jogar, motor))
+        print(f"{jogo:<8} {comum * 1e6:>8.2f}µs {tempos[0] * 1e6:>12.2f}µs {tempos[1] * 1e6:>8.2f}µs")
+
+    gerador = GeradorJusto(SEMENTE, "uniformidade")
+    roleta, moeda, slot, truco = RouletteGame(SALDO), CoinGame(SALDO), SlotMachine(SALDO), TrucoGame(SALDO)
+    for jogo, motor in (("roleta", roleta), ("cara", moeda), ("slot", slot), ("truco", truco)):
+        aplicar(jogo, motor, gerador)
+    casas = Counter(roleta.girar("vermelho", 1).numero for _ in range(n))
+    print(f"roleta     {qui_quadrado(casas, len(roleta.tabela.cores))}")
+    lados = Counter(int(moeda.jogar("cara", 1).resultado_moeda == "cara") for _ in range(n))
+    print(f"moeda      {qui_quadrado(lados, 2)}")
+    paradas = [slot.girar(1).paradas for _ in range(n)]
+    for rolo, faixa in enumerate(slot.tabela.faixas):
+        print(f"rolo {rolo + 1}     {qui_quadrado(Counter(p[rolo] for p in paradas), len(faixa))}")
+    ordem = [f"{rank}{naipe}" for rank in "4567QJKA23" for naipe in "oecp"]
+    fundos: Counter[int] = Counter()
+    for _ in range(n // 10):
+        truco.iniciar_partida(1)
+        # ``_deck`` perde do fim para as mãos e a vira; o início é o fundo do baralho embaralhado.
+        carta = truco._deck[0]
+        fundos[ordem.index(f"{carta.rank}{carta.suit[0]}")] += 1
+        truco.reiniciar_partida()
+    print(f"baralho    {qui_quadrado(fundos, len(ordem))}")
+
+
+if __name__ == "__main__":
+    main()
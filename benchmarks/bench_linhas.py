@@ -0,0 +1,92 @@
+"""Caça-níquel: custo de avaliar as linhas de pagamento conforme elas aumentam.
+
+Monta tabelas 3×3 com a mesma tabela de prêmios de ``tabelas/slot.toml`` e
+de 1 a 25 linhas. Para cada uma mede, sobre as mesmas ``--grades`` paradas
+sorteadas, ``premios_por_linha`` (as colunas empacotadas somadas de uma vez)
+contra a avaliação ingênua que monta o índice de cada linha célula a célula
+na grade à vista, e por fim um ``SlotMachine.girar`` completo. Com as
+máscaras o custo fica quase parado: só a consulta ao prêmio cresce com as
+linhas.
+
+Uso: ``python benchmarks/bench_linhas.py --grades 20000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+import tomllib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import tabelas  # noqa: E402
+from CacaNiquel.game import SlotMachine, premios_por_linha  # noqa: E402
+
+QUANTIDADES = (1, 5, 10, 15, 20, 25)
+
+
+def tabela_com_linhas(quantidade: int) -> tabelas.TabelaSlot:
+    """A tabela padrão com as ``quantidade`` primeiras das 27 linhas possíveis numa grade 3×3."""
+    with open(Path(tabelas.DIRETORIO) / "slot.toml", "rb") as arquivo:
+        dados = tomllib.load(arquivo)
+    possiveis = sorted(itertools.product(range(3), repeat=3), key=lambda linha: linha != (1, 1, 1))
+    dados["grade"] = {"rolos": 3, "altura": 3, "linhas": [list(linha) for linha in possiveis[:quantidade]]}
+    return tabelas.compilar(json.dumps(dados).encode(), "json")  # type: ignore[return-value]
+
+
+def ingenuo(tabela: tabelas.TabelaSlot, paradas: list[int], quantidade: int) -> list[int]:
+    n, altura = len(tabela.nomes), tabela.altura
+    celulas = [
+        faixa[(parada + fileira) % len(faixa)]
+        for faixa, parada in zip(tabela.faixas, paradas)
+        for fileira in range(altura)
+    ]
+    por_linha = []
+    for linha in tabela.linhas[:quantidade]:
+        indice = 0
+        for rolo, fileira in enumerate(linha):
+            indice = indice * n + celulas[rolo * altura + fileira]
+        por_linha.append(tabela.premios[indice])
+    return por_linha
+
+
+def medir(avaliar, tabela: tabelas.TabelaSlot, grades: list[list[int]]) -> float:  # type: ignore[no-untyped-def]
+    quantidade = len(tabela.linhas)
+    inicio = time.perf_counter()
+    for paradas in grades:
+        avaliar(tabela, paradas, quantidade)
+    return (time.perf_counter() - inicio) / len(grades)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Avaliação das linhas do caça-níquel de 1 a 25 linhas.")
+    parser.add_argument("--grades", type=int, default=20_000)
+    parser.add_argument("--semente", type=int, default=1)
+    args = parser.parse_args()
+
+    random.seed(args.semente)
+    padrao = tabelas.padrao("slot")
+    grades = [[random.randrange(len(faixa)) for faixa in padrao.faixas] for _ in range(args.grades)]
+
+    print(f"{'linhas':>6} {'máscaras':>10} {'ingênuo':>10} {'girar':>10}")
+    for quantidade in QUANTIDADES:
+        tabela = tabela_com_linhas(quantidade)
+        for paradas in grades[:100]:
+            assert premios_por_linha(tabela, paradas, quantidade) == ingenuo(tabela, paradas, quantidade)
+        mascaras = medir(premios_por_linha, tabela, grades)
+        linha_a_linha = medir(ingenuo, tabela, grades)
+        girar = SlotMachine(1e9, tabela).girar
+        inicio = time.perf_counter()
+        for _ in range(args.grades):
+            girar(0.01)
+        giro = (time.perf_counter() - inicio) / args.grades
+        print(f"{quantidade:>6} {mascaras * 1e9:>8.0f}ns {linha_a_linha * 1e9:>8.0f}ns {giro * 1e6:>8.2f}µs")
+
+
+if __name__ == "__main__":
+    main()
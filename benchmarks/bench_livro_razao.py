@@ -0,0 +1,56 @@
+"""Taxa de gravação e tempo de recuperação do ``LivroRazao``.
+
+Mede quanto ``registrar`` custa para quem chama (o laço do Tk), a vazão até
+tudo estar em disco com ``fsync`` e o tempo para reabrir o livro a partir do
+snapshot mais a cauda.
+
+Uso: ``python benchmarks/bench_livro_razao.py --registros 1000000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from livro_razao import LivroRazao  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vazão do livro-razão.")
+    parser.add_argument("--registros", type=int, default=500_000)
+    parser.add_argument("--intervalo", type=float, default=0.05)
+    parser.add_argument("--lote", type=int, default=512)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "carteira.lrz"
+        livro = LivroRazao(caminho, intervalo=args.intervalo, tamanho_lote=args.lote)
+        latencias: list[float] = []
+        inicio = time.perf_counter()
+        for indice in range(args.registros):
+            antes = time.perf_counter()
+            livro.registrar(1 if indice & 1 else -1)
+            latencias.append(time.perf_counter() - antes)
+        enfileirado = time.perf_counter() - inicio
+        livro.fechar()
+        gravado = time.perf_counter() - inicio
+
+        latencias.sort()
+        p99 = latencias[int(len(latencias) * 0.99)] * 1e6
+        print(f"registrar: p50 {latencias[len(latencias) // 2] * 1e6:.2f}us, p99 {p99:.2f}us")
+        print(f"{args.registros:,} registros enfileirados em {enfileirado:.2f}s, "
+              f"em disco após {gravado:.2f}s ({args.registros / gravado:,.0f}/s)")
+
+        inicio = time.perf_counter()
+        with LivroRazao(caminho) as reaberto:
+            saldo = reaberto.saldo_centavos
+        print(f"Recuperação: {(time.perf_counter() - inicio) * 1000:.1f}ms (saldo {saldo} centavos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Custo da instrumentação de ``metricas`` nos motores e na carteira.
+
+Mede cada operação desligada, ligada e depois de ``desativar`` (que deve
+voltar ao custo original, pois os métodos originais são restaurados) e
+imprime o p50/p99 que o próprio histograma registrou.
+
+Uso: ``python benchmarks/bench_metricas.py --operacoes 200000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import metricas  # noqa: E402
+from CacaNiquel.game import SlotMachine  # noqa: E402
+from CaraOuCoroa.game import CoinGame  # noqa: E402
+from carteira import CarteiraService  # noqa: E402
+from Roleta.game import RouletteGame  # noqa: E402
+
+SALDO = 1e9
+
+
+def _operacoes() -> dict[str, tuple[str, str, Callable[[], object]]]:
+    """nome -> (jogo, operação, chamada); a chamada busca o método a cada vez, ligado ou não."""
+    moeda, roleta, slot = CoinGame(SALDO), RouletteGame(SALDO), SlotMachine(SALDO)
+    servico = CarteiraService()
+    servico.abrir_conta("bench", 0)
+    return {
+        "CoinGame.jogar": ("cara", "jogar", lambda: moeda.jogar("cara", 1)),
+        "RouletteGame.girar": ("roleta", "girar", lambda: roleta.girar("vermelho", 1)),
+        "SlotMachine.girar": ("slot", "girar", lambda: slot.girar(1)),
+        "CarteiraService.depositar": ("carteira", "depositar", lambda: servico.depositar("bench", 1)),
+    }
+
+
+def medir(chamar: Callable[[], object], operacoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(operacoes):
+        chamar()
+    return (time.perf_counter() - inicio) / operacoes * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sobrecarga da instrumentação de métricas.")
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'operação':28} {'desligada':>10} {'ligada':>10} {'restaurada':>11} {'p50':>8} {'p99':>8}")
+    for nome, (jogo, operacao, chamar) in _operacoes().items():
+        desligada = medir(chamar, args.operacoes)
+        registro = metricas.ativar()
+        ligada = medir(chamar, args.operacoes)
+        metricas.desativar()
+        restaurada = medir(chamar, args.operacoes)
+        histograma = registro.histograma("arcade_operacao_segundos", "", jogo=jogo, operacao=operacao)
+        print(
+            f"{nome:28} {desligada:8.0f}ns {ligada:8.0f}ns {restaurada:9.0f}ns"
+            f" {histograma.percentil(50):6d}ns {histograma.percentil(99):6d}ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Cara ou Coroa: ``jogar`` rodada a rodada contra ``jogar_lote`` e simulação contra fórmula.
+
+Primeiro mede ``--rodadas`` apostas feitas uma a uma e num único lote. Depois
+simula ``--sessoes`` sessões até a ruína ou a meta com ``CoinGame.jogar`` e
+compara a frequência de metas e a duração média com ``CaraOuCoroa.analise``,
+que responde a mesma pergunta sem simular.
+
+Uso: ``python benchmarks/bench_moeda.py --sessoes 2000 --saldo 100 --aposta 10 --meta 200``
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CaraOuCoroa.analise import analisar  # noqa: E402
+from CaraOuCoroa.game import CoinGame  # noqa: E402
+
+
+def medir_lote(rodadas: int) -> None:
+    motor = CoinGame(rodadas * 2)
+    inicio = time.perf_counter()
+    for _ in range(rodadas):
+        motor.jogar("cara", 1)
+    uma_a_uma = time.perf_counter() - inicio
+
+    motor = CoinGame(rodadas * 2)
+    inicio = time.perf_counter()
+    motor.jogar_lote("cara", 1, quantidade=rodadas)
+    lote = time.perf_counter() - inicio
+    print(f"{rodadas} rodadas: jogar {uma_a_uma * 1000:9.1f}ms  jogar_lote {lote * 1000:8.2f}ms")
+
+
+def simular(saldo: float, aposta: float, meta: float, sessoes: int) -> tuple[float, float]:
+    """Fração de sessões que chegam à meta e média de rodadas, jogando de verdade."""
+    metas = 0
+    duracoes = []
+    for _ in range(sessoes):
+        motor = CoinGame(saldo)
+        rodadas = 0
+        while motor.pode_apostar(aposta) and motor.saldo < meta:
+            motor.jogar("cara", aposta)
+            rodadas += 1
+        metas += motor.saldo >= meta
+        duracoes.append(rodadas)
+    return metas / sessoes, statistics.fmean(duracoes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lote da moeda e análise fechada contra simulação.")
+    parser.add_argument("--rodadas", type=int, default=1_000_000)
+    parser.add_argument("--sessoes", type=int, default=2000)
+    parser.add_argument("--saldo", type=float, default=100.0)
+    parser.add_argument("--aposta", type=float, default=10.0)
+    parser.add_argument("--meta", type=float, default=200.0)
+    args = parser.parse_args()
+
+    medir_lote(args.rodadas)
+
+    inicio = time.perf_counter()
+    frequencia, duracao = simular(args.saldo, args.aposta, args.meta, args.sessoes)
+    simulado = time.perf_counter() - inicio
+    analise = analisar(args.saldo, args.aposta, args.meta)
+    repeticoes = 10_000
+    formula = timeit.timeit(lambda: analisar(args.saldo, args.aposta, args.meta), number=repeticoes) / repeticoes
+
+    print(f"simulação ({args.sessoes} sessões): meta {frequencia:.4f}  rodadas {duracao:8.2f}  em {simulado:.2f}s")
+    print(
+        f"fórmula:                     meta {analise.probabilidade_meta:.4f}"
+        f"  rodadas {analise.rodadas_esperadas:8.2f}  em {formula * 1e6:.1f}µs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Reprodução de sessões gravadas: velocidade da verificação em lote.
+
+Grava ``--sessoes`` motores (Cara ou Coroa, Roleta, Caça-Níquel com cinco
+linhas e jackpot, e Truco) com ``--acoes`` ações cada, salva as gravações
+num arquivo JSON em linhas e as confere com ``reproducao.verificar_arquivo``,
+primeiro num só processo e depois com ``--processos`` processos. Por fim
+adultera o saldo final de uma gravação e confere que a divergência aparece.
+
+Uso: ``python benchmarks/bench_reproducao.py --sessoes 2000 --acoes 500 --processos 4``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import tabelas  # noqa: E402
+from CacaNiquel.game import SlotMachine  # noqa: E402
+from CaraOuCoroa.game import CoinGame  # noqa: E402
+from carteira import CarteiraService  # noqa: E402
+from jackpot import Jackpot  # noqa: E402
+from reproducao import Gravacao, Gravador, verificar_arquivo  # noqa: E402
+from Roleta.game import RouletteGame  # noqa: E402
+from Truco.game import TrucoGame  # noqa: E402
+
+SALDO = 1_000_000.0
+
+
+def jogar(gravador: Gravador, indice: int, acoes: int, fundo: Jackpot) -> Gravacao:
+    """Uma sessão de ``acoes`` ações do jogo da vez, com apostas variadas."""
+    escolha = random.Random(indice)
+    jogo = ("cara", "roleta", "slot", "truco")[indice % 4]
+    if jogo == "cara":
+        moeda = CoinGame(SALDO)
+        gravacao = gravador.gravar(jogo, moeda)
+        for _ in range(acoes):
+            moeda.jogar(escolha.choice(("cara", "coroa")), escolha.randint(1, 50))
+    elif jogo == "roleta":
+        roleta = RouletteGame(SALDO)
+        gravacao = gravador.gravar(jogo, roleta)
+        for _ in range(acoes):
+            roleta.girar(escolha.choice(("vermelho", "preto", "verde")), escolha.randint(1, 50))
+    elif jogo == "slot":
+        slot = SlotMachine(SALDO, tabelas.padrao("slot"), jackpot=fundo)
+        gravacao = gravador.gravar(jogo, slot)
+        cinco_linhas = tabelas.carregar(Path(tabelas.DIRETORIO) / "slot_5linhas.toml")
+        for numero in range(acoes):
+            if numero % 100 == 50:
+                slot.tabela = cinco_linhas
+                slot.linhas = escolha.randint(1, 5)
+            slot.girar(escolha.randint(1, 20))
+    else:
+        truco = TrucoGame(SALDO)
+        gravacao = gravador.gravar(jogo, truco)
+        feitas = 0
+        while feitas < acoes:
+            if truco.partida_encerrada():
+                truco.reiniciar_partida()
+            truco.iniciar_partida(escolha.randint(1, 50))
+            if escolha.random() < 0.3:
+                truco.pedir_truco()
+            while truco.player_hand:
+                try:
+                    truco.jogar_carta(escolha.randrange(len(truco.player_hand)))
+                except RuntimeError:  # a mão acabou antes das três cartas
+                    break
+            feitas += 5
+    return gravacao
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verificação em lote de sessões gravadas.")
+    parser.add_argument("--sessoes", type=int, default=2_000)
+    parser.add_argument("--acoes", type=int, default=500)
+    parser.add_argument("--processos", type=int, default=4)
+    args = parser.parse_args()
+
+    gravador = Gravador()
+    fundo = Jackpot(servico=CarteiraService(), lote=1)
+    inicio = time.perf_counter()
+    gravacoes = [jogar(gravador, indice, args.acoes, fundo) for indice in range(args.sessoes)]
+    gravacao_s = time.perf_counter() - inicio
+    acoes = sum(len(gravacao.acoes) for gravacao in gravacoes)
+    jackpots = sum(len(gravacao.jackpots or ()) for gravacao in gravacoes)
+    print(f"{args.sessoes} sessões, {acoes} ações ({jackpots} jackpots) gravadas em {gravacao_s:.2f}s")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "gravacoes.jsonl"
+        caminho.write_text("".join(gravacao.para_json() + "\n" for gravacao in gravacoes), encoding="utf-8")
+        print(f"arquivo: {caminho.stat().st_size / 1e6:.1f} MB")
+        for processos in (1, args.processos):
+            inicio = time.perf_counter()
+            total, divergencias = verificar_arquivo(caminho, processos)
+            duracao = time.perf_counter() - inicio
+            assert total == args.sessoes and not divergencias, divergencias[:3]
+            print(f"{processos:>2} processo(s): {acoes / duracao:>10.0f} ações/s, {total / duracao:>8.0f} sessões/s")
+
+        gravacoes[1].saldo_final += 1
+        caminho.write_text("".join(gravacao.para_json() + "\n" for gravacao in gravacoes), encoding="utf-8")
+        _, divergencias = verificar_arquivo(caminho, args.processos)
+        assert [numero for numero, _ in divergencias] == [2], divergencias
+        print(f"adulterada: linha {divergencias[0][0]}, {divergencias[0][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Carga no servidor de sessões: latência p50/p99 com milhares de sessões.
+
+Sobe ``servidor.py`` num processo separado (ou, com ``--processos N``,
+``servidor_multiprocesso.py`` com N trabalhadores; ou usa ``--endereco``),
+abre ``--sessoes`` sessões simultâneas repartidas em ``--conexoes``
+conexões e joga ``--rodadas`` rodadas em cada uma. Cada conexão pertence a
+um jogador, cuja carteira é compartilhada pelas sessões dela. Todas as
+sessões ficam abertas ao mesmo tempo e disputam as mesmas conexões, o que
+exercita a contrapressão do servidor. A latência medida é a de cada pedido
+de rodada, do envio até a resposta.
+
+Antes da carga, um jogador deposita R$100, abre ``SESSOES_CARTEIRA``
+sessões de Cara ou Coroa e aposta R$100 em cada uma: só as apostas que a
+carteira cobre no momento podem ser aceitas, e o saldo final precisa ser o
+depósito mais o resultado delas.
+
+A carga sai de ``--clientes`` processos, para que o gerador não seja o
+gargalo ao medir vários trabalhadores; a vazão só escala até o número de
+núcleos livres para servidor e clientes juntos.
+
+Uso: ``python benchmarks/bench_servidor.py --sessoes 10000 --conexoes 100 --processos 4 --clientes 4``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from servidor import Cliente  # noqa: E402
+
+SESSOES_CARTEIRA = 8
+
+# jogo -> (ações de preparo, ação de cada rodada)
+ROTEIROS: dict[str, tuple[tuple[tuple[str, list[Any]], ...], tuple[str, list[Any]]]] = {
+    "cara": ((("iniciar", []),), ("apostar", ["cara", 1])),
+    "roleta": ((("iniciar", []), ("selecionar", ["vermelho", "Vermelho"])), ("girar", [1])),
+    "slot": ((("iniciar", []),), ("girar", [1])),
+}
+
+
+async def _pedir(cliente: Cliente, op: str, **campos: Any) -> dict[str, Any]:
+    resposta = await cliente.pedir(op, **campos)
+    if not resposta["ok"]:
+        raise RuntimeError(f"{op}: {resposta['erro']['mensagem']}")
+    return resposta
+
+
+async def jogar_sessao(cliente: Cliente, jogador: str, jogo: str, rodadas: int, latencias: list[float]) -> None:
+    preparo, (acao, args) = ROTEIROS[jogo]
+    await _pedir(cliente, "carteira", jogador=jogador, depositar=rodadas * 10)
+    sessao = (await _pedir(cliente, "abrir", jogo=jogo, jogador=jogador))["sessao"]
+    for nome, argumentos in preparo:
+        await _pedir(cliente, "acao", sessao=sessao, acao=nome, args=argumentos)
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        await _pedir(cliente, "acao", sessao=sessao, acao=acao, args=args)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    await _pedir(cliente, "fechar", sessao=sessao)
+
+
+async def _carregar(host: str, porta: int, conexoes: range, args: argparse.Namespace) -> list[float]:
+    """Joga as sessões das ``conexoes`` indicadas; devolve as latências em ms."""
+    latencias: list[float] = []
+    clientes = {}
+    for indice in conexoes:
+        clientes[indice] = cliente = await Cliente.conectar(host, porta)
+        # A primeira linha leva o jogador, para o despachante escolher o fragmento.
+        await _pedir(cliente, "carteira", jogador=f"jogador-{indice}", depositar=1)
+    tarefas = []
+    for i in range(args.sessoes):
+        indice = i % args.conexoes
+        if indice in clientes:
+            tarefas.append(jogar_sessao(clientes[indice], f"jogador-{indice}", args.jogo, args.rodadas, latencias))
+    await asyncio.gather(*tarefas)
+    for cliente in clientes.values():
+        await cliente.fechar()
+    return latencias
+
+
+async def conferir_carteira(host: str, porta: int) -> None:
+    """Várias sessões de um jogador apostando tudo na mesma carteira não criam saldo."""
+    cliente = await Cliente.conectar(host, porta)
+    jogador = "carteira-compartilhada"
+    await _pedir(cliente, "carteira", jogador=jogador, depositar=100)
+    sessoes = []
+    for _ in range(SESSOES_CARTEIRA):
+        sessao = (await _pedir(cliente, "abrir", jogo="cara", jogador=jogador))["sessao"]
+        await _pedir(cliente, "acao", sessao=sessao, acao="iniciar")
+        sessoes.append(sessao)
+    aceitas, esperado = 0, 100.0
+    for sessao in sessoes:
+        resposta = await cliente.pedir("acao", sessao=sessao, acao="apostar", args=["cara", 100])
+        if resposta["ok"]:
+            aceitas += 1
+            esperado += 100 if resposta["retorno"]["venceu"] else -100
+    saldo = (await _pedir(cliente, "carteira", jogador=jogador))["saldo"]
+    await cliente.fechar()
+    print(f"carteira compartilhada: {aceitas} de {len(sessoes)} apostas de R$100 aceitas, saldo R${saldo:.2f}")
+    if saldo != esperado:
+        raise SystemExit(f"Saldo da carteira compartilhada divergiu: esperado R${esperado:.2f}.")
+
+
+def _carregar_em_processo(host: str, porta: int, conexoes: range, args: argparse.Namespace) -> list[float]:
+    return asyncio.run(_carregar(host, porta, conexoes, args))
+
+
+def medir(host: str, porta: int, args: argparse.Namespace) -> None:
+    fatias = [range(k, args.conexoes, args.clientes) for k in range(args.clientes)]
+    inicio = time.perf_counter()
+    if args.clientes == 1:
+        latencias = _carregar_em_processo(host, porta, fatias[0], args)
+    else:
+        with multiprocessing.get_context("spawn").Pool(args.clientes) as grupo:
+            partes = grupo.starmap(_carregar_em_processo, [(host, porta, fatia, args) for fatia in fatias])
+        latencias = [latencia for parte in partes for latencia in parte]
+    duracao = time.perf_counter() - inicio
+
+    percentis = statistics.quantiles(latencias, n=100)
+    print(
+        f"{args.sessoes} sessões em {args.conexoes} conexões, {len(latencias)} rodadas de {args.jogo},"
+        f" {args.processos or 1} processo(s) servidor, {args.clientes} cliente(s)"
+    )
+    print(f"p50 {percentis[49]:8.2f}ms  p99 {percentis[98]:8.2f}ms  máx {max(latencias):8.2f}ms")
+    print(f"vazão {len(latencias) / duracao:10.0f} rodadas/s em {duracao:.2f}s")
+
+
+def _subir_servidor(processos: int) -> tuple[subprocess.Popen[str], str, int]:
+    comando = [sys.executable, str(RAIZ / "servidor.py"), "--porta", "0"]
+    if processos:
+        comando = [sys.executable, str(RAIZ / "servidor_multiprocesso.py"), "--porta", "0"]
+        comando += ["--processos", str(processos)]
+    processo = subprocess.Popen(comando, stdout=subprocess.PIPE, text=True)
+    assert processo.stdout is not None
+    linha = processo.stdout.readline().strip()
+    host, _, porta = linha.removeprefix("Ouvindo em ").rpartition(":")
+    return processo, host, int(porta)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latência do servidor de sessões sob carga.")
+    parser.add_argument("--sessoes", type=int, default=10_000)
+    parser.add_argument("--conexoes", type=int, default=100)
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--jogo", choices=sorted(ROTEIROS), default="cara")
+    parser.add_argument("--processos", type=int, default=0, help="trabalhadores do servidor; 0 = processo único")
+    parser.add_argument("--clientes", type=int, default=1, help="processos geradores de carga")
+    parser.add_argument("--endereco", help="host:porta de um servidor já em execução")
+    args = parser.parse_args()
+    args.clientes = max(1, min(args.clientes, args.conexoes))
+
+    processo = None
+    if args.endereco:
+        host, _, porta = args.endereco.rpartition(":")
+    else:
+        processo, host, porta = _subir_servidor(args.processos)
+    try:
+        asyncio.run(conferir_carteira(host, int(porta)))
+        medir(host, int(porta), args)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Suíte de benchmarks dos motores e dos caminhos de desenho, com resultados em JSON.
+
+Cada caso é uma função ``caso(lacos) -> segundos`` que prepara o que precisa
+fora da medição e devolve só o tempo de ``lacos`` repetições da operação,
+como em ``pyperf``. O executor calibra ``lacos`` até cada amostra levar
+``--tempo-amostra``, descarta uma amostra de aquecimento e guarda
+``--amostras`` amostras por caso, em nanossegundos por operação.
+
+Casos de motor: ``CoinGame.jogar``, ``RouletteGame.girar``,
+``SlotMachine.girar`` e uma mão inteira de ``TrucoGame``. Casos Tk: um
+quadro de ``RouletteApp._desenhar_roleta`` e um passo de
+``SlotMachineApp._atualizar_coluna`` nas três colunas, ambos com
+``update_idletasks``. Sem ``DISPLAY`` a suíte sobe um ``Xvfb`` se ele
+existir; senão os casos Tk são pulados e marcados assim no JSON.
+
+O resultado vai para ``benchmarks/resultados/<commit>.json``; ``--comparar``
+confronta dois arquivos e sai com código 1 se algum caso ficou mais lento
+que ``--tolerancia`` e até a melhor amostra nova perde da mediana antiga.
+
+Uso: ``python benchmarks/suite.py`` e
+``python benchmarks/suite.py --comparar resultados/abc123.json resultados/def456.json``
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+RESULTADOS = Path(__file__).resolve().parent / "resultados"
+SALDO_INESGOTAVEL = 1e9
+LACOS_MAXIMOS = 1 << 24
+ESPERA_XVFB_S = 10.0
+
+Medicao = Callable[[int], float]
+
+
+@dataclass(frozen=True)
+class Caso:
+    nome: str
+    medir: Medicao
+    display: bool = False
+
+
+CASOS: list[Caso] = []
+
+
+def caso(nome: str, display: bool = False) -> Callable[[Medicao], Medicao]:
+    def registrar(medir: Medicao) -> Medicao:
+        CASOS.append(Caso(nome, medir, display))
+        return medir
+
+    return registrar
+
+
+@caso("motor/moeda.jogar")
+def _moeda_jogar(lacos: int) -> float:
+    from CaraOuCoroa.game import CoinGame
+
+    jogar = CoinGame(SALDO_INESGOTAVEL).jogar
+    inicio = time.perf_counter()
+    for _ in range(lacos):
+        jogar("cara", 1)
+    return time.perf_counter() - inicio
+
+
+@caso("motor/roleta.girar")
+def _roleta_girar(lacos: int) -> float:
+    from Roleta.game import RouletteGame
+
+    girar = RouletteGame(SALDO_INESGOTAVEL).girar
+    inicio = time.perf_counter()
+    for _ in range(lacos):
+        girar("vermelho", 1)
+    return time.perf_counter() - inicio
+
+
+@caso("motor/slot.girar")
+def _slot_girar(lacos: int) -> float:
+    from CacaNiquel.game import SlotMachine
+
+    girar = SlotMachine(SALDO_INESGOTAVEL).girar
+    inicio = time.perf_counter()
+    for _ in range(lacos):
+        girar(1)
+    return time.perf_counter() - inicio
+
+
+@caso("motor/truco.mao")
+def _truco_mao(lacos: int) -> float:
+    """Distribuir e jogar cartas até a mão acabar; a partida recomeça ao chegar a 12 pontos."""
+    from Truco.game import TrucoGame
+
+    motor = TrucoGame(SALDO_INESGOTAVEL)
+    inicio = time.perf_counter()
+    for _ in range(lacos):
+        if motor.partida_encerrada():
+            motor.reiniciar_partida()
+        motor.iniciar_partida(1)
+        while not motor.jogar_carta(0).hand_finished:
+            pass
+    return time.perf_counter() - inicio
+
+
+_raiz_tk: Any = None
+
+
+def _janela() -> Any:
+    global _raiz_tk
+    import tkinter as tk
+
+    if _raiz_tk is None:
+        _raiz_tk = tk.Tk()
+        _raiz_tk.withdraw()
+    return tk.Toplevel(_raiz_tk)
+
+
+@caso("tk/roleta.desenhar_roleta", display=True)
+def _roleta_quadro(lacos: int) -> float:
+    from Roleta.gui import RouletteApp
+
+    janela = _janela()
+    app = RouletteApp(janela)
+    janela.update_idletasks()
+    inicio = time.perf_counter()
+    for quadro in range(lacos):
+        app._desenhar_roleta(quadro * 7.5 % 360)
+        janela.update_idletasks()
+    decorrido = time.perf_counter() - inicio
+    janela.destroy()
+    return decorrido
+
+
+@caso("tk/slot.atualizar_coluna", display=True)
+def _slot_passo(lacos: int) -> float:
+    from CacaNiquel.gui import SlotMachineApp
+
+    janela = _janela()
+    app = SlotMachineApp(janela)
+    janela.update_idletasks()
+    faixas = [app._janela(0, parada) for parada in range(64)]
+    inicio = time.perf_counter()
+    for passo in range(lacos):
+        for indice, coluna in enumerate(app.reel_columns):
+            app._atualizar_coluna(indice, coluna, faixas[(passo + indice) % len(faixas)], (1,) if indice == 0 else ())
+        janela.update_idletasks()
+    decorrido = time.perf_counter() - inicio
+    janela.destroy()
+    return decorrido
+
+
+@contextlib.contextmanager
+def display_virtual() -> Iterator[str | None]:
+    """Garante um display: o atual, um ``Xvfb`` novo ou ``None`` se não houver como."""
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        yield None
+        return
+    leitura, escrita = os.pipe()
+    processo = subprocess.Popen(
+        [xvfb, "-displayfd", str(escrita), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        pass_fds=(escrita,),
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(escrita)
+    try:
+        with os.fdopen(leitura) as canal:
+            numero = canal.readline().strip()
+        if not numero:
+            yield None
+            return
+        os.environ["DISPLAY"] = f":{numero}"
+        yield os.environ["DISPLAY"]
+    finally:
+        os.environ.pop("DISPLAY", None)
+        processo.terminate()
+        processo.wait(ESPERA_XVFB_S)
+
+
+def calibrar(medir: Medicao, tempo_amostra: float) -> int:
+    lacos = 1
+    while lacos < LACOS_MAXIMOS and medir(lacos) < tempo_amostra:
+        lacos *= 2
+    return lacos
+
+
+def executar(caso: Caso, amostras: int, tempo_amostra: float) -> dict[str, Any]:
+    lacos = calibrar(caso.medir, tempo_amostra)
+    caso.medir(lacos)  # aquecimento
+    tempos = [caso.medir(lacos) / lacos * 1e9 for _ in range(amostras)]
+    return {
+        "lacos": lacos,
+        "amostras_ns": tempos,
+        "mediana_ns": statistics.median(tempos),
+        "media_ns": statistics.fmean(tempos),
+        "desvio_ns": statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+        "minimo_ns": min(tempos),
+    }
+
+
+def _git(*args: str) -> str:
+    try:
+        saida = subprocess.run(["git", *args], cwd=RAIZ, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return saida.stdout.strip()
+
+
+def metadados() -> dict[str, Any]:
+    commit = _git("rev-parse", "--short", "HEAD") or "sem-git"
+    if _git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-modificado"
+    return {
+        "commit": commit,
+        "data": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+
+def rodar(args: argparse.Namespace) -> dict[str, Any]:
+    selecionados = [c for c in CASOS if not args.casos or any(filtro in c.nome for filtro in args.casos)]
+    if args.sem_tk:
+        selecionados = [c for c in selecionados if not c.display]
+    resultado: dict[str, Any] = {"meta": metadados(), "casos": {}}
+    with contextlib.ExitStack() as pilha:
+        display = None
+        if any(c.display for c in selecionados):
+            display = pilha.enter_context(display_virtual())
+        for c in selecionados:
+            if c.display and display is None:
+                resultado["casos"][c.nome] = {"pulado": "sem display nem Xvfb"}
+                print(f"{c.nome:32} pulado (sem display nem Xvfb)")
+                continue
+            medida = executar(c, args.amostras, args.tempo_amostra)
+            resultado["casos"][c.nome] = medida
+            print(
+                f"{c.nome:32} {medida['mediana_ns'] / 1000:10.2f}µs ± {medida['desvio_ns'] / 1000:7.2f}µs"
+                f"  ({medida['lacos']} laços x {args.amostras})"
+            )
+        if _raiz_tk is not None:
+            _raiz_tk.destroy()
+    return resultado
+
+
+def comparar(antes: dict[str, Any], depois: dict[str, Any], tolerancia: float) -> bool:
+    """Imprime a variação da mediana de cada caso; devolve se houve regressão."""
+    print(f"{antes['meta']['commit']} -> {depois['meta']['commit']}")
+    for chave in ("python", "plataforma", "processador"):
+        if antes["meta"].get(chave) != depois["meta"].get(chave):
+            print(f"aviso: {chave} diferente ({antes['meta'].get(chave)} / {depois['meta'].get(chave)})")
+    regressao = False
+    for nome in sorted(antes["casos"].keys() | depois["casos"].keys()):
+        a, d = antes["casos"].get(nome, {}), depois["casos"].get(nome, {})
+        if "mediana_ns" not in a or "mediana_ns" not in d:
+            print(f"{nome:32} sem comparação")
+            continue
+        variacao = d["mediana_ns"] / a["mediana_ns"] - 1
+        if variacao > tolerancia and d["minimo_ns"] > a["mediana_ns"]:
+            veredito = "MAIS LENTO"
+            regressao = True
+        elif variacao > tolerancia:
+            # Amostras que se sobrepõem: provavelmente ruído da máquina.
+            veredito = "mais lento?"
+        elif variacao < -tolerancia:
+            veredito = "mais rápido"
+        else:
+            veredito = "igual"
+        print(
+            f"{nome:32} {a['mediana_ns'] / 1000:10.2f}µs -> {d['mediana_ns'] / 1000:10.2f}µs"
+            f"  {variacao:+7.1%}  {veredito}"
+        )
+    return regressao
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks com resultados em JSON.")
+    parser.add_argument("--casos", nargs="*", default=[], help="só casos cujo nome contém um destes textos")
+    parser.add_argument("--sem-tk", action="store_true", help="pula os casos que precisam de display")
+    parser.add_argument("--amostras", type=int, default=10)
+    parser.add_argument("--tempo-amostra", type=float, default=0.05, help="segundos mínimos por amostra")
+    parser.add_argument("--saida", type=Path, help="padrão: benchmarks/resultados/<commit>.json")
+    parser.add_argument("--comparar", nargs=2, type=Path, metavar=("ANTES", "DEPOIS"))
+    parser.add_argument("--tolerancia", type=float, default=0.05, help="variação da mediana aceita")
+    args = parser.parse_args()
+
+    if args.comparar:
+        antes, depois = (json.loads(caminho.read_text(encoding="utf-8")) for caminho in args.comparar)
+        sys.exit(1 if comparar(antes, depois, args.tolerancia) else 0)
+
+    resultado = rodar(args)
+    saida = args.saida or RESULTADOS / f"{resultado['meta']['commit']}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"resultados em {saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Carteira compartilhada e serviço de contas seguro entre threads."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass
+
+from typing import TYPE_CHECKING, Callable
+
+from dinheiro import Centavos, para_centavos
+
+if TYPE_CHECKING:
+    from livro_razao import LivroRazao
+
+LISTRAS_PADRAO = 64
+CONTA_PADRAO = "principal"
+
+Assinante = Callable[[str, Centavos], None]
+
+
+@dataclass(frozen=True)
+class Reserva:
+    """Valor retido de uma conta enquanto a aposta está em andamento."""
+
+    id: int
+    conta: str
+    valor: Centavos
+
+
+class CarteiraService:
+    """Mantém saldos de várias contas com travas distribuídas por listras.
+
+    Cada conta é protegida pela trava da sua listra (``hash(conta) % listras``),
+    então operações em contas diferentes raramente disputam a mesma trava.
+    Transferências adquirem as duas listras sempre na mesma ordem para evitar
+    deadlock. Todos os valores são centavos inteiros.
+
+    Assinantes de uma conta (``assinar``) recebem ``(conta, saldo)`` após cada
+    alteração, fora da trava, na thread que fez a operação.
+    """
+
+    def __init__(self, listras: int = LISTRAS_PADRAO) -> None:
+        if listras <= 0:
+            raise ValueError("A quantidade de listras precisa ser positiva.")
+        self._travas = [threading.Lock() for _ in range(listras)]
+        self._saldos: dict[str, Centavos] = {}
+        self._reservas: dict[int, Reserva] = {}
+        self._ids_reserva = itertools.count(1)
+        self._assinantes: dict[str, tuple[Assinante, ...]] = {}
+
+    def _indice(self, conta: str) -> int:
+        return hash(conta) % len(self._travas)
+
+    def _trava(self, conta: str) -> threading.Lock:
+        return self._travas[self._indice(conta)]
+
+    def abrir_conta(self, conta: str, saldo_inicial: Centavos = 0) -> None:
+        if saldo_inicial < 0:
+            raise ValueError("O saldo inicial não pode ser negativo.")
+        with self._trava(conta):
+            if conta in self._saldos:
+                raise ValueError(f"A conta {conta!r} já existe.")
+            self._saldos[conta] = saldo_inicial
+
+    def assinar(self, conta: str, assinante: Assinante) -> Callable[[], None]:
+        """Registra ``assinante`` e devolve a função que cancela a assinatura."""
+        with self._trava(conta):
+            self._assinantes[conta] = self._assinantes.get(conta, ()) + (assinante,)
+
+        def cancelar() -> None:
+            with self._trava(conta):
+                restantes = tuple(a for a in self._assinantes.get(conta, ()) if a is not assinante)
+                if restantes:
+                    self._assinantes[conta] = restantes
+                else:
+                    self._assinantes.pop(conta, None)
+
+        return cancelar
+
+    def _publicar(self, conta: str, saldo: Centavos) -> None:
+        for assinante in self._assinantes.get(conta, ()):
+            assinante(conta, saldo)
+
+    def possui_conta(self, conta: str) -> bool:
+        return conta in self._saldos
+
+    def saldo(self, conta: str) -> Centavos:
+        with self._trava(conta):
+            return self._saldo_da(conta)
+
+    def depositar(self, conta: str, valor: Centavos) -> None:
+        if valor < 0:
+            raise ValueError("Depósito não pode ser negativo.")
+        with self._trava(conta):
+            saldo = self._saldos[conta] = self._saldo_da(conta) + valor
+        self._publicar(conta, saldo)
+
+    def retirar(self, conta: str, valor: Centavos) -> bool:
+        if valor < 0:
+            raise ValueError("Valor inválido.")
+        with self._trava(conta):
+            atual = self._saldo_da(conta)
+            if valor > atual:
+                return False
+            saldo = self._saldos[conta] = atual - valor
+        self._publicar(conta, saldo)
+        return True
+
+    def ajustar(self, conta: str, delta: Centavos) -> bool:
+        """Aplica um crédito (delta positivo) ou débito (negativo) atomicamente."""
+        with self._trava(conta):
+            novo = self._saldo_da(conta) + delta
+            if novo < 0:
+                return False
+            self._saldos[conta] = novo
+        self._publicar(conta, novo)
+        return True
+
+    def comparar_e_definir(self, conta: str, esperado: Centavos, novo: Centavos) -> bool:
+        """Troca o saldo para ``novo`` apenas se ele ainda for ``esperado``."""
+        if novo < 0:
+            raise ValueError("O saldo não pode ficar negativo.")
+        with self._trava(conta):
+            if self._saldo_da(conta) != esperado:
+                return False
+            self._saldos[conta] = novo
+        self._publicar(conta, novo)
+        return True
+
+    def transferir(self, origem: str, destino: str, valor: Centavos) -> bool:
+        if valor < 0:
+            raise ValueError("Valor inválido.")
+        if origem == destino:
+            return self.possui_conta(origem) and valor <= self.saldo(origem)
+        primeira, segunda = sorted((self._indice(origem), self._indice(destino)))
+        with self._travas[primeira]:
+            if segunda != primeira:
+                self._travas[segunda].acquire()
+            try:
+                saldo_origem = self._saldo_da(origem)
+                saldo_destino = self._saldo_da(destino)
+                if valor > saldo_origem:
+                    return False
+                novo_origem = self._saldos[origem] = saldo_origem - valor
+                novo_destino = self._saldos[destino] = saldo_destino + valor
+            finally:
+                if segunda != primeira:
+                    self._travas[segunda].release()
+        self._publicar(origem, novo_origem)
+        self._publicar(destino, novo_destino)
+        return True
+
+    def reservar(self, conta: str, valor: Centavos) -> Reserva | None:
+        """Retém ``valor`` da conta; devolve ``None`` se não houver saldo."""
+        if valor <= 0:
+            raise ValueError("A reserva precisa ser positiva.")
+        with self._trava(conta):
+            atual = self._saldo_da(conta)
+            if valor > atual:
+                return None
+            saldo = self._saldos[conta] = atual - valor
+            reserva = Reserva(next(self._ids_reserva), conta, valor)
+            self._reservas[reserva.id] = reserva
+        self._publicar(conta, saldo)
+        return reserva
+
+    def confirmar_reserva(self, reserva: Reserva, credito: Centavos = 0) -> None:
+        """Consome a reserva e credita o prêmio da aposta, se houver."""
+        if credito < 0:
+            raise ValueError("Crédito não pode ser negativo.")
+        with self._trava(reserva.conta):
+            self._remover_reserva(reserva)
+            if not credito:
+                return
+            saldo = self._saldos[reserva.conta] = self._saldo_da(reserva.conta) + credito
+        self._publicar(reserva.conta, saldo)
+
+    def cancelar_reserva(self, reserva: Reserva) -> None:
+        with self._trava(reserva.conta):
+            self._remover_reserva(reserva)
+            saldo = self._saldos[reserva.conta] = self._saldo_da(reserva.conta) + reserva.valor
+        self._publicar(reserva.conta, saldo)
+
+    def total_reservado(self, conta: str) -> Centavos:
+        with self._trava(conta):
+            return sum(r.valor for r in list(self._reservas.values()) if r.conta == conta)
+
+    def _saldo_da(self, conta: str) -> Centavos:
+        try:
+            return self._saldos[conta]
+        except KeyError:
+            raise KeyError(f"Conta {conta!r} inexistente.") from None
+
+    def _remover_reserva(self, reserva: Reserva) -> None:
+        if self._reservas.pop(reserva.id, None) is None:
+            raise ValueError("Reserva já finalizada ou inexistente.")
+
+
+class Wallet:
+    """Gerencia uma carteira compartilhada, recebendo valores em reais.
+
+    Com um ``livro`` informado, cada movimentação bem-sucedida é registrada
+    nele. Na abertura só é registrada a diferença entre ``saldo_inicial`` e o
+    saldo já conhecido pelo livro, então restaurar uma carteira não duplica
+    o depósito inicial.
+    """
+
+    def __init__(
+        self,
+        saldo_inicial: float,
+        servico: CarteiraService | None = None,
+        conta: str = CONTA_PADRAO,
+        livro: LivroRazao | None = None,
+    ) -> None:
+        if saldo_inicial <= 0:
+            raise ValueError("A carteira precisa começar com saldo positivo.")
+        self.servico = servico or CarteiraService()
+        self.conta = conta
+        self.livro = livro
+        centavos = para_centavos(saldo_inicial)
+        self.servico.abrir_conta(conta, centavos)
+        if livro is not None:
+            livro.registrar(centavos - livro.saldo_centavos)
+
+    @classmethod
+    def da_conta(cls, servico: CarteiraService, conta: str = CONTA_PADRAO, livro: LivroRazao | None = None) -> Wallet:
+        """Carteira para uma conta que já existe em ``servico``, sem depósito inicial."""
+        if not servico.possui_conta(conta):
+            raise KeyError(f"Conta {conta!r} inexistente.")
+        carteira = cls.__new__(cls)
+        carteira.servico = servico
+        carteira.conta = conta
+        carteira.livro = livro
+        return carteira
+
+    @property
+    def saldo(self) -> float:
+        return self.servico.saldo(self.conta) / 100
+
+    @property
+    def saldo_centavos(self) -> Centavos:
+        return self.servico.saldo(self.conta)
+
+    def assinar(self, assinante: Callable[[float], None]) -> Callable[[], None]:
+        """Chama ``assinante(saldo_em_reais)`` a cada alteração desta carteira."""
+        return self.servico.assinar(self.conta, lambda _conta, saldo: assinante(saldo / 100))
+
+    def depositar(self, valor: float) -> None:
+        centavos = para_centavos(valor)
+        self.servico.depositar(self.conta, centavos)
+        self._registrar(centavos)
+
+    def retirar(self, valor: float) -> bool:
+        centavos = para_centavos(valor)
+        if not self.servico.retirar(self.conta, centavos):
+            return False
+        self._registrar(-centavos)
+        return True
+
+    def ajustar(self, delta: float) -> bool:
+        centavos = para_centavos(delta)
+        if not self.servico.ajustar(self.conta, centavos):
+            return False
+        self._registrar(centavos)
+        return True
+
+    def reservar(self, valor: float) -> Reserva | None:
+        reserva = self.servico.reservar(self.conta, para_centavos(valor))
+        if reserva is not None:
+            self._registrar(-reserva.valor)
+        return reserva
+
+    def confirmar_reserva(self, reserva: Reserva, credito: float = 0.0) -> None:
+        centavos = para_centavos(credito)
+        self.servico.confirmar_reserva(reserva, centavos)
+        self._registrar(centavos)
+
+    def cancelar_reserva(self, reserva: Reserva) -> None:
+        self.servico.cancelar_reserva(reserva)
+        self._registrar(reserva.valor)
+
+    def _registrar(self, delta: Centavos) -> None:
+        if self.livro is not None:
+            self.livro.registrar(delta)
+
+
+__all__ = ["CarteiraService", "Reserva", "Wallet"]
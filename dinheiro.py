@@ -0,0 +1,43 @@
+"""Valores monetários em centavos inteiros e formatação em reais."""
+
+from __future__ import annotations
+
+Centavos = int
+
+_SUFIXOS = tuple(f"{resto:02d}" for resto in range(100))
+
+
+def para_centavos(valor: float) -> Centavos:
+    """Converte reais para centavos arredondando para o centavo mais próximo."""
+    try:
+        return round(valor * 100)
+    except (OverflowError, ValueError):  # infinito ou NaN
+        raise ValueError(f"Valor monetário inválido: {valor!r}.") from None
+
+
+def para_reais(centavos: Centavos) -> float:
+    return centavos / 100
+
+
+def formatar_centavos(centavos: Centavos) -> str:
+    # Negativos como sempre foram: "R$-5,00".
+    sinal = ""
+    if centavos < 0:
+        sinal, centavos = "-", -centavos
+    reais, resto = divmod(centavos, 100)
+    if reais < 1000:
+        return f"R${sinal}{reais},{_SUFIXOS[resto]}"
+    return f"R${sinal}{reais:_},{_SUFIXOS[resto]}".replace("_", ".")
+
+
+def formatar_reais(valor: float) -> str:
+    return formatar_centavos(round(valor * 100))
+
+
+__all__ = [
+    "Centavos",
+    "formatar_centavos",
+    "formatar_reais",
+    "para_centavos",
+    "para_reais",
+]
@@ -0,0 +1,483 @@
+"""Estratégias progressivas de aposta e sua avaliação em muitas sessões.
+
+Uma ``Estrategia`` decide a próxima aposta, em centavos, a partir do saldo e
+do lucro das rodadas anteriores:
+
+* ``ApostaFixa``: sempre a aposta base;
+* ``Martingale``: dobra a cada derrota e volta à base ao vencer;
+* ``Fibonacci``: avança um termo da sequência na derrota e recua dois na vitória;
+* ``DAlembert``: soma uma unidade na derrota e tira uma na vitória;
+* ``Kelly``: a fração do saldo que maximiza o crescimento do saldo. Em jogo
+  sem vantagem para o jogador (todos os da casa) ela é zero: não apostar.
+
+Apostas maiores que o saldo são reduzidas ao saldo, e a sessão quebra quando
+o saldo não cobre mais a aposta base. Empates (lucro zero) não mudam o estado.
+
+Cada jogo é descrito por um ``ModeloJogo``: a probabilidade de cada desfecho
+e quanto ele devolve por aposta, em décimos, com o mesmo arredondamento dos
+motores. ``jogar`` conduz um motor de verdade com uma estratégia; ``avaliar``
+sorteia sessões pelo modelo, uma a uma; ``avaliar_vetorizado`` faz o mesmo
+com NumPy, com todas as sessões lado a lado em arrays, e é o caminho para
+milhões de sessões. NumPy é opcional e só ele o importa.
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+import random
+import statistics
+from dataclasses import dataclass
+from functools import cache, singledispatch
+from typing import Any
+
+import tabelas
+from CacaNiquel.game import SlotMachine
+from CaraOuCoroa.game import CoinGame
+from dinheiro import Centavos, para_centavos, para_reais
+from Roleta.game import RouletteGame
+from tabelas import TabelaRoleta, TabelaSlot
+
+PERCENTIS = (1, 5, 25, 50, 75, 95, 99)
+BLOCO_VETORIZADO = 1_000_000
+
+
+@dataclass(frozen=True)
+class ModeloJogo:
+    """Desfechos de uma rodada: probabilidades e retorno em décimos da aposta.
+
+    Retorno 20 devolve o dobro (ganha uma aposta), 5 devolve metade e 0 perde
+    tudo; o lucro é ``aposta * retorno // 10 - aposta``, como nos motores.
+    """
+
+    nome: str
+    probabilidades: tuple[float, ...]
+    retornos: tuple[int, ...]
+
+    def lucro(self, aposta: Centavos, desfecho: int) -> Centavos:
+        return aposta * self.retornos[desfecho] // 10 - aposta
+
+    @property
+    def valor_esperado(self) -> float:
+        """Lucro médio por unidade apostada (negativo: vantagem da casa)."""
+        return sum(p * (r / 10 - 1) for p, r in zip(self.probabilidades, self.retornos))
+
+    def fracao_kelly(self) -> float:
+        """Fração do saldo que maximiza ``E[log(saldo)]``; zero sem vantagem."""
+        if self.valor_esperado <= 0:
+            return 0.0
+        lucros = [(p, r / 10 - 1) for p, r in zip(self.probabilidades, self.retornos)]
+
+        def derivada(f: float) -> float:
+            return sum(p * m / (1 + f * m) for p, m in lucros)
+
+        if derivada(1.0 - 1e-12) > 0:
+            return 1.0
+        baixo, alto = 0.0, 1.0
+        for _ in range(60):
+            meio = (baixo + alto) / 2
+            if derivada(meio) > 0:
+                baixo = meio
+            else:
+                alto = meio
+        return baixo
+
+
+def modelo_moeda(p: float = 0.5) -> ModeloJogo:
+    return ModeloJogo("cara", (p, 1 - p), (20, 0))
+
+
+@cache
+def modelo_roleta(cor: str = "vermelho", tabela: TabelaRoleta | None = None) -> ModeloJogo:
+    """Aposta em ``cor`` na roleta de ``tabela`` (a padrão: 0 a 36, verde paga 35 por 1)."""
+    tabela = tabela if tabela is not None else tabelas.padrao("roleta")
+    cor = cor.strip().lower()
+    if cor not in tabela.retornos:
+        raise ValueError(f"A cor precisa ser uma de: {', '.join(map(repr, tabela.retornos))}.")
+    chances: dict[int, float] = {}
+    for retorno in tabela.retornos[cor]:
+        chances[retorno] = chances.get(retorno, 0.0) + 1 / tabela.casas
+    retornos = tuple(sorted(chances, reverse=True))
+    return ModeloJogo(f"roleta-{cor}", tuple(chances[r] for r in retornos), retornos)
+
+
+@cache
+def modelo_slot(tabela: TabelaSlot | None = None) -> ModeloJogo:
+    """Distribuição exata de uma linha do caça-níquel, pela composição das faixas dos rolos.
+
+    Com várias linhas o retorno médio por real apostado é o mesmo, pois toda
+    fileira mostra cada parada da faixa com a mesma chance, e a variância do
+    modelo é um limite superior: por real apostado, o giro paga a média das
+    linhas.
+    """
+    tabela = tabela if tabela is not None else tabelas.padrao("slot")
+    total = math.prod(map(sum, tabela.pesos_rolos))
+    chances: dict[int, float] = {}
+    for combinacao, retorno in zip(itertools.product(*tabela.pesos_rolos), tabela.premios):
+        chances[retorno] = chances.get(retorno, 0.0) + math.prod(combinacao) / total
+    retornos = tuple(sorted(chances))
+    return ModeloJogo("slot", tuple(chances[r] for r in retornos), retornos)
+
+
+class Estrategia:
+    """Base: decide a próxima aposta e aprende com o lucro de cada rodada.
+
+    Os métodos ``*_vetorial`` fazem o mesmo para várias sessões de uma vez,
+    com o módulo ``np`` recebido de quem chama; ``indices`` seleciona as
+    sessões que jogam a rodada.
+    """
+
+    nome = ""
+    titulo = ""
+
+    def __init__(self, aposta_base: Centavos, modelo: ModeloJogo) -> None:
+        if aposta_base <= 0:
+            raise ValueError("A aposta base precisa ser positiva.")
+        self.aposta_base = aposta_base
+        self.modelo = modelo
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        """Volta ao estado de uma sessão nova."""
+
+    def proxima_aposta(self, saldo: Centavos) -> Centavos:
+        raise NotImplementedError
+
+    def registrar(self, lucro: Centavos) -> None:
+        """Atualiza o estado com o lucro (negativo na derrota) da última rodada."""
+
+    def estado_vetorial(self, np: Any, sessoes: int) -> Any:
+        return None
+
+    def apostas_vetoriais(self, np: Any, estado: Any, saldos: Any, indices: Any) -> Any:
+        raise NotImplementedError
+
+    def registrar_vetorial(self, np: Any, estado: Any, indices: Any, lucros: Any) -> None:
+        pass
+
+
+class Progressiva(Estrategia):
+    """Aposta ``base * MULTIPLICADORES[nivel]``: a derrota sobe um nível, a vitória desce ``RECUO``.
+
+    ``RECUO`` ``None`` volta ao primeiro nível. O nível para em
+    ``NIVEL_MAXIMO``; bem antes disso a aposta já foi limitada pelo saldo.
+    """
+
+    NIVEL_MAXIMO = 32
+    RECUO: int | None = None
+    MULTIPLICADORES: tuple[int, ...] = (1,)
+
+    def reiniciar(self) -> None:
+        self.nivel = 0
+
+    def proxima_aposta(self, saldo: Centavos) -> Centavos:
+        return self.aposta_base * self.MULTIPLICADORES[self.nivel]
+
+    def registrar(self, lucro: Centavos) -> None:
+        if lucro < 0:
+            self.nivel = min(self.nivel + 1, len(self.MULTIPLICADORES) - 1)
+        elif lucro > 0:
+            self.nivel = 0 if self.RECUO is None else max(self.nivel - self.RECUO, 0)
+
+    def estado_vetorial(self, np: Any, sessoes: int) -> Any:
+        return np.zeros(sessoes, dtype=np.int64)
+
+    def apostas_vetoriais(self, np: Any, estado: Any, saldos: Any, indices: Any) -> Any:
+        return self.aposta_base * np.asarray(self.MULTIPLICADORES, dtype=np.int64)[estado[indices]]
+
+    def registrar_vetorial(self, np: Any, estado: Any, indices: Any, lucros: Any) -> None:
+        perderam = indices[lucros < 0]
+        estado[perderam] = np.minimum(estado[perderam] + 1, len(self.MULTIPLICADORES) - 1)
+        ganharam = indices[lucros > 0]
+        estado[ganharam] = 0 if self.RECUO is None else np.maximum(estado[ganharam] - self.RECUO, 0)
+
+
+class ApostaFixa(Progressiva):
+    nome = "fixa"
+    titulo = "Aposta fixa"
+
+
+class Martingale(Progressiva):
+    nome = "martingale"
+    titulo = "Martingale"
+    MULTIPLICADORES = tuple(2**nivel for nivel in range(Progressiva.NIVEL_MAXIMO + 1))
+
+
+def _fibonacci(termos: int) -> tuple[int, ...]:
+    sequencia = [1, 1]
+    while len(sequencia) < termos:
+        sequencia.append(sequencia[-1] + sequencia[-2])
+    return tuple(sequencia[:termos])
+
+
+class Fibonacci(Progressiva):
+    nome = "fibonacci"
+    titulo = "Fibonacci"
+    RECUO = 2
+    MULTIPLICADORES = _fibonacci(Progressiva.NIVEL_MAXIMO + 1)
+
+
+class DAlembert(Progressiva):
+    nome = "dalembert"
+    titulo = "D'Alembert"
+    RECUO = 1
+    MULTIPLICADORES = tuple(range(1, Progressiva.NIVEL_MAXIMO + 2))
+
+
+class Kelly(Estrategia):
+    """Aposta ``fracao`` da fração de Kelly do modelo sobre o saldo atual (1 = Kelly cheio)."""
+
+    nome = "kelly"
+    titulo = "Kelly"
+
+    def __init__(self, aposta_base: Centavos, modelo: ModeloJogo, fracao: float = 1.0) -> None:
+        super().__init__(aposta_base, modelo)
+        self.fracao = modelo.fracao_kelly() * fracao
+
+    def proxima_aposta(self, saldo: Centavos) -> Centavos:
+        return int(saldo * self.fracao)
+
+    def apostas_vetoriais(self, np: Any, estado: Any, saldos: Any, indices: Any) -> Any:
+        return (saldos[indices] * self.fracao).astype(np.int64)
+
+
+ESTRATEGIAS: dict[str, type[Estrategia]] = {
+    classe.nome: classe for classe in (ApostaFixa, Martingale, Fibonacci, DAlembert, Kelly)
+}
+
+
+def criar_estrategia(nome: str, aposta_base: Centavos, modelo: ModeloJogo) -> Estrategia:
+    try:
+        classe = ESTRATEGIAS[nome]
+    except KeyError:
+        raise ValueError(f"Estratégia desconhecida: {nome!r}.") from None
+    return classe(aposta_base, modelo)
+
+
+@singledispatch
+def jogar_rodada(motor: object, aposta: float, alvo: str) -> None:
+    """Uma rodada no motor com a ``aposta`` em reais; ``alvo`` é o lado ou a cor."""
+    raise TypeError(f"Motor não suportado: {type(motor).__name__}")
+
+
+@jogar_rodada.register
+def _(motor: CoinGame, aposta: float, alvo: str) -> None:
+    motor.jogar(alvo or "cara", aposta)
+
+
+@jogar_rodada.register
+def _(motor: RouletteGame, aposta: float, alvo: str) -> None:
+    motor.girar(alvo or "vermelho", aposta)
+
+
+@jogar_rodada.register
+def _(motor: SlotMachine, aposta: float, alvo: str) -> None:
+    motor.girar(aposta)
+
+
+@singledispatch
+def maior_aposta(motor: object, saldo: Centavos) -> Centavos:
+    """A maior aposta que ``saldo`` cobre no motor; no caça-níquel ela vale por linha."""
+    return saldo
+
+
+@maior_aposta.register
+def _(motor: SlotMachine, saldo: Centavos) -> Centavos:
+    return saldo // motor.linhas_ativas
+
+
+def jogar(
+    motor: CoinGame | RouletteGame | SlotMachine, estrategia: Estrategia, rodadas: int, alvo: str = ""
+) -> list[Centavos]:
+    """Joga até ``rodadas`` no motor seguindo ``estrategia``; devolve o saldo após cada rodada.
+
+    A aposta é limitada a ``maior_aposta``. Para antes se o saldo não
+    cobrir a aposta base ou se a estratégia não apostar.
+    """
+    saldos = []
+    for _ in range(rodadas):
+        saldo = motor.saldo_centavos
+        teto = maior_aposta(motor, saldo)
+        if teto < estrategia.aposta_base:
+            break
+        aposta = min(estrategia.proxima_aposta(saldo), teto)
+        if aposta <= 0:
+            break
+        jogar_rodada(motor, para_reais(aposta), alvo)
+        estrategia.registrar(motor.saldo_centavos - saldo)
+        saldos.append(motor.saldo_centavos)
+    return saldos
+
+
+@dataclass(frozen=True)
+class Avaliacao:
+    """Resumo de muitas sessões; retornos são o lucro final sobre o saldo inicial."""
+
+    estrategia: str
+    jogo: str
+    sessoes: int
+    rodadas: int
+    probabilidade_ruina: float
+    retorno_medio: float
+    desvio_retorno: float
+    percentis: tuple[float, ...]
+    rodadas_medias: float
+
+    def percentil(self, p: int) -> float:
+        return self.percentis[PERCENTIS.index(p)]
+
+
+def _validar(saldo: float, aposta: float, sessoes: int, rodadas: int) -> tuple[Centavos, Centavos]:
+    saldo_centavos, aposta_centavos = para_centavos(saldo), para_centavos(aposta)
+    if aposta_centavos <= 0 or saldo_centavos < aposta_centavos:
+        raise ValueError("A aposta precisa ser positiva e caber no saldo inicial.")
+    if sessoes <= 0 or rodadas <= 0:
+        raise ValueError("Sessões e rodadas precisam ser positivas.")
+    return saldo_centavos, aposta_centavos
+
+
+def _percentis(retornos: list[float]) -> tuple[float, ...]:
+    if len(retornos) == 1:
+        return (retornos[0],) * len(PERCENTIS)
+    cortes = statistics.quantiles(retornos, n=100, method="inclusive")
+    return tuple(cortes[p - 1] for p in PERCENTIS)
+
+
+def avaliar(
+    estrategia: str,
+    modelo: ModeloJogo,
+    saldo: float,
+    aposta: float,
+    sessoes: int,
+    rodadas: int,
+    semente: int | None = None,
+) -> Avaliacao:
+    """Sorteia ``sessoes`` sessões de até ``rodadas`` rodadas, uma a uma, em Python puro."""
+    saldo_inicial, base = _validar(saldo, aposta, sessoes, rodadas)
+    gerador = random.Random(semente)
+    acumuladas = list(itertools.accumulate(modelo.probabilidades))
+    ultimo = len(acumuladas) - 1
+    jogador = criar_estrategia(estrategia, base, modelo)
+    retornos = []
+    duracoes = []
+    ruinas = 0
+    for _ in range(sessoes):
+        jogador.reiniciar()
+        atual = saldo_inicial
+        jogadas = 0
+        while jogadas < rodadas and atual >= base:
+            valor = min(jogador.proxima_aposta(atual), atual)
+            if valor <= 0:
+                break
+            desfecho = min(bisect.bisect_right(acumuladas, gerador.random()), ultimo)
+            lucro = modelo.lucro(valor, desfecho)
+            atual += lucro
+            jogador.registrar(lucro)
+            jogadas += 1
+        ruinas += atual < base
+        retornos.append((atual - saldo_inicial) / saldo_inicial)
+        duracoes.append(jogadas)
+    return Avaliacao(
+        estrategia=estrategia,
+        jogo=modelo.nome,
+        sessoes=sessoes,
+        rodadas=rodadas,
+        probabilidade_ruina=ruinas / sessoes,
+        retorno_medio=statistics.fmean(retornos),
+        desvio_retorno=statistics.pstdev(retornos),
+        percentis=_percentis(retornos),
+        rodadas_medias=statistics.fmean(duracoes),
+    )
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("avaliar_vetorizado precisa do NumPy: pip install numpy.") from None
+    return numpy
+
+
+def avaliar_vetorizado(
+    estrategia: str,
+    modelo: ModeloJogo,
+    saldo: float,
+    aposta: float,
+    sessoes: int,
+    rodadas: int,
+    semente: int | None = None,
+    bloco: int = BLOCO_VETORIZADO,
+) -> Avaliacao:
+    """Como ``avaliar``, mas rodada a rodada sobre arrays com todas as sessões.
+
+    As sessões são processadas em blocos de ``bloco`` para limitar a memória;
+    a cada rodada só as sessões ainda ativas são sorteadas.
+    """
+    np = _numpy()
+    saldo_inicial, base = _validar(saldo, aposta, sessoes, rodadas)
+    gerador = np.random.default_rng(semente)
+    acumuladas = np.cumsum(np.asarray(modelo.probabilidades, dtype=np.float64))
+    retornos_decimos = np.asarray(modelo.retornos, dtype=np.int64)
+    ultimo = len(modelo.retornos) - 1
+    jogador = criar_estrategia(estrategia, base, modelo)
+
+    finais = np.empty(sessoes, dtype=np.int64)
+    duracoes = np.empty(sessoes, dtype=np.int64)
+    for inicio in range(0, sessoes, bloco):
+        quantidade = min(bloco, sessoes - inicio)
+        saldos = np.full(quantidade, saldo_inicial, dtype=np.int64)
+        jogadas = np.zeros(quantidade, dtype=np.int64)
+        estado = jogador.estado_vetorial(np, quantidade)
+        ativos = np.arange(quantidade)
+        for _ in range(rodadas):
+            apostas = np.minimum(jogador.apostas_vetoriais(np, estado, saldos, ativos), saldos[ativos])
+            apostando = apostas > 0
+            ativos, apostas = ativos[apostando], apostas[apostando]
+            if not ativos.size:
+                break
+            desfechos = np.minimum(np.searchsorted(acumuladas, gerador.random(ativos.size), side="right"), ultimo)
+            lucros = apostas * retornos_decimos[desfechos] // 10 - apostas
+            saldos[ativos] += lucros
+            jogadas[ativos] += 1
+            jogador.registrar_vetorial(np, estado, ativos, lucros)
+            ativos = ativos[saldos[ativos] >= base]
+        finais[inicio : inicio + quantidade] = saldos
+        duracoes[inicio : inicio + quantidade] = jogadas
+
+    retornos = (finais - saldo_inicial) / saldo_inicial
+    return Avaliacao(
+        estrategia=estrategia,
+        jogo=modelo.nome,
+        sessoes=sessoes,
+        rodadas=rodadas,
+        probabilidade_ruina=float(np.mean(finais < base)),
+        retorno_medio=float(retornos.mean()),
+        desvio_retorno=float(retornos.std()),
+        percentis=tuple(float(valor) for valor in np.percentile(retornos, PERCENTIS)),
+        rodadas_medias=float(duracoes.mean()),
+    )
+
+
+__all__ = [
+    "ESTRATEGIAS",
+    "PERCENTIS",
+    "ApostaFixa",
+    "Avaliacao",
+    "DAlembert",
+    "Estrategia",
+    "Fibonacci",
+    "Kelly",
+    "Martingale",
+    "ModeloJogo",
+    "Progressiva",
+    "avaliar",
+    "avaliar_vetorizado",
+    "criar_estrategia",
+    "jogar",
+    "jogar_rodada",
+    "maior_aposta",
+    "modelo_moeda",
+    "modelo_roleta",
+    "modelo_slot",
+]
@@ -0,0 +1,82 @@
+"""Agrupamento de notificações de saldo em atualizações por quadro do Tk."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Protocol
+
+if TYPE_CHECKING:
+    import tkinter as tk
+
+INTERVALO_QUADRO_MS = 16
+
+
+class CarteiraAssinavel(Protocol):
+    def assinar(self, assinante: Callable[[float], None]) -> Callable[[], None]: ...
+
+
+class AtualizacaoPorQuadro:
+    """Chama ``atualizar`` no máximo uma vez por quadro, não importa quantas
+    notificações cheguem nesse intervalo.
+
+    ``notificar`` precisa ser chamado na thread do Tk.
+    """
+
+    def __init__(
+        self,
+        widget: tk.Misc,
+        atualizar: Callable[[], None],
+        intervalo_ms: int = INTERVALO_QUADRO_MS,
+    ) -> None:
+        self.widget = widget
+        self.atualizar = atualizar
+        self.intervalo_ms = intervalo_ms
+        self._agendado: str | None = None
+
+    def notificar(self, *_args: object) -> None:
+        if self._agendado is None:
+            self._agendado = self.widget.after(self.intervalo_ms, self._executar)
+
+    def cancelar(self) -> None:
+        if self._agendado is not None:
+            self.widget.after_cancel(self._agendado)
+            self._agendado = None
+
+    def _executar(self) -> None:
+        self._agendado = None
+        self.atualizar()
+
+
+def assinar_por_quadro(
+    widget: tk.Misc,
+    carteira: CarteiraAssinavel,
+    atualizar: Callable[[], None],
+) -> Callable[[], None]:
+    """Assina a carteira com atualização agrupada e cancela ao destruir ``widget``.
+
+    Devolve a função que cancela a assinatura manualmente; nesse caso o
+    vínculo com ``<Destroy>`` também é removido, para que janelas reaproveitadas
+    não acumulem vínculos a cada nova assinatura.
+    """
+    agrupador = AtualizacaoPorQuadro(widget, atualizar)
+    cancelar_assinatura = carteira.assinar(agrupador.notificar)
+
+    def cancelar(_evento: object = None) -> None:
+        if _evento is not None and getattr(_evento, "widget", widget) is not widget:
+            return
+        cancelar_assinatura()
+        agrupador.cancelar()
+        if _evento is None and widget.winfo_exists():
+            _desvincular(widget, "<Destroy>", funcid)
+
+    funcid = widget.bind("<Destroy>", cancelar, add="+")
+    return cancelar
+
+
+def _desvincular(widget: tk.Misc, sequencia: str, funcid: str) -> None:
+    """Remove um único vínculo feito com ``add="+"``, preservando os demais."""
+    restantes = [linha for linha in widget.bind(sequencia).split("\n") if funcid not in linha]
+    widget.bind(sequencia, "\n".join(restantes))
+    widget.deletecommand(funcid)
+
+
+__all__ = ["AtualizacaoPorQuadro", "assinar_por_quadro"]
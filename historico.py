@@ -0,0 +1,274 @@
+"""Histórico de rodadas e saldos em SQLite para auditoria.
+
+As gravações são enfileiradas e feitas por uma thread dedicada, que agrupa
+as linhas pendentes em ``executemany`` dentro de uma única transação. O banco
+usa WAL, então consultas podem rodar em paralelo com a gravação. Se um lote
+falha, as linhas dele se perdem, a thread segue com os próximos e o erro é
+levantado pelo próximo ``aguardar`` ou ``fechar``.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from functools import singledispatch
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dinheiro import Centavos, para_centavos
+
+if TYPE_CHECKING:
+    from CacaNiquel.game import SpinResult as SlotSpinResult
+    from CaraOuCoroa.game import RoundResult
+    from Roleta.game import SpinResult as RouletteSpinResult
+    from Truco.game import TrucoPlayResult, TrucoRaiseResult
+
+CAMINHO_PADRAO = Path.home() / ".arcade_apostas" / "historico.db"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS rodadas (
+    id INTEGER PRIMARY KEY,
+    instante_ns INTEGER NOT NULL,
+    jogador TEXT NOT NULL,
+    jogo TEXT NOT NULL,
+    aposta_centavos INTEGER NOT NULL,
+    lucro_centavos INTEGER NOT NULL,
+    saldo_centavos INTEGER,
+    detalhe TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rodadas_jogador ON rodadas (jogador, instante_ns);
+CREATE INDEX IF NOT EXISTS idx_rodadas_jogo ON rodadas (jogo, instante_ns);
+CREATE TABLE IF NOT EXISTS saldos (
+    id INTEGER PRIMARY KEY,
+    instante_ns INTEGER NOT NULL,
+    jogador TEXT NOT NULL,
+    saldo_centavos INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_saldos_jogador ON saldos (jogador, instante_ns);
+"""
+
+INSERIR_RODADA = (
+    "INSERT INTO rodadas (instante_ns, jogador, jogo, aposta_centavos, lucro_centavos, saldo_centavos, detalhe)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+INSERIR_SALDO = "INSERT INTO saldos (instante_ns, jogador, saldo_centavos) VALUES (?, ?, ?)"
+
+_FIM = object()
+
+
+@singledispatch
+def resumir_resultado(resultado: object, aposta: float | None) -> tuple[Centavos, Centavos, str]:
+    """Converte um resultado de jogo em ``(aposta, lucro, detalhe)``.
+
+    Os jogos embutidos têm conversões próprias, registradas na primeira
+    chamada para que o histórico não importe os motores; jogos externos
+    registram as suas com ``resumir_resultado.register``. Sem registro, usa
+    os atributos ``aposta`` (ou o argumento) e ``lucro`` (ou ``ganho``, como
+    lucro) do resultado e guarda o ``repr`` dele como detalhe.
+    """
+    if not _embutidos_registrados:
+        _registrar_embutidos()
+        return resumir_resultado(resultado, aposta)
+    valor = _reais(getattr(resultado, "aposta", None)) or _reais(aposta)
+    lucro = getattr(resultado, "lucro", None)
+    if lucro is None:
+        lucro = getattr(resultado, "ganho", 0)
+    return para_centavos(valor), para_centavos(_reais(lucro)), repr(resultado)
+
+
+def _reais(valor: object) -> float:
+    return valor if isinstance(valor, (int, float)) and not isinstance(valor, bool) else 0.0
+
+
+def _resumir_moeda(resultado: RoundResult, aposta: float | None) -> tuple[Centavos, Centavos, str]:
+    valor = para_centavos(resultado.aposta)
+    return valor, valor if resultado.venceu else -valor, f"{resultado.escolha}>{resultado.resultado_moeda}"
+
+
+def _resumir_roleta(resultado: RouletteSpinResult, aposta: float | None) -> tuple[Centavos, Centavos, str]:
+    valor = para_centavos(aposta or 0)
+    lucro = para_centavos(resultado.ganho) if resultado.venceu else -valor
+    return valor, lucro, f"{resultado.aposta_cor}>{resultado.numero} {resultado.cor}"
+
+
+def _resumir_slot(resultado: SlotSpinResult, aposta: float | None) -> tuple[Centavos, Centavos, str]:
+    detalhe = "|".join(resultado.symbols) + (" jackpot" if resultado.jackpot else "")
+    return para_centavos(resultado.aposta), para_centavos(resultado.lucro), detalhe
+
+
+def _resumir_jogada_truco(resultado: TrucoPlayResult, aposta: float | None) -> tuple[Centavos, Centavos, str]:
+    valor = para_centavos(aposta or 0)
+    lucro = 0
+    if resultado.hand_finished and resultado.hand_winner:
+        lucro = valor * resultado.multiplier
+        if resultado.hand_winner != "player":
+            lucro = -lucro
+    detalhe = f"{resultado.player_card.label()}x{resultado.ai_card.label()}>{resultado.round_winner or 'empate'}"
+    return valor, lucro, detalhe
+
+
+def _resumir_truco(resultado: TrucoRaiseResult, aposta: float | None) -> tuple[Centavos, Centavos, str]:
+    valor = para_centavos(aposta or 0)
+    lucro = valor * resultado.multiplier if resultado.folded else 0
+    return valor, lucro, "correu" if resultado.folded else "truco"
+
+
+_embutidos_registrados = False
+_trava_embutidos = threading.Lock()
+
+
+def _registrar_embutidos() -> None:
+    """Registra as conversões dos jogos embutidos, importando os motores só agora."""
+    global _embutidos_registrados
+    with _trava_embutidos:
+        if _embutidos_registrados:
+            return
+        from CacaNiquel.game import SpinResult as SlotSpinResult
+        from CaraOuCoroa.game import RoundResult
+        from Roleta.game import SpinResult as RouletteSpinResult
+        from Truco.game import TrucoPlayResult, TrucoRaiseResult
+
+        resumir_resultado.register(RoundResult, _resumir_moeda)
+        resumir_resultado.register(RouletteSpinResult, _resumir_roleta)
+        resumir_resultado.register(SlotSpinResult, _resumir_slot)
+        resumir_resultado.register(TrucoPlayResult, _resumir_jogada_truco)
+        resumir_resultado.register(TrucoRaiseResult, _resumir_truco)
+        _embutidos_registrados = True
+
+
+class HistoricoStore:
+    """Fila de gravação assíncrona para o histórico em SQLite."""
+
+    def __init__(self, caminho: str | os.PathLike[str] = CAMINHO_PADRAO, lote_maximo: int = 5_000) -> None:
+        if lote_maximo <= 0:
+            raise ValueError("O lote máximo precisa ser positivo.")
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.lote_maximo = lote_maximo
+        self._fila: queue.SimpleQueue[object] = queue.SimpleQueue()
+        self._gravados = 0
+        self._erro: Exception | None = None
+
+        conexao = self._conectar()
+        conexao.executescript(ESQUEMA)
+        conexao.close()
+
+        self._thread = threading.Thread(target=self._gravar_em_lotes, name="historico", daemon=True)
+        self._thread.start()
+
+    @property
+    def gravados(self) -> int:
+        """Quantidade de linhas já confirmadas no banco."""
+        return self._gravados
+
+    def registrar_rodada(
+        self,
+        jogo: str,
+        resultado: object,
+        saldo_centavos: Centavos | None = None,
+        jogador: str = "principal",
+        aposta: float | None = None,
+    ) -> None:
+        """Enfileira um resultado; ``aposta`` só é necessária para Roleta e Truco."""
+        valor, lucro, detalhe = resumir_resultado(resultado, aposta)
+        self._fila.put((INSERIR_RODADA, (time.time_ns(), jogador, jogo, valor, lucro, saldo_centavos, detalhe)))
+
+    def registrar_saldo(self, saldo_centavos: Centavos, jogador: str = "principal") -> None:
+        self._fila.put((INSERIR_SALDO, (time.time_ns(), jogador, saldo_centavos)))
+
+    def aguardar(self) -> None:
+        """Bloqueia até que tudo o que foi enfileirado antes esteja gravado.
+
+        Se algum lote falhou desde a última vez, levanta o erro dele.
+        """
+        if self._thread.is_alive():
+            evento = threading.Event()
+            self._fila.put(evento)
+            evento.wait()
+        self._levantar_erro()
+
+    def fechar(self) -> None:
+        if self._thread.is_alive():
+            self._fila.put(_FIM)
+            self._thread.join()
+        self._levantar_erro()
+
+    def __enter__(self) -> HistoricoStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.fechar()
+
+    def rodadas_do_jogador(self, jogador: str, inicio_ns: int = 0, fim_ns: int | None = None) -> list[tuple]:
+        return self._consultar("jogador", jogador, inicio_ns, fim_ns)
+
+    def rodadas_do_jogo(self, jogo: str, inicio_ns: int = 0, fim_ns: int | None = None) -> list[tuple]:
+        return self._consultar("jogo", jogo, inicio_ns, fim_ns)
+
+    def _consultar(self, coluna: str, valor: str, inicio_ns: int, fim_ns: int | None) -> list[tuple]:
+        conexao = self._conectar()
+        try:
+            return conexao.execute(
+                f"SELECT instante_ns, jogador, jogo, aposta_centavos, lucro_centavos, saldo_centavos, detalhe"
+                f" FROM rodadas WHERE {coluna} = ? AND instante_ns BETWEEN ? AND ? ORDER BY instante_ns",
+                (valor, inicio_ns, fim_ns if fim_ns is not None else 2**63 - 1),
+            ).fetchall()
+        finally:
+            conexao.close()
+
+    def _levantar_erro(self) -> None:
+        erro, self._erro = self._erro, None
+        if erro is not None:
+            raise erro
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(self.caminho)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    def _gravar_em_lotes(self) -> None:
+        conexao = self._conectar()
+        fila = self._fila
+        encerrar = False
+        try:
+            while not encerrar:
+                item = fila.get()
+                lotes: dict[str, list[tuple]] = {}
+                eventos: list[threading.Event] = []
+                quantidade = 0
+                while True:
+                    if item is _FIM:
+                        encerrar = True
+                    elif isinstance(item, threading.Event):
+                        eventos.append(item)
+                    else:
+                        comando, linha = item  # type: ignore[misc]
+                        lotes.setdefault(comando, []).append(linha)
+                        quantidade += 1
+                    if encerrar or quantidade >= self.lote_maximo:
+                        break
+                    try:
+                        item = fila.get_nowait()
+                    except queue.Empty:
+                        break
+                if lotes:
+                    try:
+                        with conexao:
+                            for comando, linhas in lotes.items():
+                                conexao.executemany(comando, linhas)
+                    except Exception as erro:  # sem isto a thread morre e ``aguardar`` espera para sempre
+                        if self._erro is None:
+                            self._erro = erro
+                    else:
+                        self._gravados += quantidade
+                for evento in eventos:
+                    evento.set()
+        finally:
+            conexao.close()
+
+
+__all__ = ["CAMINHO_PADRAO", "HistoricoStore", "resumir_resultado"]
@@ -2,68 +2,44 @@
 
 from __future__ import annotations
 
+import math
 import tkinter as tk
 from tkinter import messagebox, ttk
+from typing import Any
 
-from CaraOuCoroa.gui import CoinGameApp
-from Roleta.gui import RouletteApp
-from CacaNiquel.gui import SlotMachineApp
-from Truco.gui import TrucoApp
-
-
-def formatar_reais(valor: float) -> str:
-    return f"R${valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
-
-
-class Wallet:
-    """Gerencia uma carteira compartilhada."""
-
-    def __init__(self, saldo_inicial: float) -> None:
-        if saldo_inicial <= 0:
-            raise ValueError("A carteira precisa começar com saldo positivo.")
-        self._saldo = float(saldo_inicial)
-
-    @property
-    def saldo(self) -> float:
-        return round(self._saldo, 2)
-
-    def depositar(self, valor: float) -> None:
-        if valor < 0:
-            raise ValueError("Depósito não pode ser negativo.")
-        self._saldo += valor
-
-    def retirar(self, valor: float) -> bool:
-        if valor < 0:
-            raise ValueError("Valor inválido.")
-        if valor > self._saldo:
-            return False
-        self._saldo -= valor
-        return True
+from carteira import Wallet
+from dinheiro import formatar_reais
+from eventos import assinar_por_quadro
+from tema import aplicar_tema, fonte
+from historico import HistoricoStore
+from livro_razao import LivroRazao
+from registro import descobrir_jogos, obter_jogo
 
 
 class HubApp:
     """Janela principal para escolher jogos e gerenciar carteira."""
 
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(
+        self,
+        master: tk.Tk,
+        livro: LivroRazao | None = None,
+        historico: HistoricoStore | None = None,
+    ) -> None:
         self.master = master
         self.master.title("Arcade de Apostas")
         self.master.resizable(False, False)
         self.master.configure(bg="#1f1f2e")
 
         self.wallet: Wallet | None = None
+        self.livro = livro
+        self.historico = historico
+        self._janelas: dict[str, tuple[tk.Toplevel, Any]] = {}
 
         self._montar_interface()
+        self._restaurar_carteira()
 
     def _montar_interface(self) -> None:
-        estilo = ttk.Style()
-        estilo.theme_use("clam")
-        
-        estilo.configure("TFrame", background="#1f1f2e")
-        estilo.configure("TLabel", background="#1f1f2e", foreground="#ffffff", font=("Segoe UI", 10))
-        estilo.configure("TButton", font=("Segoe UI", 10, "bold"), background="#3d3d5c", foreground="#ffffff", borderwidth=0)
-        estilo.map("TButton", background=[("active", "#4d4d70")])
-        estilo.configure("Action.TButton", background="#00ff88", foreground="#0f0f1a", font=("Segoe UI", 11, "bold"))
-        estilo.map("Action.TButton", background=[("active", "#00cc6a")])
+        aplicar_tema(self.master)
         
         # Container Principal
         main_frame = ttk.Frame(self.master, padding=30)
@@ -75,22 +51,22 @@ class HubApp:
         
         tk.Label(
             header_frame, text="CASINO HUB", 
-            font=("Segoe UI", 28, "bold"), bg="#1f1f2e", fg="#00ff88"
+            font=fonte(self.master, "Segoe UI", 28, "bold"), bg="#1f1f2e", fg="#00ff88"
         ).pack()
         
         tk.Label(
             header_frame, text="Escolha seu jogo e boa sorte!", 
-            font=("Segoe UI", 12), bg="#1f1f2e", fg="#aaaaaa"
+            font=fonte(self.master, "Segoe UI", 12), bg="#1f1f2e", fg="#aaaaaa"
         ).pack(pady=(5, 0))
 
         # Área da Carteira
         wallet_frame = tk.Frame(main_frame, bg="#2a2a3d", bd=2, relief="groove", padx=15, pady=15)
         wallet_frame.pack(fill="x", pady=(0, 25))
 
-        tk.Label(wallet_frame, text="SUA CARTEIRA", font=("Segoe UI", 10, "bold"), bg="#2a2a3d", fg="#aaaaaa").pack(anchor="w")
+        tk.Label(wallet_frame, text="SUA CARTEIRA", font=fonte(self.master, "Segoe UI", 10, "bold"), bg="#2a2a3d", fg="#aaaaaa").pack(anchor="w")
         
         self.wallet_info = tk.StringVar(value="R$ --")
-        tk.Label(wallet_frame, textvariable=self.wallet_info, font=("Segoe UI", 24, "bold"), bg="#2a2a3d", fg="#ffffff").pack(anchor="w", pady=5)
+        tk.Label(wallet_frame, textvariable=self.wallet_info, font=fonte(self.master, "Segoe UI", 24, "bold"), bg="#2a2a3d", fg="#ffffff").pack(anchor="w", pady=5)
 
         controls_frame = tk.Frame(wallet_frame, bg="#2a2a3d")
         controls_frame.pack(fill="x", pady=(5, 0))
@@ -107,22 +83,23 @@ class HubApp:
         games_frame = ttk.Frame(main_frame)
         games_frame.pack(fill="both", expand=True)
         
-        # Configurar grid 2x2
-        games_frame.columnconfigure(0, weight=1)
-        games_frame.columnconfigure(1, weight=1)
-        games_frame.rowconfigure(0, weight=1)
-        games_frame.rowconfigure(1, weight=1)
-
-        self._criar_botao_jogo(games_frame, "Cara ou Coroa", "🪙", "cara", 0, 0)
-        self._criar_botao_jogo(games_frame, "Roleta", "🎡", "roleta", 0, 1)
-        self._criar_botao_jogo(games_frame, "Caça-Níquel", "🎰", "slot", 1, 0)
-        self._criar_botao_jogo(games_frame, "Truco", "🃏", "truco", 1, 1)
+        # Grid de 2 colunas com um card por jogo registrado
+        jogos = descobrir_jogos()
+        colunas = 2
+        for col in range(colunas):
+            games_frame.columnconfigure(col, weight=1)
+        for row in range(math.ceil(len(jogos) / colunas)):
+            games_frame.rowconfigure(row, weight=1)
+
+        for indice, info in enumerate(jogos):
+            row, col = divmod(indice, colunas)
+            self._criar_botao_jogo(games_frame, info.nome, info.icone, info.chave, row, col)
 
         # Footer
         ttk.Button(main_frame, text="Sair do Casino", command=self.master.destroy).pack(side="bottom", anchor="e", pady=(20, 0))
         
         self.status_info = tk.StringVar(value="Crie uma carteira para começar.")
-        tk.Label(main_frame, textvariable=self.status_info, bg="#1f1f2e", fg="#aaaaaa", font=("Segoe UI", 9)).pack(side="bottom", pady=10)
+        tk.Label(main_frame, textvariable=self.status_info, bg="#1f1f2e", fg="#aaaaaa", font=fonte(self.master, "Segoe UI", 9)).pack(side="bottom", pady=10)
 
     def _criar_botao_jogo(self, parent, nome, icone, comando_key, row, col):
         """Cria um card de jogo."""
@@ -138,12 +115,12 @@ class HubApp:
         # Conteúdo clicável
         def on_click(e): self._abrir_jogo(comando_key)
         
-        lbl_icon = tk.Label(frame, text=icone, font=("Segoe UI Emoji", 32), bg="#3d3d5c", fg="#ffffff")
+        lbl_icon = tk.Label(frame, text=icone, font=fonte(self.master, "Segoe UI Emoji", 32), bg="#3d3d5c", fg="#ffffff")
         lbl_icon.pack(expand=True, pady=(15, 5))
         lbl_icon.bind("<Button-1>", on_click)
         lbl_icon.bind("<Enter>", lambda e: on_enter(None)) # Propagate hover
         
-        lbl_name = tk.Label(frame, text=nome, font=("Segoe UI", 12, "bold"), bg="#3d3d5c", fg="#ffffff")
+        lbl_name = tk.Label(frame, text=nome, font=fonte(self.master, "Segoe UI", 12, "bold"), bg="#3d3d5c", fg="#ffffff")
         lbl_name.pack(pady=(0, 15))
         lbl_name.bind("<Button-1>", on_click)
         lbl_name.bind("<Enter>", lambda e: on_enter(None))
@@ -161,7 +138,7 @@ class HubApp:
             return
 
         if self.wallet is None:
-            self.wallet = Wallet(saldo)
+            self._usar_carteira(Wallet(saldo, livro=self.livro))
             self.status_info.set("Carteira criada!")
         else:
             diferenca = saldo - self.wallet.saldo
@@ -174,30 +151,54 @@ class HubApp:
             self.status_info.set("Carteira atualizada!")
         self._atualizar_label_saldo()
 
+    def _restaurar_carteira(self) -> None:
+        if self.livro is None or self.livro.saldo_centavos <= 0:
+            return
+        self._usar_carteira(Wallet(self.livro.saldo_centavos / 100, livro=self.livro))
+        self.saldo_var.set(f"{self.wallet.saldo:.2f}".replace(".", ","))
+        self.status_info.set("Carteira restaurada da última sessão.")
+        self._atualizar_label_saldo()
+
+    def _usar_carteira(self, wallet: Wallet) -> None:
+        self.wallet = wallet
+        assinar_por_quadro(self.master, wallet, self._atualizar_label_saldo)
+
     def _abrir_jogo(self, jogo: str) -> None:
         if self.wallet is None:
             messagebox.showwarning("Atenção", "Crie a carteira antes de jogar.")
             return
 
-        janela = tk.Toplevel(self.master)
+        janela, app = self._obter_janela(jogo)
+        app.sessao.historico = self.historico
+        app.set_wallet(self.wallet)
+        janela.deiconify()
+        janela.lift()
         janela.grab_set()
 
-        if jogo == "cara":
-            app = CoinGameApp(janela)
-        elif jogo == "roleta":
-            app = RouletteApp(janela)
-        elif jogo == "slot":
-            app = SlotMachineApp(janela)
-        else:
-            app = TrucoApp(janela)
+    def _obter_janela(self, jogo: str) -> tuple[tk.Toplevel, Any]:
+        """Devolve a janela já montada do jogo ou monta uma nova, escondida.
 
-        app.set_wallet(self.wallet, lambda w=self.wallet: w.saldo)
-        janela.protocol("WM_DELETE_WINDOW", lambda: self._fechar_jogo(janela))
+        As janelas fechadas pelo Hub ficam apenas recolhidas com ``withdraw``;
+        só são recriadas se o próprio jogo as destruir (botão Sair).
+        """
+        reservada = self._janelas.get(jogo)
+        if reservada is not None and reservada[0].winfo_exists():
+            return reservada
 
-    def _fechar_jogo(self, janela: tk.Toplevel) -> None:
-        if messagebox.askyesno("Sair", "Voltar ao Hub?"):
-            janela.destroy()
-            self._atualizar_label_saldo()
+        janela = tk.Toplevel(self.master)
+        janela.withdraw()
+        app = obter_jogo(jogo).carregar_interface()(janela)
+        janela.protocol("WM_DELETE_WINDOW", lambda: self._fechar_jogo(jogo))
+        self._janelas[jogo] = (janela, app)
+        return janela, app
+
+    def _fechar_jogo(self, jogo: str) -> None:
+        if not messagebox.askyesno("Sair", "Voltar ao Hub?"):
+            return
+        janela, app = self._janelas[jogo]
+        janela.grab_release()
+        janela.withdraw()
+        app.resetar()
 
     @staticmethod
     def _converter_para_float(texto: str) -> float:
@@ -207,14 +208,17 @@ class HubApp:
     def _atualizar_label_saldo(self) -> None:
         if self.wallet:
             self.wallet_info.set(f"{formatar_reais(self.wallet.saldo)}")
+            if self.historico:
+                self.historico.registrar_saldo(self.wallet.saldo_centavos)
         else:
             self.wallet_info.set("R$ --")
 
 
 def run_app() -> None:
     raiz = tk.Tk()
-    app = HubApp(raiz)
-    raiz.mainloop()
+    with LivroRazao() as livro, HistoricoStore() as historico:
+        app = HubApp(raiz, livro, historico)
+        raiz.mainloop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""Jackpot progressivo do caça-níquel, compartilhado entre sessões e processos.
+
+O fundo é uma conta de um ``CarteiraService``: o do próprio processo por
+padrão ou, no servidor multiprocesso, o do livro de contas (``configurar``),
+de modo que todas as sessões de todos os trabalhadores alimentam e pagam o
+mesmo fundo.
+
+Cada giro contribui com uma fração da aposta, em décimos de milésimo de
+centavo (aposta em centavos vezes pontos-base), mas a contribuição só entra
+numa ``deque`` local: ``append`` e ``popleft`` são atômicos no CPython, então
+nenhum giro espera por trava. A cada ``lote`` contribuições ou
+``intervalo`` segundos, quem contribuiu soma as pendentes e as envia numa
+única ``ajustar``; as frações de centavo ficam para o próximo envio. Quem
+acerta a combinação espera um envio em andamento, envia o que tem, leva o
+fundo inteiro com ``comparar_e_definir`` e o reinicia na ``semente``. O fundo visto pelos
+processos atrasa, no máximo, um lote de cada um.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from carteira import CarteiraService
+from dinheiro import Centavos
+
+SEMENTE_PADRAO: Centavos = 50_000
+LOTE_PADRAO = 256
+INTERVALO_PADRAO_S = 1.0
+PREFIXO_CONTA = "jackpot:"
+# Contribuições chegam em centavos vezes pontos-base: 10 000 por centavo.
+FRACOES_POR_CENTAVO = 10_000
+
+_servico: CarteiraService | None = None
+_fundos: dict[str, Jackpot] = {}
+_trava_fundos = threading.Lock()
+
+
+class Jackpot:
+    """Fundo ``nome`` em ``servico``, com as contribuições deste processo em lotes."""
+
+    def __init__(
+        self,
+        nome: str = "slot",
+        servico: CarteiraService | None = None,
+        semente: Centavos = SEMENTE_PADRAO,
+        lote: int = LOTE_PADRAO,
+        intervalo: float = INTERVALO_PADRAO_S,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if semente < 0 or lote <= 0 or intervalo < 0:
+            raise ValueError("Parâmetros do jackpot inválidos.")
+        self.conta = PREFIXO_CONTA + nome
+        self.servico = servico if servico is not None else CarteiraService()
+        self.semente = semente
+        self.lote = lote
+        self.intervalo = intervalo
+        self.relogio = relogio
+        self._pendentes: deque[int] = deque()
+        self._resto = 0
+        self._enviando = threading.Lock()
+        self._proximo_envio = relogio() + intervalo
+        if not self.servico.possui_conta(self.conta):
+            try:
+                self.servico.abrir_conta(self.conta, semente)
+            except ValueError:
+                pass  # outro processo abriu a conta primeiro
+        self._valor: Centavos = self.servico.saldo(self.conta)
+
+    @property
+    def valor_centavos(self) -> Centavos:
+        """O fundo na última vez que este processo falou com o serviço."""
+        return self._valor
+
+    @property
+    def valor(self) -> float:
+        return self._valor / 100
+
+    @property
+    def fracoes_pendentes(self) -> int:
+        """Contribuições deste processo que ainda não chegaram ao serviço, em décimos de milésimo de centavo."""
+        return self._resto + sum(self._pendentes)
+
+    def contribuir(self, fracoes: int) -> None:
+        """Acrescenta ``fracoes`` décimos de milésimo de centavo ao fundo."""
+        self._pendentes.append(fracoes)
+        if len(self._pendentes) >= self.lote or self.relogio() >= self._proximo_envio:
+            self.descarregar()
+
+    def descarregar(self) -> None:
+        """Envia as contribuições pendentes; se outra thread já está enviando, deixa com ela."""
+        if not self._enviando.acquire(blocking=False):
+            return
+        try:
+            self._enviar()
+        finally:
+            self._enviando.release()
+
+    def premiar(self) -> Centavos:
+        """Leva o fundo inteiro, já com as contribuições deste processo, e o volta à semente.
+
+        Espera um envio em andamento em outra thread: sem isso, as
+        contribuições que ela tirou da fila ainda não estariam no fundo.
+        """
+        with self._enviando:
+            self._enviar()
+            while True:
+                valor = self.servico.saldo(self.conta)
+                if self.servico.comparar_e_definir(self.conta, valor, self.semente):
+                    self._valor = self.semente
+                    return valor
+
+    def _enviar(self) -> None:
+        # Chamado com ``_enviando`` adquirida.
+        pendentes = self._pendentes
+        soma = self._resto + sum(pendentes.popleft() for _ in range(len(pendentes)))
+        centavos, self._resto = divmod(soma, FRACOES_POR_CENTAVO)
+        if centavos:
+            self.servico.ajustar(self.conta, centavos)
+            self._valor = self.servico.saldo(self.conta)
+        self._proximo_envio = self.relogio() + self.intervalo
+
+
+def configurar(servico: CarteiraService) -> None:
+    """Passa a guardar os fundos de ``compartilhado`` em ``servico``, por exemplo o do livro de contas."""
+    global _servico
+    with _trava_fundos:
+        for fundo in _fundos.values():
+            fundo.descarregar()
+        _servico = servico
+        _fundos.clear()
+
+
+def descarregar() -> None:
+    """Envia as contribuições pendentes de todos os fundos compartilhados, antes de o processo sair."""
+    with _trava_fundos:
+        for fundo in _fundos.values():
+            fundo.descarregar()
+
+
+def compartilhado(nome: str = "slot") -> Jackpot:
+    """O fundo ``nome`` deste processo, o mesmo para todas as sessões."""
+    global _servico
+    fundo = _fundos.get(nome)
+    if fundo is None:
+        with _trava_fundos:
+            fundo = _fundos.get(nome)
+            if fundo is None:
+                if _servico is None:
+                    _servico = CarteiraService()
+                fundo = _fundos[nome] = Jackpot(nome, _servico)
+    return fundo
+
+
+__all__ = ["Jackpot", "compartilhado", "configurar", "descarregar"]
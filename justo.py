@@ -0,0 +1,232 @@
+"""Sorteios comprovadamente justos: semente do servidor comprometida por hash.
+
+O servidor sorteia uma semente secreta e publica antes o ``compromisso``,
+o SHA-256 dela; o jogador escolhe a ``semente_cliente``. A rodada de número
+``nonce`` (1, 2, ...) tira os seus bits de HMAC-SHA256(semente do
+servidor, ``"<cliente>:<nonce>"``); se precisar de mais de 256 bits, os
+blocos seguintes usam ``"<cliente>:<nonce>:<cursor>"`` com cursor 1, 2, ...
+Os blocos da rodada, concatenados, são lidos como um inteiro little-endian
+e consumidos a partir do bit menos significativo. Ao ``revelar`` a semente,
+qualquer um confere o compromisso e refaz cada rodada.
+
+``GeradorJusto`` é um ``random.Random``: o motor recebe-o em ``rng`` e
+``randrange``, ``shuffle``, ``getrandbits`` e ``random`` saem desses bits.
+Um inteiro abaixo de ``n`` (base de ``randrange`` e ``shuffle``) toma
+``n.bit_length()`` bits e, se passar de ``n``, descarta-os e toma outros:
+rejeição, sem viés de módulo, e fixada aqui para não depender da versão do
+``random``. A casa da roleta, o lado da moeda, as paradas dos rolos e a
+permutação do baralho do Truco (Fisher-Yates do ``shuffle``) são uniformes.
+``aplicar`` liga o gerador a um motor e abre uma rodada a cada ação
+(``girar``, ``jogar``...); ações que não sorteiam não gastam nonce, e um
+lote (``girar_lote``, ``jogar_lote``) é uma rodada só.
+
+O primeiro bloco de cada rodada é derivado em lotes de ``lote`` nonces
+seguidos, com as chaves interna e externa do HMAC já preparadas, em vez de
+um ``hmac.digest`` por rodada.
+
+Uso: ``python justo.py <semente_servidor_hex> <semente_cliente> <nonce>``
+mostra os bits da rodada para conferência.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+BLOCO_BITS = 256
+LOTE_PADRAO = 64
+_TAMANHO_BLOCO_SHA256 = 64
+
+
+def _chaves(semente_servidor: bytes) -> tuple[Any, Any]:
+    """Estados SHA-256 já alimentados com a chave ``xor`` ipad e opad, como no HMAC."""
+    if len(semente_servidor) > _TAMANHO_BLOCO_SHA256:
+        semente_servidor = hashlib.sha256(semente_servidor).digest()
+    chave = semente_servidor.ljust(_TAMANHO_BLOCO_SHA256, b"\0")
+    interno = hashlib.sha256(bytes(byte ^ 0x36 for byte in chave))
+    externo = hashlib.sha256(bytes(byte ^ 0x5C for byte in chave))
+    return interno, externo
+
+
+def _hmac_lote(chaves: tuple[Any, Any], mensagens: Iterable[bytes]) -> list[bytes]:
+    copiar_interno, copiar_externo = chaves[0].copy, chaves[1].copy
+    digests = []
+    for mensagem in mensagens:
+        interno = copiar_interno()
+        interno.update(mensagem)
+        externo = copiar_externo()
+        externo.update(interno.digest())
+        digests.append(externo.digest())
+    return digests
+
+
+def derivar(semente_servidor: bytes, semente_cliente: str, nonces: Iterable[int]) -> list[bytes]:
+    """O primeiro bloco, HMAC-SHA256(semente, ``"cliente:nonce"``), de cada um dos ``nonces``."""
+    return _hmac_lote(_chaves(semente_servidor), (f"{semente_cliente}:{nonce}".encode() for nonce in nonces))
+
+
+@dataclass(frozen=True)
+class Revelacao:
+    """Semente do servidor aberta, com o que o jogador precisa para refazer as rodadas."""
+
+    semente_servidor: str
+    compromisso: str
+    semente_cliente: str
+    # Última rodada sorteada com esta semente.
+    nonce: int
+
+    def confere(self) -> bool:
+        return hashlib.sha256(bytes.fromhex(self.semente_servidor)).hexdigest() == self.compromisso
+
+
+class GeradorJusto(random.Random):
+    """``random.Random`` cujos bits vêm de HMAC-SHA256(semente do servidor, ``"cliente:nonce"``).
+
+    ``nonce`` é o da última rodada sorteada; ``nova_rodada`` faz o próximo
+    sorteio abrir a rodada seguinte. ``seed`` troca a semente do servidor
+    (``None``: 32 bytes novos) e volta o nonce a zero.
+    """
+
+    def __init__(
+        self,
+        semente_servidor: bytes | None = None,
+        semente_cliente: str = "",
+        nonce: int = 0,
+        lote: int = LOTE_PADRAO,
+    ) -> None:
+        if lote <= 0:
+            raise ValueError("O lote precisa ser positivo.")
+        self.semente_cliente = semente_cliente
+        self.lote = lote
+        super().__init__(semente_servidor)
+        self.nonce = nonce
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        if a is None:
+            a = os.urandom(32)
+        if not isinstance(a, (bytes, bytearray)):
+            raise TypeError("A semente do servidor precisa ser bytes.")
+        self.semente_servidor = bytes(a)
+        self.compromisso = hashlib.sha256(self.semente_servidor).hexdigest()
+        self._chaves = _chaves(self.semente_servidor)
+        self.nonce = 0
+        self._previstos: list[bytes] = []
+        self._primeiro_previsto = 1
+        self._nova = True
+        self._reserva = 0
+        self._disponiveis = 0
+        self._cursor = 0
+
+    def nova_rodada(self) -> None:
+        """O próximo sorteio começa a rodada ``nonce + 1``; sobras da rodada atual são descartadas."""
+        self._nova = True
+
+    def revelar(self, nova_semente: bytes | None = None) -> Revelacao:
+        """Abre a semente atual e passa a usar ``nova_semente`` (ou uma nova), com novo compromisso."""
+        revelacao = Revelacao(self.semente_servidor.hex(), self.compromisso, self.semente_cliente, self.nonce)
+        self.seed(nova_semente)
+        return revelacao
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("A quantidade de bits não pode ser negativa.")
+        if self._nova:
+            self._abrir_rodada()
+        if self._disponiveis < k:
+            self._estender(k - self._disponiveis)
+        bits = self._reserva & ((1 << k) - 1)
+        self._reserva >>= k
+        self._disponiveis -= k
+        return bits
+
+    def random(self) -> float:
+        return self.getrandbits(53) * 2.0**-53
+
+    def _randbelow(self, n: int) -> int:  # type: ignore[override]
+        # O mesmo que getrandbits(k) até caber abaixo de n, sem uma chamada por tentativa.
+        k = n.bit_length()
+        mascara = (1 << k) - 1
+        if self._nova:
+            self._abrir_rodada()
+        while True:
+            if self._disponiveis < k:
+                self._estender(k - self._disponiveis)
+            sorteado = self._reserva & mascara
+            self._reserva >>= k
+            self._disponiveis -= k
+            if sorteado < n:
+                return sorteado
+
+    def getstate(self) -> tuple[bytes, str, int]:
+        """Semente do servidor, semente do cliente e nonce da última rodada sorteada."""
+        return self.semente_servidor, self.semente_cliente, self.nonce
+
+    def setstate(self, state: tuple[bytes, str, int]) -> None:
+        """Volta ao estado de ``getstate``; o próximo sorteio abre a rodada ``nonce + 1``."""
+        semente_servidor, semente_cliente, nonce = state
+        self.seed(semente_servidor)
+        self.semente_cliente = semente_cliente
+        self.nonce = nonce
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # ``random.Random`` recria com uma semente nova e chama ``setstate``; aqui o lote vai junto.
+        return self.__class__, (self.semente_servidor, self.semente_cliente, self.nonce, self.lote)
+
+    def _abrir_rodada(self) -> None:
+        self.nonce += 1
+        indice = self.nonce - self._primeiro_previsto
+        if not 0 <= indice < len(self._previstos):
+            self._primeiro_previsto, indice = self.nonce, 0
+            mensagens = (f"{self.semente_cliente}:{n}".encode() for n in range(self.nonce, self.nonce + self.lote))
+            self._previstos = _hmac_lote(self._chaves, mensagens)
+        self._reserva = int.from_bytes(self._previstos[indice], "little")
+        self._disponiveis = BLOCO_BITS
+        self._cursor = 1
+        self._nova = False
+
+    def _estender(self, faltam: int) -> None:
+        blocos = -(-faltam // BLOCO_BITS)
+        prefixo = f"{self.semente_cliente}:{self.nonce}:"
+        mensagens = (f"{prefixo}{cursor}".encode() for cursor in range(self._cursor, self._cursor + blocos))
+        self._reserva |= int.from_bytes(b"".join(_hmac_lote(self._chaves, mensagens)), "little") << self._disponiveis
+        self._disponiveis += blocos * BLOCO_BITS
+        self._cursor += blocos
+
+
+def _em_rodada(gerador: GeradorJusto, metodo: Callable[..., Any]) -> Callable[..., Any]:
+    nova_rodada = gerador.nova_rodada
+
+    def em_rodada(*args: Any, **kwargs: Any) -> Any:
+        nova_rodada()
+        return metodo(*args, **kwargs)
+
+    return em_rodada
+
+
+def aplicar(jogo: str, motor: Any, gerador: GeradorJusto | None = None) -> GeradorJusto:
+    """Faz ``motor`` (do ``jogo``, como em ``reproducao.MOTORES``) sortear com ``gerador``, uma rodada por ação."""
+    from reproducao import MOTORES
+
+    gerador = gerador if gerador is not None else GeradorJusto()
+    motor.rng = gerador
+    for nome in MOTORES[jogo][1]:
+        setattr(motor, nome, _em_rodada(gerador, getattr(motor, nome)))
+    return gerador
+
+
+def main() -> None:
+    semente, cliente, nonce = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    bloco = derivar(bytes.fromhex(semente), cliente, [nonce])[0]
+    print(f"compromisso {hashlib.sha256(bytes.fromhex(semente)).hexdigest()}")
+    print(f"rodada {nonce}: {bloco.hex()}")
+
+
+__all__ = ["GeradorJusto", "Revelacao", "aplicar", "derivar"]
+
+
+if __name__ == "__main__":
+    main()
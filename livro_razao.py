@@ -0,0 +1,167 @@
+"""Livro-razão só de acréscimo para persistir as movimentações da carteira.
+
+Cada movimentação vira um registro binário de 16 bytes (instante em ns e
+delta em centavos). As gravações acontecem numa thread própria com *group
+commit*: os registros são acumulados até ``tamanho_lote`` ou ``intervalo``
+segundos e então gravados com um único ``fsync``. De tempos em tempos é
+gravado um snapshot (saldo + posição no arquivo) para que a recuperação só
+precise somar a cauda do livro.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from dinheiro import Centavos
+
+MAGICO = b"LRZ1"
+REGISTRO = struct.Struct("<Qq")
+SNAPSHOT = struct.Struct("<4sqq")
+CRC = struct.Struct("<I")
+CAMINHO_PADRAO = Path.home() / ".arcade_apostas" / "carteira.lrz"
+
+_FIM = object()
+
+
+class LivroRazao:
+    """Grava deltas da carteira sem bloquear quem chama ``registrar``."""
+
+    def __init__(
+        self,
+        caminho: str | os.PathLike[str] = CAMINHO_PADRAO,
+        intervalo: float = 0.05,
+        tamanho_lote: int = 512,
+        registros_por_snapshot: int = 10_000,
+    ) -> None:
+        if intervalo < 0 or tamanho_lote <= 0 or registros_por_snapshot <= 0:
+            raise ValueError("Parâmetros de gravação inválidos.")
+        self.caminho = Path(caminho)
+        self.caminho_snapshot = self.caminho.with_suffix(self.caminho.suffix + ".snap")
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self.registros_por_snapshot = registros_por_snapshot
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._saldo_gravado = self._recuperar()
+        self._saldo = self._saldo_gravado
+        self._trava_saldo = threading.Lock()
+        self._desde_snapshot = 0
+
+        self._arquivo = open(self.caminho, "ab")
+        self._fila: queue.SimpleQueue[object] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._gravar_em_lotes, name="livro-razao", daemon=True)
+        self._thread.start()
+
+    @property
+    def saldo_centavos(self) -> Centavos:
+        """Saldo considerando também os registros ainda não gravados."""
+        return self._saldo
+
+    def registrar(self, delta: Centavos) -> None:
+        if not delta:
+            return
+        with self._trava_saldo:
+            self._saldo += delta
+        self._fila.put((time.time_ns(), delta))
+
+    def fechar(self) -> None:
+        """Grava o que estiver pendente, salva um snapshot e fecha o arquivo."""
+        if self._arquivo.closed:
+            return
+        self._fila.put(_FIM)
+        self._thread.join()
+        self._gravar_snapshot()
+        self._arquivo.close()
+
+    def __enter__(self) -> LivroRazao:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.fechar()
+
+    def _gravar_em_lotes(self) -> None:
+        fila = self._fila
+        encerrar = False
+        while not encerrar:
+            item = fila.get()
+            lote: list[tuple[int, int]] = []
+            prazo = time.monotonic() + self.intervalo
+            while True:
+                if item is _FIM:
+                    encerrar = True
+                    break
+                lote.append(item)  # type: ignore[arg-type]
+                if len(lote) >= self.tamanho_lote:
+                    break
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    item = fila.get(timeout=restante)
+                except queue.Empty:
+                    break
+            if lote:
+                self._gravar_lote(lote)
+
+    def _gravar_lote(self, lote: list[tuple[int, int]]) -> None:
+        pack = REGISTRO.pack
+        self._arquivo.write(b"".join(pack(instante, delta) for instante, delta in lote))
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        self._saldo_gravado += sum(delta for _, delta in lote)
+        self._desde_snapshot += len(lote)
+        if self._desde_snapshot >= self.registros_por_snapshot:
+            self._gravar_snapshot()
+
+    def _gravar_snapshot(self) -> None:
+        posicao = self._arquivo.tell()
+        corpo = SNAPSHOT.pack(MAGICO, self._saldo_gravado, posicao)
+        temporario = self.caminho_snapshot.with_suffix(".tmp")
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(corpo + CRC.pack(zlib.crc32(corpo)))
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho_snapshot)
+        self._desde_snapshot = 0
+
+    def _ler_snapshot(self, tamanho_livro: int) -> tuple[Centavos, int]:
+        try:
+            dados = self.caminho_snapshot.read_bytes()
+        except FileNotFoundError:
+            return 0, len(MAGICO)
+        if len(dados) != SNAPSHOT.size + CRC.size:
+            return 0, len(MAGICO)
+        corpo = dados[: SNAPSHOT.size]
+        magico, saldo, posicao = SNAPSHOT.unpack(corpo)
+        (crc,) = CRC.unpack(dados[SNAPSHOT.size :])
+        if magico != MAGICO or crc != zlib.crc32(corpo) or posicao > tamanho_livro:
+            return 0, len(MAGICO)
+        return saldo, posicao
+
+    def _recuperar(self) -> Centavos:
+        """Reconstrói o saldo a partir do último snapshot e da cauda do livro."""
+        if not self.caminho.exists() or self.caminho.stat().st_size == 0:
+            self.caminho.write_bytes(MAGICO)
+            return 0
+
+        with open(self.caminho, "r+b") as arquivo:
+            if arquivo.read(len(MAGICO)) != MAGICO:
+                raise ValueError(f"{self.caminho} não é um livro-razão válido.")
+            tamanho = arquivo.seek(0, os.SEEK_END)
+            saldo, posicao = self._ler_snapshot(tamanho)
+            arquivo.seek(posicao)
+            cauda = arquivo.read()
+            completos = len(cauda) - len(cauda) % REGISTRO.size
+            if completos != len(cauda):
+                # Registro incompleto de uma gravação interrompida.
+                arquivo.truncate(posicao + completos)
+        return saldo + sum(delta for _, delta in REGISTRO.iter_unpack(cauda[:completos]))
+
+
+__all__ = ["CAMINHO_PADRAO", "LivroRazao"]
@@ -0,0 +1,419 @@
+"""Instrumentação opcional dos motores e da carteira, no formato do Prometheus.
+
+Desligada, ela não existe: ``ativar`` troca os métodos quentes das classes
+(``jogar``, ``girar`` e suas versões em lote, ``jogar_carta``, ``pedir_truco``
+e as operações do ``CarteiraService``) por versões medidas e ``desativar`` devolve os
+originais. Sem ``ativar`` não há nem um teste a mais no caminho das rodadas.
+
+Ligada, cada operação alimenta:
+
+* ``arcade_operacao_segundos``: histograma de latência por jogo e operação,
+  guardado em baldes log-lineares no estilo HDR (erro relativo abaixo de
+  1,6%); o ``_count`` dele é o número de chamadas;
+* ``arcade_erros_total``: operações que lançaram exceção;
+* ``arcade_rodadas_total``: rodadas (mãos, no Truco) resolvidas por jogo,
+  de onde sai a taxa de rodadas por segundo;
+* ``arcade_desfechos_total``: contagem de vitórias, derrotas, empates,
+  trucos aceitos e operações de carteira recusadas.
+
+``Registro.texto`` gera o formato de exposição; ``Registro.servir`` o publica
+em ``/metrics`` num servidor HTTP local e ``Registro.salvar`` grava em
+arquivo (compatível com o coletor de arquivos de texto do node_exporter).
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 9464
+
+PRECISAO_BITS = 7
+VALOR_MAXIMO_NS = (1 << 41) - 1  # ~37 minutos
+LIMITES_SEGUNDOS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+Rotulos = tuple[tuple[str, str], ...]
+Desfechos = Iterable[tuple[str, int]]
+
+
+class _PorThread:
+    """Base das séries: cada thread escreve no próprio fragmento, sem travas no caminho quente.
+
+    A leitura soma os fragmentos; um valor lido no meio de uma escrita pode
+    ficar uma amostra atrasado, nunca perdido.
+    """
+
+    __slots__ = ("_local", "_fragmentos", "_trava")
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._fragmentos: list[Any] = []
+        self._trava = threading.Lock()
+
+    def _novo_fragmento(self) -> Any:
+        raise NotImplementedError
+
+    def _fragmento(self) -> Any:
+        fragmento = self._novo_fragmento()
+        with self._trava:
+            self._fragmentos.append(fragmento)
+        self._local.fragmento = fragmento
+        return fragmento
+
+
+class Contador(_PorThread):
+    __slots__ = ()
+
+    def _novo_fragmento(self) -> list[int]:
+        return [0]
+
+    def incrementar(self, quantidade: int = 1) -> None:
+        try:
+            self._local.fragmento[0] += quantidade
+        except AttributeError:
+            self._fragmento()[0] += quantidade
+
+    @property
+    def valor(self) -> int:
+        return sum(fragmento[0] for fragmento in self._fragmentos)
+
+
+def _indice(valor: int) -> int:
+    """Balde de ``valor``: exato até ``2**PRECISAO_BITS``, depois com ``PRECISAO_BITS`` bits significativos."""
+    if valor < 1 << PRECISAO_BITS:
+        return valor
+    deslocamento = valor.bit_length() - PRECISAO_BITS
+    return (deslocamento << (PRECISAO_BITS - 1)) + (valor >> deslocamento)
+
+
+def _teto(indice: int) -> int:
+    """Maior valor que cai no balde ``indice``."""
+    if indice < 1 << PRECISAO_BITS:
+        return indice
+    deslocamento = (indice >> (PRECISAO_BITS - 1)) - 1
+    mantissa = indice - (deslocamento << (PRECISAO_BITS - 1))
+    return ((mantissa + 1) << deslocamento) - 1
+
+
+_BALDES = _indice(VALOR_MAXIMO_NS) + 1
+_PISO_LOG = 1 << PRECISAO_BITS
+
+
+class _FragmentoHistograma:
+    __slots__ = ("contagens", "soma", "maximo")
+
+    def __init__(self) -> None:
+        self.contagens = [0] * _BALDES
+        self.soma = 0
+        self.maximo = 0
+
+
+class Histograma(_PorThread):
+    """Latências em nanossegundos com memória fixa, no estilo do HdrHistogram."""
+
+    __slots__ = ()
+
+    def _novo_fragmento(self) -> _FragmentoHistograma:
+        return _FragmentoHistograma()
+
+    def registrar(self, valor_ns: int) -> None:
+        try:
+            fragmento = self._local.fragmento
+        except AttributeError:
+            fragmento = self._fragmento()
+        # ``_indice`` em linha: a chamada custaria mais que a conta.
+        if valor_ns < _PISO_LOG:
+            indice = valor_ns if valor_ns > 0 else 0
+        else:
+            if valor_ns > VALOR_MAXIMO_NS:
+                valor_ns = VALOR_MAXIMO_NS
+            deslocamento = valor_ns.bit_length() - PRECISAO_BITS
+            indice = (deslocamento << (PRECISAO_BITS - 1)) + (valor_ns >> deslocamento)
+        fragmento.contagens[indice] += 1
+        fragmento.soma += valor_ns
+        if valor_ns > fragmento.maximo:
+            fragmento.maximo = valor_ns
+
+    @property
+    def contagens(self) -> list[int]:
+        return [sum(coluna) for coluna in zip(*(f.contagens for f in self._fragmentos))] or [0] * _BALDES
+
+    @property
+    def contagem(self) -> int:
+        return sum(sum(f.contagens) for f in self._fragmentos)
+
+    @property
+    def soma(self) -> int:
+        return sum(f.soma for f in self._fragmentos)
+
+    @property
+    def maximo(self) -> int:
+        return max((f.maximo for f in self._fragmentos), default=0)
+
+    def percentil(self, p: float) -> int:
+        """Valor (ns) abaixo do qual estão ``p``% das amostras; 0 se vazio."""
+        contagens = self.contagens
+        total = sum(contagens)
+        if not total:
+            return 0
+        alvo = max(1, -(-total * p // 100))
+        acumulado = 0
+        for indice, quantidade in enumerate(contagens):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(_teto(indice), self.maximo)
+        return self.maximo
+
+    def acumulados(self, limites_ns: Iterable[int]) -> list[int]:
+        """Contagem de amostras com balde inteiramente abaixo de cada limite; por último, o total."""
+        contagens = self.contagens
+        resultado = []
+        indice = acumulado = 0
+        for limite in limites_ns:
+            while indice < _BALDES and _teto(indice) <= limite:
+                acumulado += contagens[indice]
+                indice += 1
+            resultado.append(acumulado)
+        resultado.append(acumulado + sum(contagens[indice:]))
+        return resultado
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(rotulos: Rotulos, extra: str = "") -> str:
+    partes = [f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+class Registro:
+    """Contadores e histogramas por nome e rótulos, exportáveis como texto."""
+
+    def __init__(self) -> None:
+        self._metricas: dict[str, tuple[str, str, dict[Rotulos, Any]]] = {}
+        self._trava = threading.Lock()
+
+    def contador(self, nome: str, ajuda: str, **rotulos: str) -> Contador:
+        return self._obter(nome, "counter", ajuda, rotulos, Contador)
+
+    def histograma(self, nome: str, ajuda: str, **rotulos: str) -> Histograma:
+        return self._obter(nome, "histogram", ajuda, rotulos, Histograma)
+
+    def _obter(self, nome: str, tipo: str, ajuda: str, rotulos: dict[str, str], fabrica: Callable[[], Any]) -> Any:
+        chave = tuple(sorted(rotulos.items()))
+        with self._trava:
+            _, _, series = self._metricas.setdefault(nome, (tipo, ajuda, {}))
+            if chave not in series:
+                series[chave] = fabrica()
+            return series[chave]
+
+    def texto(self) -> str:
+        """Formato de exposição de texto do Prometheus (versão 0.0.4)."""
+        linhas = []
+        limites_ns = [round(limite * 1e9) for limite in LIMITES_SEGUNDOS]
+        with self._trava:
+            metricas = [(nome, tipo, ajuda, dict(series)) for nome, (tipo, ajuda, series) in self._metricas.items()]
+        for nome, tipo, ajuda, series in sorted(metricas):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            for rotulos, serie in sorted(series.items()):
+                if tipo == "counter":
+                    linhas.append(f"{nome}{_rotulos(rotulos)} {serie.valor}")
+                    continue
+                acumulados = serie.acumulados(limites_ns)
+                for limite, acumulado in zip([*map(repr, LIMITES_SEGUNDOS), "+Inf"], acumulados):
+                    balde = _rotulos(rotulos, 'le="' + limite + '"')
+                    linhas.append(f"{nome}_bucket{balde} {acumulado}")
+                linhas.append(f"{nome}_sum{_rotulos(rotulos)} {serie.soma / 1e9!r}")
+                linhas.append(f"{nome}_count{_rotulos(rotulos)} {acumulados[-1]}")
+        return "\n".join(linhas) + "\n"
+
+    def salvar(self, caminho: str | os.PathLike[str]) -> None:
+        """Grava o texto de exposição de forma atômica (arquivo temporário e ``replace``)."""
+        destino = Path(caminho)
+        temporario = destino.with_name(destino.name + ".tmp")
+        temporario.write_text(self.texto(), encoding="utf-8")
+        os.replace(temporario, destino)
+
+    def servir(self, host: str = HOST_PADRAO, porta: int = PORTA_PADRAO) -> ThreadingHTTPServer:
+        """Publica ``/metrics`` numa thread própria; ``shutdown()`` no retorno encerra."""
+        registro = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                corpo = registro.texto().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        servidor = ThreadingHTTPServer((host, porta), Manipulador)
+        servidor.daemon_threads = True
+        threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+        return servidor
+
+
+def _venceu(resultado: Any) -> Desfechos:
+    return (("vitoria" if resultado.venceu else "derrota", 1),)
+
+
+def _lote(lote: Any) -> Desfechos:
+    return (("vitoria", lote.vitorias), ("derrota", lote.jogadas - lote.vitorias))
+
+
+def _slot(resultado: Any) -> Desfechos:
+    if resultado.lucro > 0:
+        return (("vitoria", 1),)
+    return (("parcial" if resultado.ganho > 0 else "derrota", 1),)
+
+
+def _em_lote(desfechos: Callable[[Any], Desfechos]) -> Callable[[list[Any]], Desfechos]:
+    def contar(resultados: list[Any]) -> Desfechos:
+        return tuple(Counter(desfecho for resultado in resultados for desfecho, _ in desfechos(resultado)).items())
+
+    return contar
+
+
+def _mao(resultado: Any) -> Desfechos:
+    if not resultado.hand_finished:
+        return ()
+    desfecho = {"player": "vitoria", "ai": "derrota"}.get(resultado.hand_winner or "", "empate")
+    return ((desfecho, 1),)
+
+
+def _truco(resultado: Any) -> Desfechos:
+    if resultado.folded:
+        return (("correu", 1),)
+    return (("aceito" if resultado.accepted else "recusado", 1),)
+
+
+def _aceita(resultado: Any) -> Desfechos:
+    return (("recusada" if resultado is False or resultado is None else "aceita", 1),)
+
+
+# (módulo, classe, método, jogo, desfechos, desfechos contam como rodadas)
+ALVOS: tuple[tuple[str, str, str, str, Callable[[Any], Desfechos] | None, bool], ...] = (
+    ("CaraOuCoroa.game", "CoinGame", "jogar", "cara", _venceu, True),
+    ("CaraOuCoroa.game", "CoinGame", "jogar_lote", "cara", _lote, True),
+    ("Roleta.game", "RouletteGame", "girar", "roleta", _venceu, True),
+    ("Roleta.game", "RouletteGame", "girar_lote", "roleta", _em_lote(_venceu), True),
+    ("CacaNiquel.game", "SlotMachine", "girar", "slot", _slot, True),
+    ("CacaNiquel.game", "SlotMachine", "girar_lote", "slot", _em_lote(_slot), True),
+    ("Truco.game", "TrucoGame", "jogar_carta", "truco", _mao, True),
+    ("Truco.game", "TrucoGame", "pedir_truco", "truco", _truco, False),
+    ("carteira", "CarteiraService", "depositar", "carteira", None, False),
+    ("carteira", "CarteiraService", "retirar", "carteira", _aceita, False),
+    ("carteira", "CarteiraService", "ajustar", "carteira", _aceita, False),
+    ("carteira", "CarteiraService", "transferir", "carteira", _aceita, False),
+    ("carteira", "CarteiraService", "reservar", "carteira", _aceita, False),
+    ("carteira", "CarteiraService", "confirmar_reserva", "carteira", None, False),
+    ("carteira", "CarteiraService", "cancelar_reserva", "carteira", None, False),
+)
+
+_registro: Registro | None = None
+_originais: list[tuple[type, str, Callable[..., Any]]] = []
+_trava = threading.Lock()
+
+
+def _medir(
+    registro: Registro,
+    original: Callable[..., Any],
+    jogo: str,
+    operacao: str,
+    desfechos: Callable[[Any], Desfechos] | None,
+    contam_rodadas: bool,
+) -> Callable[..., Any]:
+    rotulos = {"jogo": jogo, "operacao": operacao}
+    duracao = registro.histograma("arcade_operacao_segundos", "Duração das operações.", **rotulos)
+    erros = registro.contador("arcade_erros_total", "Operações que lançaram exceção.", **rotulos)
+    rodadas = registro.contador("arcade_rodadas_total", "Rodadas resolvidas (mãos no Truco).", jogo=jogo)
+    por_desfecho: dict[str, Contador] = {}
+    relogio = time.perf_counter_ns
+
+    def contar(resultado: Any) -> None:
+        assert desfechos is not None
+        for desfecho, quantidade in desfechos(resultado):
+            contador = por_desfecho.get(desfecho)
+            if contador is None:
+                contador = por_desfecho[desfecho] = registro.contador(
+                    "arcade_desfechos_total", "Desfechos das operações.", desfecho=desfecho, **rotulos
+                )
+            contador.incrementar(quantidade)
+            if contam_rodadas:
+                rodadas.incrementar(quantidade)
+
+    @functools.wraps(original)
+    def medido(*args: Any, **kwargs: Any) -> Any:
+        inicio = relogio()
+        try:
+            resultado = original(*args, **kwargs)
+        except BaseException:
+            erros.incrementar()
+            raise
+        finally:
+            duracao.registrar(relogio() - inicio)
+        if desfechos is not None:
+            contar(resultado)
+        return resultado
+
+    return medido
+
+
+def ativar(registro: Registro | None = None) -> Registro:
+    """Instrumenta os alvos; se já estiver ativa, devolve o registro em uso."""
+    global _registro
+    with _trava:
+        if _registro is not None:
+            return _registro
+        _registro = registro if registro is not None else Registro()
+        for modulo, nome_classe, metodo, jogo, desfechos, contam_rodadas in ALVOS:
+            classe = getattr(importlib.import_module(modulo), nome_classe)
+            original = classe.__dict__[metodo]
+            _originais.append((classe, metodo, original))
+            setattr(classe, metodo, _medir(_registro, original, jogo, metodo, desfechos, contam_rodadas))
+        return _registro
+
+
+def desativar() -> None:
+    """Devolve os métodos originais; o registro continua legível por quem o guardou."""
+    global _registro
+    with _trava:
+        while _originais:
+            classe, metodo, original = _originais.pop()
+            setattr(classe, metodo, original)
+        _registro = None
+
+
+def registro_ativo() -> Registro | None:
+    return _registro
+
+
+__all__ = [
+    "Contador",
+    "Histograma",
+    "Registro",
+    "ativar",
+    "desativar",
+    "registro_ativo",
+]
@@ -0,0 +1,434 @@
+"""RTP realizado por jogo em janelas deslizantes, comparado ao teórico.
+
+``MonitorRTP.registrar`` recebe o mesmo resultado que vai para o histórico e
+a tabela de pagamentos do motor, e soma, por jogo e tabela, quanto foi
+apostado e quanto voltou ao jogador: cada tabela em jogo tem seus anéis,
+com o nome ``jogo@hash`` (início do hash da tabela). Cada janela
+(último minuto, 15 minutos, hora e dia) é um anel de baldes de tempo em
+arrays de tamanho fixo: baldes vencidos são zerados e reaproveitados, então
+a memória não cresce com o movimento.
+
+Para rodadas com modelo em ``estrategias`` (moeda, roleta por cor e
+caça-níquel), tirado da tabela em jogo, cada balde também acumula o pagamento esperado e sua variância,
+``aposta * rtp`` e ``aposta² * σ²``. Assim apostas de valores e cores
+diferentes se misturam sem aproximação, e o desvio do pago em relação ao
+esperado vira um escore z. Com pelo menos ``rodadas_minimas`` rodadas e
+``|z| >= z_alerta``, os assinantes recebem um ``Alerta``; ele só se repete
+depois que o desvio voltar ao normal. O Truco não tem tabela de prêmios:
+aparece com apostado, pago e resultado da casa, sem comparação.
+
+Por rodada só se somam os pendentes do jogo, separados por modelo; eles
+passam aos anéis (e os alertas são conferidos) quando fecha o balde mais
+estreito, um segundo por padrão, ou quando alguém consulta os totais.
+
+O resultado da casa (apostado menos pago) de cada janela é a exposição. O
+jackpot progressivo do caça-níquel fica de fora do pago: o fundo é pago com
+as contribuições de todas as sessões, e um prêmio raro e alto faria o escore
+de uma janela disparar sem que a tabela tivesse mudado.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from functools import cache, singledispatch
+from typing import Callable
+
+from CacaNiquel.game import SpinResult as SlotSpinResult
+from CaraOuCoroa.game import RoundResult
+from dinheiro import Centavos, formatar_centavos, para_centavos
+from estrategias import ModeloJogo, modelo_moeda, modelo_roleta, modelo_slot
+from historico import resumir_resultado
+from Roleta.game import SpinResult as RouletteSpinResult
+from tabelas import Tabela
+from Truco.game import TrucoPlayResult, TrucoRaiseResult
+
+Z_ALERTA = 3.0
+RODADAS_MINIMAS = 100
+HASH_CURTO = 8
+# Os pendentes são separados pela identidade do modelo; este fica fixo.
+_MODELO_MOEDA = modelo_moeda()
+
+
+@dataclass(frozen=True)
+class Janela:
+    nome: str
+    duracao_s: float
+    baldes: int
+
+    @property
+    def largura_s(self) -> float:
+        return self.duracao_s / self.baldes
+
+
+JANELAS = (
+    Janela("1min", 60, 60),
+    Janela("15min", 900, 60),
+    Janela("1h", 3600, 60),
+    Janela("24h", 86_400, 96),
+)
+
+
+@dataclass(frozen=True)
+class Totais:
+    """Somas de uma janela; ``esperado`` e ``variancia`` são zero sem modelo."""
+
+    rodadas: int
+    apostado: Centavos
+    pago: Centavos
+    esperado: float
+    variancia: float
+    maior_pagamento: Centavos
+
+    @property
+    def rtp(self) -> float | None:
+        return self.pago / self.apostado if self.apostado else None
+
+    @property
+    def rtp_teorico(self) -> float | None:
+        return self.esperado / self.apostado if self.apostado and self.variancia else None
+
+    @property
+    def desvio_rtp(self) -> float | None:
+        """Desvio padrão do RTP realizado em torno do teórico, com estas apostas."""
+        return math.sqrt(self.variancia) / self.apostado if self.apostado and self.variancia else None
+
+    @property
+    def z(self) -> float | None:
+        return (self.pago - self.esperado) / math.sqrt(self.variancia) if self.variancia else None
+
+    @property
+    def resultado_casa(self) -> Centavos:
+        return self.apostado - self.pago
+
+
+@dataclass(frozen=True)
+class Alerta:
+    jogo: str
+    janela: str
+    totais: Totais
+
+    def __str__(self) -> str:
+        t = self.totais
+        return (
+            f"RTP de {self.jogo} em {self.janela}: {t.rtp:.2%} contra {t.rtp_teorico:.2%} teórico"
+            f" (z {t.z:+.1f}, {t.rodadas} rodadas, casa {formatar_centavos(t.resultado_casa)})"
+        )
+
+
+@singledispatch
+def apostado_e_pago(resultado: object, aposta: float | None) -> tuple[Centavos, Centavos] | None:
+    """``(apostado, pago)`` de um resultado, ou ``None`` se não fecha uma aposta."""
+    valor, lucro, _ = resumir_resultado(resultado, aposta)
+    return valor, valor + lucro
+
+
+@apostado_e_pago.register
+def _(resultado: SlotSpinResult, aposta: float | None) -> tuple[Centavos, Centavos] | None:
+    return para_centavos(resultado.aposta), para_centavos(resultado.ganho - resultado.jackpot)
+
+
+@apostado_e_pago.register
+def _(resultado: TrucoPlayResult, aposta: float | None) -> tuple[Centavos, Centavos] | None:
+    if not resultado.hand_finished:
+        return None
+    valor, lucro, _ = resumir_resultado(resultado, aposta)
+    apostado = valor * resultado.multiplier
+    return apostado, apostado + lucro
+
+
+@apostado_e_pago.register
+def _(resultado: TrucoRaiseResult, aposta: float | None) -> tuple[Centavos, Centavos] | None:
+    if not resultado.folded:
+        return None
+    apostado = para_centavos(aposta or 0) * resultado.multiplier
+    return apostado, 2 * apostado
+
+
+@singledispatch
+def modelo_do_resultado(resultado: object, tabela: Tabela | None = None) -> ModeloJogo | None:
+    """Modelo teórico da aposta que gerou ``resultado`` com ``tabela`` (``None``: a padrão); ``None`` sem modelo."""
+    return None
+
+
+@modelo_do_resultado.register
+def _(resultado: RoundResult, tabela: Tabela | None = None) -> ModeloJogo | None:
+    return _MODELO_MOEDA
+
+
+@modelo_do_resultado.register
+def _(resultado: RouletteSpinResult, tabela: Tabela | None = None) -> ModeloJogo | None:
+    return modelo_roleta(resultado.aposta_cor, tabela)  # type: ignore[arg-type]
+
+
+@modelo_do_resultado.register
+def _(resultado: SlotSpinResult, tabela: Tabela | None = None) -> ModeloJogo | None:
+    return modelo_slot(tabela)  # type: ignore[arg-type]
+
+
+def chave(jogo: str, tabela: Tabela | None = None) -> str:
+    """Nome de ``jogo`` com ``tabela`` nos totais e alertas: ``jogo@hash``, ou só o jogo sem tabela."""
+    return jogo if tabela is None else f"{jogo}@{tabela.hash[:HASH_CURTO]}"
+
+
+@cache
+def momentos(modelo: ModeloJogo) -> tuple[float, float]:
+    """RTP e variância do pagamento por unidade apostada."""
+    rtp = sum(p * r / 10 for p, r in zip(modelo.probabilidades, modelo.retornos))
+    segundo = sum(p * (r / 10) ** 2 for p, r in zip(modelo.probabilidades, modelo.retornos))
+    return rtp, segundo - rtp * rtp
+
+
+class _Anel:
+    """Baldes de uma janela e suas somas correntes, em arrays de tamanho fixo."""
+
+    __slots__ = (
+        "janela", "_epocas", "_rodadas", "_apostado", "_pago", "_esperado", "_variancia", "_maior",
+        "_ultima", "rodadas", "apostado", "pago", "esperado", "variancia",
+    )
+
+    def __init__(self, janela: Janela) -> None:
+        n = janela.baldes
+        self.janela = janela
+        self._epocas = array("q", [-1]) * n
+        self._rodadas = array("q", [0]) * n
+        self._apostado = array("q", [0]) * n
+        self._pago = array("q", [0]) * n
+        self._maior = array("q", [0]) * n
+        self._esperado = array("d", [0.0]) * n
+        self._variancia = array("d", [0.0]) * n
+        self._ultima = -1
+        self.rodadas = self.apostado = self.pago = 0
+        self.esperado = self.variancia = 0.0
+
+    def avancar(self, instante: float) -> int:
+        """Zera os baldes que saíram da janela até ``instante``; devolve o índice atual."""
+        n = self.janela.baldes
+        epoca = int(instante // self.janela.largura_s)
+        if epoca > self._ultima:
+            for e in range(max(self._ultima + 1, epoca - n + 1), epoca + 1):
+                i = e % n
+                if self._epocas[i] >= 0:
+                    self.rodadas -= self._rodadas[i]
+                    self.apostado -= self._apostado[i]
+                    self.pago -= self._pago[i]
+                    self.esperado -= self._esperado[i]
+                    self.variancia -= self._variancia[i]
+                self._epocas[i] = e
+                self._rodadas[i] = self._apostado[i] = self._pago[i] = self._maior[i] = 0
+                self._esperado[i] = self._variancia[i] = 0.0
+            self._ultima = epoca
+            if self.rodadas == 0:
+                # Sem rodadas na janela, descarta o resíduo de arredondamento das somas.
+                self.esperado = self.variancia = 0.0
+        return self._ultima % n
+
+    def somar(self, instante: float, pendente: _Pendente) -> None:
+        i = self.avancar(instante)
+        self._rodadas[i] += pendente.rodadas
+        self._apostado[i] += pendente.apostado
+        self._pago[i] += pendente.pago
+        self._esperado[i] += pendente.esperado
+        self._variancia[i] += pendente.variancia
+        self._maior[i] = max(self._maior[i], pendente.maior)
+        self.rodadas += pendente.rodadas
+        self.apostado += pendente.apostado
+        self.pago += pendente.pago
+        self.esperado += pendente.esperado
+        self.variancia += pendente.variancia
+
+    def totais(self, instante: float) -> Totais:
+        self.avancar(instante)
+        return Totais(self.rodadas, self.apostado, self.pago, self.esperado, self.variancia, max(self._maior))
+
+
+class _Pendente:
+    """Rodadas de um modelo ainda não passadas aos anéis."""
+
+    __slots__ = ("modelo", "rodadas", "apostado", "quadrados", "pago", "maior", "esperado", "variancia")
+
+    def __init__(self, modelo: ModeloJogo | None) -> None:
+        self.modelo = modelo
+        self.rodadas = self.apostado = self.quadrados = self.pago = self.maior = 0
+        self.esperado = self.variancia = 0.0
+
+    def somar(self, outro: _Pendente) -> None:
+        """Acumula ``outro`` já com ``esperado`` e ``variancia`` calculados pelo modelo dele."""
+        if outro.modelo is not None:
+            rtp, variancia = momentos(outro.modelo)
+            self.esperado += rtp * outro.apostado
+            self.variancia += variancia * outro.quadrados
+        self.rodadas += outro.rodadas
+        self.apostado += outro.apostado
+        self.pago += outro.pago
+        self.maior = max(self.maior, outro.maior)
+
+
+class _Jogo:
+    __slots__ = ("aneis", "pendentes", "descarga")
+
+    def __init__(self, janelas: tuple[Janela, ...]) -> None:
+        self.aneis = tuple(_Anel(janela) for janela in janelas)
+        self.pendentes: dict[int, _Pendente] = {}
+        self.descarga = 0.0
+
+
+class MonitorRTP:
+    """Apostado e pago por jogo em janelas deslizantes, com alertas de desvio.
+
+    Pode ser chamado de várias threads; os assinantes de alerta rodam na
+    thread que provocou a descarga, fora da trava.
+    """
+
+    def __init__(
+        self,
+        janelas: tuple[Janela, ...] = JANELAS,
+        z_alerta: float = Z_ALERTA,
+        rodadas_minimas: int = RODADAS_MINIMAS,
+        relogio: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not janelas:
+            raise ValueError("Configure ao menos uma janela.")
+        if z_alerta <= 0:
+            raise ValueError("O limite de alerta precisa ser positivo.")
+        self.janelas = janelas
+        self.z_alerta = z_alerta
+        self.rodadas_minimas = rodadas_minimas
+        self.relogio = relogio
+        self._largura_s = min(janela.largura_s for janela in janelas)
+        self._jogos: dict[str, _Jogo] = {}
+        self._em_alerta: set[tuple[str, str]] = set()
+        self._assinantes: tuple[Callable[[Alerta], None], ...] = ()
+        self._trava = threading.Lock()
+
+    @property
+    def jogos(self) -> list[str]:
+        return sorted(self._jogos)
+
+    def assinar(self, assinante: Callable[[Alerta], None]) -> Callable[[], None]:
+        """Chama ``assinante(alerta)`` a cada desvio novo; devolve o cancelamento."""
+        self._assinantes += (assinante,)
+
+        def cancelar() -> None:
+            self._assinantes = tuple(a for a in self._assinantes if a is not assinante)
+
+        return cancelar
+
+    def registrar(
+        self, jogo: str, resultado: object, aposta: float | None = None, tabela: Tabela | None = None
+    ) -> None:
+        """Soma uma rodada jogada com ``tabela``; ``aposta`` só é necessária para Roleta e Truco, como no histórico.
+
+        A rodada entra em ``chave(jogo, tabela)`` e é comparada ao modelo
+        dessa tabela, então trocar a tabela não mistura RTPs teóricos.
+        """
+        valores = apostado_e_pago(resultado, aposta)
+        if valores is not None:
+            self.registrar_valores(chave(jogo, tabela), *valores, modelo_do_resultado(resultado, tabela))
+
+    def registrar_valores(
+        self, jogo: str, apostado: Centavos, pago: Centavos, modelo: ModeloJogo | None = None
+    ) -> None:
+        agora = self.relogio()
+        with self._trava:
+            estado = self._jogos.get(jogo)
+            if estado is None:
+                estado = self._jogos[jogo] = _Jogo(self.janelas)
+            pendente = estado.pendentes.get(id(modelo))
+            if pendente is None:
+                pendente = estado.pendentes[id(modelo)] = _Pendente(modelo)
+            pendente.rodadas += 1
+            pendente.apostado += apostado
+            pendente.quadrados += apostado * apostado
+            pendente.pago += pago
+            if pago > pendente.maior:
+                pendente.maior = pago
+            if agora < estado.descarga:
+                return
+            alertas = self._descarregar(jogo, estado, agora)
+        self._avisar(alertas)
+
+    def _descarregar(self, jogo: str, estado: _Jogo, agora: float) -> list[Alerta]:
+        """Passa os pendentes de ``jogo`` aos anéis e confere o desvio em cada janela."""
+        estado.descarga = (agora // self._largura_s + 1) * self._largura_s
+        if not estado.pendentes:
+            return []
+        lote = _Pendente(None)
+        for pendente in estado.pendentes.values():
+            lote.somar(pendente)
+        estado.pendentes.clear()
+        alertas = []
+        for anel in estado.aneis:
+            anel.somar(agora, lote)
+            alerta = self._verificar(jogo, anel, agora)
+            if alerta is not None:
+                alertas.append(alerta)
+        return alertas
+
+    def _verificar(self, jogo: str, anel: _Anel, agora: float) -> Alerta | None:
+        chave = (jogo, anel.janela.nome)
+        fora = (
+            anel.rodadas >= self.rodadas_minimas
+            and anel.variancia > 0
+            and abs(anel.pago - anel.esperado) >= self.z_alerta * math.sqrt(anel.variancia)
+        )
+        if not fora:
+            self._em_alerta.discard(chave)
+            return None
+        if chave in self._em_alerta:
+            return None
+        self._em_alerta.add(chave)
+        return Alerta(jogo, anel.janela.nome, anel.totais(agora))
+
+    def _avisar(self, alertas: list[Alerta]) -> None:
+        for alerta in alertas:
+            for assinante in self._assinantes:
+                assinante(alerta)
+
+    def totais(self, jogo: str, janela: str) -> Totais:
+        """Totais de ``jogo`` (um nome de ``jogos``, como ``chave`` o monta) em ``janela``."""
+        if all(j.nome != janela for j in self.janelas):
+            raise KeyError(f"Janela {janela!r} não configurada.")
+        agora = self.relogio()
+        with self._trava:
+            estado = self._jogos.get(jogo)
+            if estado is None:
+                return Totais(0, 0, 0, 0.0, 0.0, 0)
+            alertas = self._descarregar(jogo, estado, agora)
+            totais = next(anel.totais(agora) for anel in estado.aneis if anel.janela.nome == janela)
+        self._avisar(alertas)
+        return totais
+
+    def relatorio(self) -> str:
+        linhas = [
+            f"{'jogo':17} {'janela':6} {'rodadas':>8} {'apostado':>14} {'pago':>14} {'RTP':>8}"
+            f" {'teórico':>16} {'z':>6} {'casa':>14}"
+        ]
+        for jogo in self.jogos:
+            for janela in self.janelas:
+                t = self.totais(jogo, janela.nome)
+                rtp = f"{t.rtp:8.2%}" if t.rtp is not None else f"{'-':>8}"
+                teorico = f"{t.rtp_teorico:.2%}±{t.desvio_rtp:.2%}" if t.rtp_teorico is not None else "-"
+                z = f"{t.z:+6.1f}" if t.z is not None else f"{'-':>6}"
+                casa = formatar_centavos(t.resultado_casa)
+                linhas.append(
+                    f"{jogo:17} {janela.nome:6} {t.rodadas:8d} {formatar_centavos(t.apostado):>14}"
+                    f" {formatar_centavos(t.pago):>14} {rtp} {teorico:>16} {z} {casa:>14}"
+                )
+        return "\n".join(linhas)
+
+
+__all__ = [
+    "JANELAS",
+    "Alerta",
+    "Janela",
+    "MonitorRTP",
+    "Totais",
+    "apostado_e_pago",
+    "chave",
+    "modelo_do_resultado",
+    "momentos",
+]
@@ -0,0 +1,179 @@
+"""Controles Tk do jogo automático, compartilhados pelas janelas dos jogos.
+
+O painel lê rodadas, limite de perda, meta de ganho e a estratégia de
+aposta, cria um ``JogoAutomatico`` na sessão do jogo e o conduz pelo
+``after`` do Tk:
+
+* normal: uma rodada por vez, com a animação completa da janela
+  (``rodada_animada``) e uma pausa curta entre rodadas;
+* turbo: sem animação; a cada quadro resolve um lote cujo tamanho se ajusta
+  para caber em ``ORCAMENTO_TURBO_S``, então saldo e status são redesenhados
+  no máximo uma vez por quadro.
+"""
+
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable
+
+from estrategias import ESTRATEGIAS
+from sessao import ErroSessao, JogoAutomatico, Parada, Sessao, converter_valor
+from tema import mostrar_erro
+
+QUADRO_MS = 16
+PAUSA_MS = 350
+ORCAMENTO_TURBO_S = 0.008
+LOTE_TURBO_MAXIMO = 4096
+# Escolhida ao abrir o painel: a aposta fixa, que o motor resolve em lotes.
+ESTRATEGIA_PADRAO = next(iter(ESTRATEGIAS))
+
+Jogar = Callable[[], list[Any]]
+RodadaAnimada = Callable[[Jogar, Callable[[], None]], None]
+
+
+class PainelAutomatico(ttk.Frame):
+    """Rodadas, limites, estratégia, turbo e o botão AUTO/PARAR.
+
+    ``aposta`` devolve o texto da aposta da janela, que é a aposta base da
+    estratégia escolhida. ``rodada_animada(jogar,
+    continuar)`` deve animar uma rodada, chamando ``jogar()`` no momento em
+    que a janela resolveria a jogada e ``continuar()`` ao terminar.
+    ``ao_alternar(ativo)`` avisa a janela para bloquear ou liberar os
+    controles manuais.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        sessao: Sessao[Any, Any],
+        aposta: Callable[[], str],
+        rodada_animada: RodadaAnimada,
+        ao_alternar: Callable[[bool], None],
+    ) -> None:
+        super().__init__(master)
+        self.sessao = sessao
+        self._aposta = aposta
+        self._rodada_animada = rodada_animada
+        self._ao_alternar = ao_alternar
+        self._jogo: JogoAutomatico | None = None
+        self._agendamento: str | None = None
+        self._lote = 1
+
+        self.rodadas_var = tk.StringVar(value="50")
+        self.perda_var = tk.StringVar(value="")
+        self.meta_var = tk.StringVar(value="")
+        self.turbo_var = tk.BooleanVar(value=False)
+        self._estrategias = {classe.titulo: nome for nome, classe in ESTRATEGIAS.items()}
+        self.estrategia_var = tk.StringVar(value=ESTRATEGIAS[ESTRATEGIA_PADRAO].titulo)
+
+        ttk.Label(self, text="Rodadas:").grid(row=0, column=0, sticky="W")
+        self.rodadas_entry = ttk.Entry(self, textvariable=self.rodadas_var, width=6)
+        self.rodadas_entry.grid(row=0, column=1, padx=(2, 8))
+        ttk.Label(self, text="Perda máx.:").grid(row=0, column=2, sticky="W")
+        self.perda_entry = ttk.Entry(self, textvariable=self.perda_var, width=7)
+        self.perda_entry.grid(row=0, column=3, padx=(2, 8))
+        ttk.Label(self, text="Meta:").grid(row=0, column=4, sticky="W")
+        self.meta_entry = ttk.Entry(self, textvariable=self.meta_var, width=7)
+        self.meta_entry.grid(row=0, column=5, padx=(2, 0))
+
+        ttk.Label(self, text="Estratégia:").grid(row=1, column=0, sticky="W", pady=(5, 0))
+        self.estrategia_combo = ttk.Combobox(
+            self, textvariable=self.estrategia_var, values=list(self._estrategias), state="readonly", width=12
+        )
+        self.estrategia_combo.grid(row=1, column=1, columnspan=3, sticky="W", padx=(2, 8), pady=(5, 0))
+        ttk.Checkbutton(self, text="Turbo", variable=self.turbo_var).grid(row=1, column=4, columnspan=2, sticky="W")
+        self.botao = ttk.Button(self, text="AUTO", command=self._alternar)
+        self.botao.grid(row=2, column=0, columnspan=6, sticky="EW", pady=(5, 0))
+
+    @property
+    def ativo(self) -> bool:
+        return self._jogo is not None
+
+    def habilitar(self, habilitar: bool) -> None:
+        """Libera os controles quando a janela pode jogar; durante o automático só PARAR fica ativo."""
+        campos = "disabled" if self.ativo or not habilitar else "normal"
+        for entrada in (self.rodadas_entry, self.perda_entry, self.meta_entry):
+            entrada.configure(state=campos)
+        self.estrategia_combo.configure(state="disabled" if campos == "disabled" else "readonly")
+        self.botao.configure(state="normal" if self.ativo or habilitar else "disabled")
+
+    def parar(self) -> None:
+        if self._jogo is None:
+            return
+        self._jogo.parar()
+        # Sem passo agendado há uma animação em curso; ela chama ``_passo`` ao terminar.
+        if self._agendamento is not None:
+            self.after_cancel(self._agendamento)
+            self._agendamento = None
+            self._passo()
+
+    def cancelar(self) -> None:
+        """Interrompe sem avisar a janela; usado quando ela é reaproveitada pelo Hub."""
+        if self._agendamento is not None:
+            self.after_cancel(self._agendamento)
+            self._agendamento = None
+        self._jogo = None
+        self.botao.configure(text="AUTO")
+
+    def _alternar(self) -> None:
+        if self.ativo:
+            self.parar()
+        else:
+            self._iniciar()
+
+    def _iniciar(self) -> None:
+        try:
+            parada = Parada(
+                rodadas=int(self.rodadas_var.get()),
+                limite_perda=self._opcional(self.perda_var.get()),
+                meta_ganho=self._opcional(self.meta_var.get()),
+            )
+        except ValueError:
+            mostrar_erro(ErroSessao("Valor inválido", "Informe números válidos para o jogo automático."))
+            return
+        try:
+            estrategia = self._estrategias[self.estrategia_var.get()]
+            self._jogo = self.sessao.automatico(self._aposta(), parada, estrategia)
+        except ErroSessao as erro:
+            mostrar_erro(erro)
+            return
+        self._lote = 1
+        self.botao.configure(text="PARAR")
+        self._ao_alternar(True)
+        self._passo()
+
+    @staticmethod
+    def _opcional(texto: str) -> float | None:
+        return converter_valor(texto) if texto.strip() else None
+
+    def _agendar(self, atraso: int) -> None:
+        self._agendamento = self.after(atraso, self._passo)
+
+    def _passo(self) -> None:
+        self._agendamento = None
+        jogo = self._jogo
+        if jogo is None:
+            return
+        if jogo.encerrado:
+            self._jogo = None
+            self.botao.configure(text="AUTO")
+            self._ao_alternar(False)
+            return
+
+        if not self.turbo_var.get():
+            self._rodada_animada(lambda: jogo.proximo_lote(1), lambda: self._agendar(PAUSA_MS))
+            return
+
+        inicio = time.perf_counter()
+        jogo.proximo_lote(self._lote)
+        decorrido = time.perf_counter() - inicio
+        if decorrido < ORCAMENTO_TURBO_S / 2:
+            self._lote = min(self._lote * 2, LOTE_TURBO_MAXIMO)
+        elif decorrido > ORCAMENTO_TURBO_S:
+            self._lote = max(self._lote // 2, 1)
+        self._agendar(QUADRO_MS)
+
+
+__all__ = ["PainelAutomatico"]
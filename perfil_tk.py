@@ -0,0 +1,249 @@
+"""Modo de depuração das animações Tk: tempo de cada ``after`` e pilhas amostradas.
+
+As animações (``RouletteApp._executar_animacao``, ``SlotMachineApp._rotacionar``,
+o jogo automático) são cadeias de callbacks agendados com ``after``. Com o
+``PerfilTk`` ativo, ``tkinter.Misc.after`` (e portanto ``after_idle``)
+envolve cada callback e registra:
+
+* a duração dele;
+* o atraso: quanto começou depois do instante pedido;
+* o intervalo ocioso: quanto o laço principal ficou sem callbacks ``after``
+  desde o fim do anterior.
+
+Callbacks acima de ``orcamento_ms`` (um quadro a 60 Hz, por padrão) ficam
+marcados como quadros perdidos. Em paralelo, uma thread amostra a pilha da
+thread principal a cada ``intervalo_ms`` e acumula pilhas no formato
+"collapsed" (``quadro;quadro;... contagem``) aceito por ``flamegraph.pl`` e
+pelo speedscope.
+
+Desativado, nada é trocado. ``perfil_tk.py`` também abre um jogo com o perfil:
+
+Uso: ``python perfil_tk.py roleta --saida roleta.pilhas`` (ou ``hub``, ``slot``...)
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import functools
+import sys
+import threading
+import time
+import tkinter as tk
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable
+
+ORCAMENTO_PADRAO_MS = 1000 / 60
+INTERVALO_PADRAO_MS = 1.0
+QUADROS_LENTOS_GUARDADOS = 200
+FORA_DE_AFTER = "(fora de after)"
+
+
+@dataclass
+class EstatisticaCallback:
+    chamadas: int = 0
+    total_s: float = 0.0
+    maximo_s: float = 0.0
+    lentos: int = 0
+    atraso_maximo_s: float = 0.0
+
+
+@dataclass(frozen=True)
+class QuadroLento:
+    instante_s: float
+    callback: str
+    duracao_ms: float
+    atraso_ms: float
+    ocioso_ms: float
+
+
+def _rotulo(funcao: Callable[..., Any]) -> str:
+    alvo = getattr(funcao, "__func__", funcao)
+    nome = getattr(alvo, "__qualname__", None) or type(alvo).__qualname__
+    return f"{getattr(alvo, '__module__', '?')}:{nome}"
+
+
+def _quadro(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class PerfilTk:
+    """Envolve os callbacks de ``after`` e amostra a thread principal enquanto ativo."""
+
+    def __init__(self, orcamento_ms: float = ORCAMENTO_PADRAO_MS, intervalo_ms: float = INTERVALO_PADRAO_MS) -> None:
+        if orcamento_ms <= 0 or intervalo_ms <= 0:
+            raise ValueError("Orçamento e intervalo precisam ser positivos.")
+        self.orcamento_s = orcamento_ms / 1000
+        self.intervalo_s = intervalo_ms / 1000
+        self.estatisticas: dict[str, EstatisticaCallback] = collections.defaultdict(EstatisticaCallback)
+        self.quadros_lentos: collections.deque[QuadroLento] = collections.deque(maxlen=QUADROS_LENTOS_GUARDADOS)
+        self.pilhas: collections.Counter[str] = collections.Counter()
+        self.ocioso_s = 0.0
+        self.ocupado_s = 0.0
+        self._inicio = 0.0
+        self._fim_anterior: float | None = None
+        self._after_original: Callable[..., Any] | None = None
+        self._troca_original = 0.0
+        self._amostrador: threading.Thread | None = None
+        self._parar = threading.Event()
+        self._thread_principal = threading.main_thread().ident
+
+    @property
+    def ativo(self) -> bool:
+        return self._after_original is not None
+
+    def ativar(self) -> PerfilTk:
+        if self.ativo:
+            return self
+        original = self._after_original = tk.Misc.after
+        perfil = self
+
+        def after(widget: tk.Misc, ms: int | str, func: Callable[..., Any] | None = None, *args: Any) -> Any:
+            if func is None:
+                return original(widget, ms)
+            return original(widget, ms, perfil._envolver(func, ms), *args)
+
+        tk.Misc.after = after  # type: ignore[method-assign]
+        self._inicio = time.perf_counter()
+        # Sem isso a thread amostradora só pegaria o GIL a cada 5 ms.
+        self._troca_original = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._troca_original, self.intervalo_s))
+        self._parar.clear()
+        self._amostrador = threading.Thread(target=self._amostrar, name="perfil-tk", daemon=True)
+        self._amostrador.start()
+        return self
+
+    def desativar(self) -> None:
+        if self._after_original is None:
+            return
+        tk.Misc.after = self._after_original  # type: ignore[method-assign]
+        self._after_original = None
+        self._parar.set()
+        if self._amostrador is not None:
+            self._amostrador.join()
+            self._amostrador = None
+        sys.setswitchinterval(self._troca_original)
+
+    def __enter__(self) -> PerfilTk:
+        return self.ativar()
+
+    def __exit__(self, *excecao: object) -> None:
+        self.desativar()
+
+    def _envolver(self, func: Callable[..., Any], ms: int | str) -> Callable[..., Any]:
+        previsto = time.perf_counter() + (0 if ms == "idle" else int(ms) / 1000)
+        return functools.partial(self._chamar, func, _rotulo(func), previsto)
+
+    def _chamar(self, func: Callable[..., Any], rotulo: str, previsto: float, *args: Any) -> Any:
+        inicio = time.perf_counter()
+        ocioso = 0.0 if self._fim_anterior is None else max(inicio - self._fim_anterior, 0.0)
+        try:
+            return func(*args)
+        finally:
+            fim = time.perf_counter()
+            self._fim_anterior = fim
+            self._registrar(rotulo, inicio, fim - inicio, max(inicio - previsto, 0.0), ocioso)
+
+    def _registrar(self, rotulo: str, inicio: float, duracao: float, atraso: float, ocioso: float) -> None:
+        estatistica = self.estatisticas[rotulo]
+        estatistica.chamadas += 1
+        estatistica.total_s += duracao
+        estatistica.maximo_s = max(estatistica.maximo_s, duracao)
+        estatistica.atraso_maximo_s = max(estatistica.atraso_maximo_s, atraso)
+        self.ocupado_s += duracao
+        self.ocioso_s += ocioso
+        if duracao > self.orcamento_s:
+            estatistica.lentos += 1
+            self.quadros_lentos.append(
+                QuadroLento(inicio - self._inicio, rotulo, duracao * 1000, atraso * 1000, ocioso * 1000)
+            )
+
+    def _amostrar(self) -> None:
+        while not self._parar.wait(self.intervalo_s):
+            frame = sys._current_frames().get(self._thread_principal)  # type: ignore[arg-type]
+            if frame is not None:
+                self.pilhas[self._colapsar(frame)] += 1
+
+    def _colapsar(self, frame: FrameType | None) -> str:
+        quadros = []
+        dentro_de_after = False
+        while frame is not None:
+            if frame.f_code is _CODIGO_CHAMAR:
+                dentro_de_after = True
+            else:
+                quadros.append(_quadro(frame))
+            frame = frame.f_back
+        quadros.reverse()
+        if not dentro_de_after:
+            quadros.insert(0, FORA_DE_AFTER)
+        return ";".join(quadros)
+
+    def salvar_pilhas(self, caminho: str | Path) -> None:
+        """Grava as pilhas amostradas no formato collapsed, uma por linha."""
+        linhas = [f"{pilha} {contagem}" for pilha, contagem in self.pilhas.most_common()]
+        Path(caminho).write_text("\n".join(linhas) + "\n", encoding="utf-8")
+
+    def relatorio(self, limite: int = 15) -> str:
+        total = self.ocioso_s + self.ocupado_s
+        if not total:
+            return "nenhum callback de after executado"
+        linhas = [
+            f"orçamento {self.orcamento_s * 1000:.1f}ms; em callbacks {self.ocupado_s:.2f}s,"
+            f" ocioso entre eles {self.ocioso_s:.2f}s ({self.ocupado_s / total:.0%} ocupado)",
+            f"{'callback':60} {'chamadas':>8} {'média':>8} {'máx':>8} {'atraso':>8} {'lentos':>7}",
+        ]
+        ordenadas = sorted(self.estatisticas.items(), key=lambda item: item[1].total_s, reverse=True)
+        for rotulo, e in ordenadas[:limite]:
+            linhas.append(
+                f"{rotulo[-60:]:60} {e.chamadas:8d} {e.total_s / e.chamadas * 1000:6.2f}ms"
+                f" {e.maximo_s * 1000:6.2f}ms {e.atraso_maximo_s * 1000:6.1f}ms {e.lentos:7d}"
+            )
+        if self.quadros_lentos:
+            linhas.append("quadros acima do orçamento (mais recentes):")
+            for quadro in list(self.quadros_lentos)[-limite:]:
+                linhas.append(
+                    f"  {quadro.instante_s:8.3f}s {quadro.callback}: {quadro.duracao_ms:.1f}ms"
+                    f" (atraso {quadro.atraso_ms:.1f}ms, ocioso antes {quadro.ocioso_ms:.1f}ms)"
+                )
+        return "\n".join(linhas)
+
+
+_CODIGO_CHAMAR = PerfilTk._chamar.__code__
+
+
+def _abrir(alvo: str) -> None:
+    if alvo == "hub":
+        from hub import run_app
+
+        run_app()
+        return
+    from registro import obter_jogo
+
+    raiz = tk.Tk()
+    obter_jogo(alvo).carregar_interface()(raiz)
+    raiz.mainloop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Abre o hub ou um jogo com o perfil dos callbacks Tk.")
+    parser.add_argument("alvo", nargs="?", default="hub", help="hub ou a chave de um jogo (cara, roleta, slot, truco)")
+    parser.add_argument("--saida", type=Path, default=Path("perfil_tk.pilhas"))
+    parser.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_PADRAO_MS)
+    parser.add_argument("--intervalo-ms", type=float, default=INTERVALO_PADRAO_MS)
+    args = parser.parse_args()
+
+    perfil = PerfilTk(args.orcamento_ms, args.intervalo_ms)
+    with perfil:
+        _abrir(args.alvo)
+    perfil.salvar_pilhas(args.saida)
+    print(perfil.relatorio())
+    print(f"pilhas em {args.saida}")
+
+
+__all__ = ["EstatisticaCallback", "PerfilTk", "QuadroLento"]
+
+
+if __name__ == "__main__":
+    main()
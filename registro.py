@@ -0,0 +1,171 @@
+"""Registro dos jogos disponíveis no hub.
+
+Cada jogo é descrito por um ``JogoInfo`` com metadados e referências
+``"módulo:atributo"`` para o motor, para a janela e para a sessão sem
+interface. As referências só são importadas quando alguém pede uma delas,
+então montar o hub não carrega código de jogo algum.
+
+Jogos externos entram pelo grupo de entry points ``arcade_apostas.jogos``,
+apontando para um ``JogoInfo`` definido num módulo leve::
+
+    [project.entry-points."arcade_apostas.jogos"]
+    blackjack = "meu_pacote.registro:BLACKJACK"
+
+A varredura de entry points (e o import de ``importlib.metadata``) só
+acontece quando o ``sys.path`` muda; o resultado fica salvo em disco junto
+com a impressão digital dos diretórios do ``sys.path``.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import os
+import sys
+import warnings
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+GRUPO_ENTRY_POINTS = "arcade_apostas.jogos"
+CAMINHO_CACHE = Path.home() / ".arcade_apostas" / "jogos.json"
+
+
+@functools.cache
+def importar_referencia(referencia: str) -> Any:
+    """Resolve ``"módulo:atributo"`` uma única vez por processo."""
+    modulo, _, atributo = referencia.partition(":")
+    return getattr(importlib.import_module(modulo), atributo)
+
+
+@dataclass(frozen=True)
+class JogoInfo:
+    """Metadados de um jogo e onde encontrar seu motor, sua janela e sua sessão."""
+
+    chave: str
+    nome: str
+    icone: str
+    motor: str
+    interface: str
+    ordem: int = 100
+    sessao: str = ""
+
+    def carregar_motor(self) -> Any:
+        return importar_referencia(self.motor)
+
+    def carregar_interface(self) -> Any:
+        return importar_referencia(self.interface)
+
+    def carregar_sessao(self) -> Any:
+        if not self.sessao:
+            raise LookupError(f"Jogo {self.chave!r} não oferece sessão sem interface.")
+        return importar_referencia(self.sessao)
+
+
+JOGOS_EMBUTIDOS: tuple[JogoInfo, ...] = (
+    JogoInfo(
+        "cara",
+        "Cara ou Coroa",
+        "🪙",
+        "CaraOuCoroa.game:CoinGame",
+        "CaraOuCoroa.gui:CoinGameApp",
+        10,
+        "CaraOuCoroa.sessao:SessaoCara",
+    ),
+    JogoInfo(
+        "roleta", "Roleta", "🎡", "Roleta.game:RouletteGame", "Roleta.gui:RouletteApp", 20, "Roleta.sessao:SessaoRoleta"
+    ),
+    JogoInfo(
+        "slot",
+        "Caça-Níquel",
+        "🎰",
+        "CacaNiquel.game:SlotMachine",
+        "CacaNiquel.gui:SlotMachineApp",
+        30,
+        "CacaNiquel.sessao:SessaoSlot",
+    ),
+    JogoInfo("truco", "Truco", "🃏", "Truco.game:TrucoGame", "Truco.gui:TrucoApp", 40, "Truco.sessao:SessaoTruco"),
+)
+
+
+@functools.cache
+def descobrir_jogos(caminho_cache: Path | None = CAMINHO_CACHE) -> tuple[JogoInfo, ...]:
+    """Jogos embutidos mais os de plugins, ordenados por ``ordem``.
+
+    O resultado fica em cache no processo e em ``caminho_cache``; chame
+    ``descobrir_jogos.cache_clear()`` para procurar plugins novamente. Chaves
+    repetidas são ignoradas com um aviso.
+    """
+    jogos = {info.chave: info for info in JOGOS_EMBUTIDOS}
+    for info in _plugins(caminho_cache):
+        if info.chave in jogos:
+            warnings.warn(f"Jogo {info.chave!r} já registrado; plugin ignorado.", RuntimeWarning, stacklevel=2)
+            continue
+        jogos[info.chave] = info
+    return tuple(sorted(jogos.values(), key=lambda info: (info.ordem, info.nome)))
+
+
+def _impressao_sys_path() -> list[list[Any]]:
+    impressao = []
+    for entrada in sys.path:
+        try:
+            impressao.append([entrada, os.stat(entrada or ".").st_mtime_ns])
+        except OSError:
+            impressao.append([entrada, None])
+    return impressao
+
+
+def _plugins(caminho_cache: Path | None) -> list[JogoInfo]:
+    impressao = _impressao_sys_path()
+    if caminho_cache is not None:
+        try:
+            dados = json.loads(caminho_cache.read_text(encoding="utf-8"))
+            if dados["impressao"] == impressao:
+                return [JogoInfo(**campos) for campos in dados["plugins"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    plugins = _varrer_entry_points()
+    if caminho_cache is not None:
+        try:
+            caminho_cache.parent.mkdir(parents=True, exist_ok=True)
+            conteudo = {"impressao": impressao, "plugins": [asdict(info) for info in plugins]}
+            caminho_cache.write_text(json.dumps(conteudo), encoding="utf-8")
+        except OSError:
+            pass
+    return plugins
+
+
+def _varrer_entry_points() -> list[JogoInfo]:
+    from importlib.metadata import entry_points
+
+    plugins = []
+    for ponto in entry_points(group=GRUPO_ENTRY_POINTS):
+        try:
+            info = ponto.load()
+        except Exception as exc:  # plugin quebrado não pode derrubar o hub
+            warnings.warn(f"Plugin de jogo {ponto.name!r} não carregou: {exc}", RuntimeWarning, stacklevel=3)
+            continue
+        if not isinstance(info, JogoInfo):
+            warnings.warn(f"Plugin de jogo {ponto.name!r} não é um JogoInfo.", RuntimeWarning, stacklevel=3)
+            continue
+        plugins.append(info)
+    return plugins
+
+
+def obter_jogo(chave: str) -> JogoInfo:
+    for info in descobrir_jogos():
+        if info.chave == chave:
+            return info
+    raise KeyError(f"Jogo {chave!r} não registrado.")
+
+
+__all__ = [
+    "GRUPO_ENTRY_POINTS",
+    "JOGOS_EMBUTIDOS",
+    "JogoInfo",
+    "descobrir_jogos",
+    "importar_referencia",
+    "obter_jogo",
+]
@@ -0,0 +1,298 @@
+"""Gravação e reprodução exata de sessões dos motores, para auditoria.
+
+``Gravador.gravar`` dá ao motor um ``random.Random`` com semente nova e
+troca, só naquela instância, os métodos que mudam o estado (``jogar``,
+``girar``, ``jogar_carta``...) por versões que anotam cada chamada e o
+``repr`` do resultado. Atributos que a sessão troca entre rodadas (tabela,
+linhas do caça-níquel, saldo do Truco) entram no registro como ações
+``definir`` quando mudam, com a tabela identificada pelo hash. Prêmios de
+jackpot dependem do fundo compartilhado, não da semente, e são gravados à
+parte para a reprodução pagar os mesmos valores. Um motor que já sorteia
+com um ``justo.GeradorJusto`` fica com ele: a gravação guarda a semente do
+servidor, a do cliente e o nonce de partida.
+
+``reproduzir`` refaz a gravação num motor novo, sem interface, e devolve a
+primeira ``Divergencia`` entre resultados ou no saldo final (``None`` se
+tudo bate). ``verificar_arquivo`` confere um arquivo inteiro, uma gravação
+JSON por linha, repartindo as linhas num ``ProcessPoolExecutor``.
+
+Uso: ``python reproducao.py gravacoes.jsonl --processos 8``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import tabelas
+from dinheiro import Centavos, para_centavos
+from registro import importar_referencia
+
+# Por jogo: o motor, os métodos que mudam o estado e os atributos que a sessão troca por fora.
+MOTORES: dict[str, tuple[str, tuple[str, ...], tuple[str, ...]]] = {
+    "cara": ("CaraOuCoroa.game:CoinGame", ("jogar", "jogar_lote"), ()),
+    "roleta": ("Roleta.game:RouletteGame", ("girar", "girar_lote"), ("tabela",)),
+    "slot": ("CacaNiquel.game:SlotMachine", ("girar", "girar_lote"), ("tabela", "linhas")),
+    "truco": (
+        "Truco.game:TrucoGame",
+        ("iniciar_partida", "pedir_truco", "jogar_carta", "reiniciar_partida"),
+        ("tabela", "saldo"),
+    ),
+}
+DEFINIR = "definir"
+PEDACO_PADRAO = 32
+
+
+@dataclass
+class Gravacao:
+    """Semente, saldo inicial e ações de um motor, com o resultado de cada uma.
+
+    ``acoes`` e ``resultados`` andam juntos; cada ação guarda o método, os
+    argumentos posicionais e os nomeados, e ações ``definir`` têm resultado
+    vazio. ``jackpots`` é ``None`` quando o motor jogou sem jackpot. No modo
+    justo, ``semente`` é a do servidor em hexadecimal e ``justo`` traz a
+    semente do cliente e o nonce antes da primeira ação.
+    """
+
+    jogo: str
+    semente: int | str
+    saldo_inicial: Centavos
+    jogador: str = ""
+    acoes: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = field(default_factory=list)
+    resultados: list[str] = field(default_factory=list)
+    jackpots: list[Centavos] | None = None
+    saldo_final: Centavos = 0
+    justo: tuple[str, int] | None = None
+
+    def para_json(self) -> str:
+        return json.dumps(
+            {
+                "jogo": self.jogo,
+                "jogador": self.jogador,
+                "semente": self.semente,
+                "saldo_inicial": self.saldo_inicial,
+                # Sem argumentos nomeados a ação fica ``[metodo, args]``, como nas gravações antigas.
+                "acoes": [acao if acao[2] else acao[:2] for acao in self.acoes],
+                "resultados": self.resultados,
+                "jackpots": self.jackpots,
+                "saldo_final": self.saldo_final,
+                "justo": self.justo,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def de_json(cls, linha: str | bytes) -> Gravacao:
+        dados = json.loads(linha)
+        return cls(
+            dados["jogo"],
+            dados["semente"],
+            dados["saldo_inicial"],
+            dados.get("jogador", ""),
+            [(metodo, tuple(args), nomeados[0] if nomeados else {}) for metodo, args, *nomeados in dados["acoes"]],
+            dados["resultados"],
+            dados.get("jackpots"),
+            dados["saldo_final"],
+            tuple(dados["justo"]) if dados.get("justo") else None,  # type: ignore[arg-type]
+        )
+
+
+@dataclass(frozen=True)
+class Divergencia:
+    """Primeira ação (ou o saldo final) em que a reprodução não bateu com a gravação."""
+
+    acao: int
+    metodo: str
+    esperado: str
+    obtido: str
+
+    def __str__(self) -> str:
+        return f"ação {self.acao} ({self.metodo}): gravado {self.esperado}, reproduzido {self.obtido}"
+
+
+def _valor_gravado(atributo: str, valor: Any) -> Any:
+    return valor.hash if atributo == "tabela" else valor
+
+
+def _gravando(
+    motor: Any,
+    gravacao: Gravacao,
+    nome: str,
+    metodo: Callable[..., Any],
+    atributos: tuple[str, ...],
+    vistos: dict[str, Any],
+) -> Callable[..., Any]:
+    acoes, resultados = gravacao.acoes, gravacao.resultados
+
+    def gravado(*args: Any, **kwargs: Any) -> Any:
+        for atributo in atributos:
+            valor = _valor_gravado(atributo, getattr(motor, atributo))
+            if vistos.get(atributo, vistos) != valor:
+                acoes.append((DEFINIR, (atributo, valor), {}))
+                resultados.append("")
+        resultado = metodo(*args, **kwargs)
+        acoes.append((nome, args, kwargs))
+        resultados.append(repr(resultado))
+        premio = getattr(resultado, "jackpot", 0)
+        if premio:
+            assert gravacao.jackpots is not None
+            gravacao.jackpots.append(para_centavos(premio))
+        # As próprias ações mudam o saldo; só o que mudar por fora até a próxima vira ``definir``.
+        for atributo in atributos:
+            vistos[atributo] = _valor_gravado(atributo, getattr(motor, atributo))
+        gravacao.saldo_final = motor.saldo_centavos
+        return resultado
+
+    return gravado
+
+
+class Gravador:
+    """Grava os motores das sessões; com ``caminho``, cada gravação concluída vira uma linha do arquivo."""
+
+    def __init__(self, caminho: str | os.PathLike[str] | None = None) -> None:
+        self.caminho = caminho
+        self.concluidas: list[Gravacao] = []
+        self._trava = threading.Lock()
+
+    def gravar(self, jogo: str, motor: Any, jogador: str = "") -> Gravacao:
+        """Semeia ``motor`` e passa a anotar as ações dele na gravação devolvida."""
+        from justo import GeradorJusto
+
+        _, metodos, atributos = MOTORES[jogo]
+        gravacao = Gravacao(jogo, 0, motor.saldo_centavos, jogador, saldo_final=motor.saldo_centavos)
+        if isinstance(motor.rng, GeradorJusto):
+            gravacao.semente = motor.rng.semente_servidor.hex()
+            gravacao.justo = (motor.rng.semente_cliente, motor.rng.nonce)
+        else:
+            gravacao.semente = int.from_bytes(os.urandom(8), "big")
+            motor.rng = random.Random(gravacao.semente)
+        if getattr(motor, "jackpot", None) is not None:
+            gravacao.jackpots = []
+        vistos: dict[str, Any] = {}
+        for nome in metodos:
+            setattr(motor, nome, _gravando(motor, gravacao, nome, getattr(motor, nome), atributos, vistos))
+        return gravacao
+
+    def concluir(self, gravacao: Gravacao) -> None:
+        """Guarda a gravação de um motor que a sessão deixou de usar; sem ações, descarta."""
+        if not gravacao.acoes:
+            return
+        with self._trava:
+            if self.caminho is None:
+                self.concluidas.append(gravacao)
+                return
+            with open(self.caminho, "a", encoding="utf-8") as arquivo:
+                arquivo.write(gravacao.para_json() + "\n")
+
+
+class _JackpotGravado:
+    """Fundo que paga, em ordem, os prêmios gravados; as contribuições não mudam o jogador."""
+
+    def __init__(self, premios: Iterable[Centavos]) -> None:
+        self._premios = iter(premios)
+
+    def contribuir(self, fracoes: int) -> None:
+        pass
+
+    def premiar(self) -> Centavos:
+        return next(self._premios)
+
+
+def reproduzir(gravacao: Gravacao) -> Divergencia | None:
+    """Refaz ``gravacao`` num motor novo com a mesma semente; ``None`` se tudo bate."""
+    referencia, _, _ = MOTORES[gravacao.jogo]
+    motor = importar_referencia(referencia)(gravacao.saldo_inicial / 100)
+    if gravacao.justo is not None:
+        from justo import GeradorJusto, aplicar
+
+        cliente, nonce = gravacao.justo
+        aplicar(gravacao.jogo, motor, GeradorJusto(bytes.fromhex(str(gravacao.semente)), cliente, nonce))
+    else:
+        motor.rng = random.Random(gravacao.semente)
+    if gravacao.jackpots is not None:
+        motor.jackpot = _JackpotGravado(gravacao.jackpots)
+    for numero, ((metodo, args, kwargs), esperado) in enumerate(zip(gravacao.acoes, gravacao.resultados)):
+        if metodo == DEFINIR:
+            atributo, valor = args
+            try:
+                setattr(motor, atributo, tabelas.por_hash(valor) if atributo == "tabela" else valor)
+            except ValueError as erro:  # tabela desconhecida ou valor que o motor recusa
+                return Divergencia(numero, f"{DEFINIR} {atributo}", repr(valor), f"{type(erro).__name__}: {erro}")
+            continue
+        try:
+            obtido = repr(getattr(motor, metodo)(*args, **kwargs))
+        except Exception as erro:  # a gravação só tem ações que deram certo
+            obtido = f"{type(erro).__name__}: {erro}"
+        if obtido != esperado:
+            return Divergencia(numero, metodo, esperado, obtido)
+    if motor.saldo_centavos != gravacao.saldo_final:
+        return Divergencia(len(gravacao.acoes), "saldo", str(gravacao.saldo_final), str(motor.saldo_centavos))
+    return None
+
+
+def _verificar_linha(linha: str) -> Divergencia | None:
+    return reproduzir(Gravacao.de_json(linha))
+
+
+def _carregar_tabelas(caminhos: tuple[str, ...]) -> None:
+    for caminho in caminhos:
+        tabelas.carregar(caminho)
+
+
+def verificar_arquivo(
+    caminho: str | os.PathLike[str],
+    processos: int | None = None,
+    tabelas_extras: Iterable[str] = (),
+    pedaco: int = PEDACO_PADRAO,
+) -> tuple[int, list[tuple[int, Divergencia]]]:
+    """Reproduz todas as gravações do arquivo; devolve quantas e as divergências por número de linha.
+
+    Com ``processos`` 1 tudo roda aqui; senão as linhas vão a um
+    ``ProcessPoolExecutor`` em pedaços de ``pedaco``. ``tabelas_extras`` são
+    arquivos de tabela fora de ``tabelas/`` usados nas gravações.
+    """
+    extras = tuple(map(str, tabelas_extras))
+    with open(caminho, encoding="utf-8") as arquivo:
+        linhas = [linha for linha in arquivo if linha.strip()]
+    if processos == 1:
+        _carregar_tabelas(extras)
+        conferidas: Iterable[Divergencia | None] = map(_verificar_linha, linhas)
+        divergencias = [(numero, d) for numero, d in enumerate(conferidas, 1) if d is not None]
+        return len(linhas), divergencias
+    with ProcessPoolExecutor(processos, initializer=_carregar_tabelas, initargs=(extras,)) as grupo:
+        conferidas = grupo.map(_verificar_linha, linhas, chunksize=pedaco)
+        divergencias = [(numero, d) for numero, d in enumerate(conferidas, 1) if d is not None]
+    return len(linhas), divergencias
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reproduz sessões gravadas e confere resultados e saldos.")
+    parser.add_argument("arquivos", nargs="+", help="arquivos com uma gravação JSON por linha")
+    parser.add_argument("--processos", type=int, help="1 verifica sem processos auxiliares (padrão: um por CPU)")
+    parser.add_argument(
+        "--tabela", action="append", default=[], help="tabela de fora de tabelas/ usada nas gravações"
+    )
+    args = parser.parse_args()
+
+    falhas = 0
+    for caminho in args.arquivos:
+        total, divergencias = verificar_arquivo(caminho, args.processos, args.tabela)
+        for numero, divergencia in divergencias:
+            print(f"{caminho}:{numero}: {divergencia}")
+        print(f"{caminho}: {total} gravações, {len(divergencias)} divergentes")
+        falhas += len(divergencias)
+    sys.exit(1 if falhas else 0)
+
+
+__all__ = ["Divergencia", "Gravacao", "Gravador", "reproduzir", "verificar_arquivo"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""Servidor asyncio que expõe as sessões dos jogos por um socket local.
+
+O protocolo é JSON em linhas: cada requisição é um objeto em uma linha e
+recebe exatamente uma resposta, na mesma ordem, com o mesmo ``id``::
+
+    {"id": 1, "op": "carteira", "jogador": "ana", "depositar": 100}
+    {"id": 2, "op": "abrir", "jogo": "cara", "jogador": "ana"}
+    {"id": 3, "op": "acao", "sessao": 1, "acao": "iniciar"}
+    {"id": 4, "op": "acao", "sessao": 1, "acao": "apostar", "args": ["cara", 10]}
+    {"id": 5, "op": "fechar", "sessao": 1}
+
+No modo justo, ``{"op": "justo", "sessao": 1, "semente_cliente": "abc"}``,
+antes de ``iniciar``, devolve o ``compromisso`` da semente do servidor;
+``{"op": "revelar", "sessao": 1}`` devolve a ``revelacao`` dessa semente
+(para conferir as rodadas com ``justo``) e o ``compromisso`` da seguinte.
+
+Respostas trazem ``"ok": true`` e a ``tela`` da sessão, ou ``"ok": false``
+e um ``erro`` com título e mensagem. Cada conexão pode manter várias
+sessões; todas as sessões de um mesmo jogador usam a mesma carteira,
+guardada num único ``CarteiraService`` do servidor. Cada aposta é reservada
+nessa carteira antes de o motor sortear, então sessões paralelas não
+apostam o mesmo saldo: a que a carteira não cobre recebe erro.
+
+Contrapressão: a conexão só lê a próxima linha depois de responder à
+anterior e espera ``drain`` quando o buffer de saída passa do limite, então
+um cliente que não lê as respostas deixa de ser lido. Linhas longas demais
+encerram a conexão e há limites de sessões por conexão e no servidor.
+
+Com ``--metricas-porta`` (ou ``--metricas-arquivo``) os motores e a carteira
+são instrumentados por ``metricas`` e as medidas ficam em ``/metrics``
+(ou são gravadas no arquivo a cada ``INTERVALO_METRICAS_S``). Com
+``--monitor-rtp`` as rodadas de todas as sessões alimentam um ``MonitorRTP``:
+alertas de desvio saem na hora na saída de erro e a tabela de RTP por janela
+a cada ``INTERVALO_MONITOR_S``. Com ``--gravacoes`` cada motor das sessões
+joga com semente gravada, e o arquivo recebe uma linha por sessão encerrada
+para ``reproducao`` conferir depois.
+
+Uso: ``python servidor.py --porta 8765`` ou ``python servidor.py --unix /tmp/arcade.sock``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import math
+import os
+import socket
+import sys
+import traceback
+from typing import TYPE_CHECKING, Any
+
+from carteira import CarteiraService, Wallet
+from registro import obter_jogo
+from sessao import ErroSessao, Sessao
+
+if TYPE_CHECKING:
+    from historico import HistoricoStore
+    from monitor_rtp import MonitorRTP
+    from reproducao import Gravador
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+LIMITE_LINHA = 64 * 1024
+LIMITE_BUFFER_SAIDA = 256 * 1024
+SESSOES_POR_CONEXAO = 1024
+SESSOES_NO_SERVIDOR = 20_000
+INTERVALO_METRICAS_S = 10.0
+INTERVALO_MONITOR_S = 60.0
+
+
+def _serializar(valor: Any) -> Any:
+    if dataclasses.is_dataclass(valor) and not isinstance(valor, type):
+        return dataclasses.asdict(valor)
+    return valor
+
+
+class _Conexao:
+    """Sessões abertas por um cliente, numeradas a partir de 1."""
+
+    __slots__ = ("sessoes", "proximo_id")
+
+    def __init__(self) -> None:
+        self.sessoes: dict[int, Sessao[Any, Any]] = {}
+        self.proximo_id = 1
+
+
+class Servidor:
+    """Atende clientes JSON em linhas com uma sessão por jogo aberto."""
+
+    def __init__(
+        self,
+        servico: CarteiraService | None = None,
+        historico: HistoricoStore | None = None,
+        sessoes_por_conexao: int = SESSOES_POR_CONEXAO,
+        sessoes_no_servidor: int = SESSOES_NO_SERVIDOR,
+        monitor: MonitorRTP | None = None,
+        gravador: Gravador | None = None,
+    ) -> None:
+        self.servico = servico if servico is not None else CarteiraService()
+        self.historico = historico
+        self.monitor = monitor
+        self.gravador = gravador
+        self.sessoes_por_conexao = sessoes_por_conexao
+        self.sessoes_no_servidor = sessoes_no_servidor
+        self.sessoes_abertas = 0
+        self._carteiras: dict[str, Wallet] = {}
+        self._operacoes = {
+            "ping": self._ping,
+            "carteira": self._carteira,
+            "abrir": self._abrir,
+            "acao": self._acao,
+            "fechar": self._fechar,
+            "justo": self._justo,
+            "revelar": self._revelar,
+        }
+
+    async def iniciar(self, host: str = HOST_PADRAO, porta: int = PORTA_PADRAO) -> asyncio.Server:
+        return await asyncio.start_server(self.atender, host, porta, limit=LIMITE_LINHA)
+
+    async def iniciar_unix(self, caminho: str) -> asyncio.Server:
+        return await asyncio.start_unix_server(self.atender, caminho, limit=LIMITE_LINHA)
+
+    async def iniciar_socket(self, escuta: socket.socket) -> asyncio.Server:
+        """Atende num socket já em escuta (por exemplo, um de vários com ``SO_REUSEPORT``)."""
+        return await asyncio.start_server(self.atender, sock=escuta, limit=LIMITE_LINHA)
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Laço de uma conexão: lê, responde e só segue quando o cliente acompanha."""
+        escritor.transport.set_write_buffer_limits(high=LIMITE_BUFFER_SAIDA)
+        conexao = _Conexao()
+        try:
+            while True:
+                try:
+                    linha = await leitor.readline()
+                except ValueError:
+                    escritor.write(self._resposta_erro(None, "Requisição", "Linha longa demais."))
+                    break
+                if not linha:
+                    break
+                escritor.write(self.responder(conexao, linha))
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._encerrar(conexao)
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    def responder(self, conexao: _Conexao, linha: bytes) -> bytes:
+        """Processa uma linha de requisição e devolve a linha de resposta."""
+        id_pedido = None
+        try:
+            pedido = json.loads(linha)
+            id_pedido = pedido.get("id")
+            operacao = self._operacoes[pedido["op"]]
+        except (ValueError, AttributeError):
+            return self._resposta_erro(None, "Requisição", "JSON inválido.")
+        except (KeyError, TypeError):
+            return self._resposta_erro(id_pedido, "Requisição", "Operação desconhecida.")
+        try:
+            corpo = operacao(conexao, pedido)
+        except ErroSessao as exc:
+            return self._resposta_erro(id_pedido, exc.titulo, exc.mensagem, exc.aviso)
+        except (KeyError, TypeError, ValueError, LookupError, ArithmeticError) as exc:
+            return self._resposta_erro(id_pedido, "Requisição", str(exc))
+        except Exception:
+            # Uma falha inesperada derruba só o pedido: a conexão e as outras sessões seguem de pé.
+            print(f"ERRO ao processar a operação {pedido['op']!r}:", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return self._resposta_erro(id_pedido, "Servidor", "Erro interno ao processar a requisição.")
+        corpo["id"] = id_pedido
+        corpo["ok"] = True
+        return json.dumps(corpo, ensure_ascii=False, default=_serializar).encode() + b"\n"
+
+    def _resposta_erro(self, id_pedido: Any, titulo: str, mensagem: str, aviso: bool = False) -> bytes:
+        corpo = {"id": id_pedido, "ok": False, "erro": {"titulo": titulo, "mensagem": mensagem, "aviso": aviso}}
+        return json.dumps(corpo, ensure_ascii=False).encode() + b"\n"
+
+    def _encerrar(self, conexao: _Conexao) -> None:
+        for sessao in conexao.sessoes.values():
+            sessao.resetar()
+        self.sessoes_abertas -= len(conexao.sessoes)
+        conexao.sessoes.clear()
+
+    def _sessao(self, conexao: _Conexao, pedido: dict[str, Any]) -> Sessao[Any, Any]:
+        try:
+            return conexao.sessoes[pedido["sessao"]]
+        except KeyError:
+            raise ErroSessao("Sessão", "Sessão inexistente nesta conexão.") from None
+
+    def _obter_carteira(self, jogador: str) -> Wallet:
+        """Carteira do jogador, inclusive contas abertas por outro processo no mesmo serviço."""
+        carteira = self._carteiras.get(jogador)
+        if carteira is None:
+            if not self.servico.possui_conta(jogador):
+                raise ErroSessao("Carteira", "Jogador sem carteira; faça um depósito para criá-la.", aviso=True)
+            carteira = self._carteiras[jogador] = Wallet.da_conta(self.servico, jogador)
+        return carteira
+
+    def _ping(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        return {}
+
+    def _carteira(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        """Consulta a carteira do jogador, depositando ``depositar`` se vier; cria na primeira vez."""
+        jogador = str(pedido["jogador"])
+        deposito = float(pedido.get("depositar", 0))
+        if not math.isfinite(deposito):
+            raise ErroSessao("Carteira", "Informe um número válido para o depósito.")
+        try:
+            carteira = self._obter_carteira(jogador)
+        except ErroSessao:
+            if deposito <= 0:
+                raise
+            try:
+                carteira = self._carteiras[jogador] = Wallet(deposito, self.servico, conta=jogador)
+                return {"saldo": carteira.saldo}
+            except ValueError:  # outro processo abriu a conta primeiro
+                carteira = self._obter_carteira(jogador)
+        if deposito:
+            carteira.depositar(deposito)
+        return {"saldo": carteira.saldo}
+
+    def _abrir(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        if len(conexao.sessoes) >= self.sessoes_por_conexao or self.sessoes_abertas >= self.sessoes_no_servidor:
+            raise ErroSessao("Servidor cheio", "Limite de sessões atingido; tente novamente mais tarde.", aviso=True)
+        classe = obter_jogo(str(pedido["jogo"])).carregar_sessao()
+        jogador = pedido.get("jogador")
+        carteira = self._obter_carteira(str(jogador)) if jogador is not None else None
+        sessao = classe(carteira, self.historico, str(jogador or "avulso"), self.monitor, self.gravador)
+        id_sessao = conexao.proximo_id
+        conexao.proximo_id += 1
+        conexao.sessoes[id_sessao] = sessao
+        self.sessoes_abertas += 1
+        return {"sessao": id_sessao, "tela": sessao.tela()}
+
+    def _acao(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        sessao = self._sessao(conexao, pedido)
+        acao = pedido["acao"]
+        if acao not in sessao.ACOES:
+            raise ErroSessao("Ação", f"Ação {acao!r} não disponível em {sessao.jogo}.")
+        retorno = getattr(sessao, acao)(*pedido.get("args", ()))
+        return {"tela": sessao.tela(), "retorno": retorno}
+
+    def _justo(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        sessao = self._sessao(conexao, pedido)
+        compromisso = sessao.ativar_justo(str(pedido.get("semente_cliente", "")))
+        return {"compromisso": compromisso, "tela": sessao.tela()}
+
+    def _revelar(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        sessao = self._sessao(conexao, pedido)
+        revelacao = sessao.revelar()
+        assert sessao.gerador_justo is not None
+        return {"revelacao": revelacao, "compromisso": sessao.gerador_justo.compromisso, "tela": sessao.tela()}
+
+    def _fechar(self, conexao: _Conexao, pedido: dict[str, Any]) -> dict[str, Any]:
+        sessao = self._sessao(conexao, pedido)
+        carteira = sessao.carteira
+        sessao.resetar()
+        del conexao.sessoes[pedido["sessao"]]
+        self.sessoes_abertas -= 1
+        return {"saldo": carteira.saldo if carteira else None}
+
+
+class Cliente:
+    """Cliente do protocolo com várias requisições em voo na mesma conexão.
+
+    As respostas chegam na ordem dos pedidos, então basta uma fila de
+    futuros; ``pedir`` devolve o corpo da resposta (com ``ok`` e ``erro``).
+    """
+
+    def __init__(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        self._leitor = leitor
+        self._escritor = escritor
+        self._pendentes: asyncio.Queue[asyncio.Future[dict[str, Any]]] = asyncio.Queue()
+        self._proximo_id = 1
+        self._recebendo = asyncio.create_task(self._receber())
+
+    @classmethod
+    async def conectar(cls, host: str = HOST_PADRAO, porta: int = PORTA_PADRAO) -> Cliente:
+        return cls(*await asyncio.open_connection(host, porta, limit=LIMITE_LINHA))
+
+    @classmethod
+    async def conectar_unix(cls, caminho: str) -> Cliente:
+        return cls(*await asyncio.open_unix_connection(caminho, limit=LIMITE_LINHA))
+
+    async def pedir(self, op: str, **campos: Any) -> dict[str, Any]:
+        futuro: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        campos["id"] = self._proximo_id
+        campos["op"] = op
+        self._proximo_id += 1
+        self._pendentes.put_nowait(futuro)
+        self._escritor.write(json.dumps(campos).encode() + b"\n")
+        await self._escritor.drain()
+        return await futuro
+
+    async def fechar(self) -> None:
+        self._escritor.close()
+        try:
+            await self._escritor.wait_closed()
+        except ConnectionError:
+            pass
+        self._recebendo.cancel()
+
+    async def _receber(self) -> None:
+        try:
+            while linha := await self._leitor.readline():
+                futuro = self._pendentes.get_nowait()
+                if not futuro.done():
+                    futuro.set_result(json.loads(linha))
+        except ConnectionError:
+            pass
+        finally:
+            while not self._pendentes.empty():
+                futuro = self._pendentes.get_nowait()
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("Conexão com o servidor encerrada."))
+
+
+async def _gravar_metricas(caminho: str) -> None:
+    import metricas
+
+    registro = metricas.ativar()
+    try:
+        while True:
+            await asyncio.sleep(INTERVALO_METRICAS_S)
+            registro.salvar(caminho)
+    finally:
+        registro.salvar(caminho)
+
+
+async def _relatar_rtp(monitor: MonitorRTP) -> None:
+    while True:
+        await asyncio.sleep(INTERVALO_MONITOR_S)
+        print(monitor.relatorio(), flush=True)
+
+
+async def _servir(args: argparse.Namespace) -> None:
+    monitor = None
+    tarefas = []
+    if args.monitor_rtp:
+        from monitor_rtp import MonitorRTP
+
+        monitor = MonitorRTP()
+        monitor.assinar(lambda alerta: print(f"ALERTA {alerta}", file=sys.stderr, flush=True))
+        tarefas.append(asyncio.create_task(_relatar_rtp(monitor)))
+    gravador = None
+    if args.gravacoes:
+        from reproducao import Gravador
+
+        gravador = Gravador(args.gravacoes)
+    servidor = Servidor(monitor=monitor, gravador=gravador)
+    if args.unix:
+        if os.path.exists(args.unix):
+            os.unlink(args.unix)
+        rede = await servidor.iniciar_unix(args.unix)
+        print(f"Ouvindo em {args.unix}", flush=True)
+    else:
+        rede = await servidor.iniciar(args.host, args.porta)
+        host, porta = rede.sockets[0].getsockname()[:2]
+        print(f"Ouvindo em {host}:{porta}", flush=True)
+    if args.metricas_porta is not None:
+        import metricas
+
+        http = metricas.ativar().servir(args.host, args.metricas_porta)
+        host, porta = http.server_address[:2]
+        print(f"Métricas em http://{host}:{porta}/metrics", flush=True)
+    if args.metricas_arquivo:
+        tarefas.append(asyncio.create_task(_gravar_metricas(args.metricas_arquivo)))
+    async with rede:
+        try:
+            await rede.serve_forever()
+        finally:
+            for tarefa in tarefas:
+                tarefa.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor de sessões dos jogos (JSON em linhas).")
+    parser.add_argument("--host", default=HOST_PADRAO)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help="0 escolhe uma porta livre")
+    parser.add_argument("--unix", help="caminho de um socket Unix em vez de TCP")
+    parser.add_argument("--metricas-porta", type=int, help="publica /metrics nesta porta (0 escolhe uma livre)")
+    parser.add_argument("--metricas-arquivo", help="grava as métricas neste arquivo periodicamente")
+    parser.add_argument("--monitor-rtp", action="store_true", help="acompanha o RTP por jogo e alerta desvios")
+    parser.add_argument("--gravacoes", help="grava semente e ações de cada sessão neste arquivo (JSON em linhas)")
+    try:
+        asyncio.run(_servir(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["Cliente", "Servidor"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Servidor de sessões repartido em vários processos.
+
+Um único processo Python fica preso ao GIL, então o lançador cria
+``processos`` trabalhadores, cada um com seu próprio ``Servidor`` e seu laço
+asyncio. Os saldos ficam num processo à parte, o livro de contas: um
+``BaseManager`` que guarda o único ``CarteiraService`` e atende os
+trabalhadores por proxy, de modo que um jogador tem o mesmo saldo em
+qualquer processo. O jackpot do caça-níquel é uma conta desse mesmo livro,
+alimentada em lotes por cada trabalhador.
+
+Há duas formas de distribuir conexões:
+
+* ``despachante`` (padrão): o lançador aceita a conexão, lê a primeira linha
+  e entrega o socket, junto com os bytes já lidos, ao trabalhador dono do
+  fragmento de ``jogador`` (``crc32(jogador) % processos``) por
+  ``socket.send_fds``. Todas as sessões de um jogador ficam no mesmo
+  processo, se o cliente usar uma conexão por jogador e começar por um
+  pedido com ``jogador`` (``carteira`` ou ``abrir``);
+* ``reuseport``: cada trabalhador escuta na mesma porta com
+  ``SO_REUSEPORT`` e o kernel reparte as conexões, sem afinidade.
+
+Uso: ``python servidor_multiprocesso.py --processos 4 --porta 8765``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import zlib
+from multiprocessing.managers import BaseManager
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+import jackpot
+from carteira import CarteiraService
+from servidor import HOST_PADRAO, LIMITE_LINHA, PORTA_PADRAO, Servidor
+
+MODOS = ("despachante", "reuseport")
+ESPERA_PRIMEIRA_LINHA = 10.0
+
+_servico: CarteiraService | None = None
+
+
+def _servico_compartilhado() -> CarteiraService:
+    global _servico
+    if _servico is None:
+        _servico = CarteiraService()
+    return _servico
+
+
+class LivroDeContas(BaseManager):
+    """Processo que guarda o ``CarteiraService`` compartilhado."""
+
+
+LivroDeContas.register(
+    "servico",
+    callable=_servico_compartilhado,
+    exposed=(
+        "abrir_conta",
+        "possui_conta",
+        "saldo",
+        "depositar",
+        "retirar",
+        "ajustar",
+        "comparar_e_definir",
+        "transferir",
+        "reservar",
+        "confirmar_reserva",
+        "cancelar_reserva",
+        "total_reservado",
+    ),
+)
+
+
+def fragmento(jogador: str, processos: int) -> int:
+    """Índice do trabalhador que hospeda as sessões de ``jogador``."""
+    return zlib.crc32(jogador.encode()) % processos
+
+
+def _jogador_da_linha(linha: bytes) -> str:
+    try:
+        pedido = json.loads(linha)
+        return str(pedido.get("jogador", ""))
+    except (ValueError, AttributeError):
+        return ""
+
+
+def _socket_reuseport(host: str, porta: int) -> socket.socket:
+    escuta = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    escuta.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    escuta.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    escuta.bind((host, porta))
+    return escuta
+
+
+async def _atender_socket(servidor: Servidor, conexao: socket.socket, lidos: bytes) -> None:
+    """Atende uma conexão recebida do despachante, começando pelos bytes que ele já leu."""
+    loop = asyncio.get_running_loop()
+    leitor = asyncio.StreamReader(limit=LIMITE_LINHA)
+    leitor.feed_data(lidos)
+    protocolo = asyncio.StreamReaderProtocol(leitor)
+    transporte, _ = await loop.connect_accepted_socket(lambda: protocolo, conexao)
+    await servidor.atender(leitor, asyncio.StreamWriter(transporte, protocolo, leitor, loop))
+
+
+async def _receber_despachos(servidor: Servidor, canal: socket.socket) -> None:
+    loop = asyncio.get_running_loop()
+    fim = loop.create_future()
+    tarefas: set[asyncio.Task[None]] = set()
+
+    def receber() -> None:
+        try:
+            lidos, descritores, _, _ = socket.recv_fds(canal, LIMITE_LINHA + 1, 1)
+        except BlockingIOError:
+            return
+        if not descritores:  # lançador encerrado
+            if not fim.done():
+                fim.set_result(None)
+            return
+        tarefa = loop.create_task(_atender_socket(servidor, socket.socket(fileno=descritores[0]), lidos))
+        tarefas.add(tarefa)
+        tarefa.add_done_callback(tarefas.discard)
+
+    canal.setblocking(False)
+    loop.add_reader(canal, receber)
+    try:
+        await fim
+    finally:
+        # Cancelado no encerramento, o leitor não pode mais resolver ``fim``.
+        loop.remove_reader(canal)
+
+
+async def _trabalhar(
+    endereco_livro: Any, chave: bytes, modo: str, host: str, porta: int, canal: socket.socket | None
+) -> None:
+    livro = LivroDeContas(address=endereco_livro, authkey=chave)
+    livro.connect()
+    servico = livro.servico()  # type: ignore[attr-defined]
+    jackpot.configurar(servico)
+    servidor = Servidor(servico=servico)
+    try:
+        if modo == "reuseport":
+            escuta = _socket_reuseport(host, porta)
+            escuta.listen(socket.SOMAXCONN)
+            rede = await servidor.iniciar_socket(escuta)
+            async with rede:
+                await rede.serve_forever()
+        else:
+            assert canal is not None
+            await _receber_despachos(servidor, canal)
+    finally:
+        jackpot.descarregar()
+
+
+def _trabalhador(
+    endereco_livro: Any,
+    chave: bytes,
+    modo: str,
+    host: str,
+    porta: int,
+    canal: socket.socket | None,
+    herdados: list[socket.socket],
+) -> None:
+    # Pontas herdadas do lançador precisam fechar aqui, senão os canais nunca veem o fim.
+    for herdado in herdados:
+        herdado.close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_trabalhar(endereco_livro, chave, modo, host, porta, canal))
+
+
+class ServidorMultiprocesso:
+    """Lança o livro de contas e os trabalhadores; no modo despachante, despacha."""
+
+    def __init__(
+        self,
+        processos: int | None = None,
+        modo: str = "despachante",
+        host: str = HOST_PADRAO,
+        porta: int = PORTA_PADRAO,
+    ) -> None:
+        if modo not in MODOS:
+            raise ValueError(f"Modo precisa ser um de {MODOS}.")
+        self.processos = processos or os.cpu_count() or 1
+        if self.processos <= 0:
+            raise ValueError("A quantidade de processos precisa ser positiva.")
+        self.modo = modo
+        self.host = host
+        self.porta = porta
+        self.livro = LivroDeContas()
+        self._trabalhadores: list[BaseProcess] = []
+        self._canais: list[socket.socket] = []
+        self._escuta: socket.socket | None = None
+
+    def iniciar(self) -> tuple[str, int]:
+        """Sobe livro e trabalhadores; devolve o endereço efetivo de escuta."""
+        self.livro.start()
+        contexto = multiprocessing.get_context("fork")
+        chave = bytes(contexto.current_process().authkey)
+
+        # No modo reuseport este socket só reserva a porta (inclusive quando ``porta`` é 0).
+        self._escuta = _socket_reuseport(self.host, self.porta)
+        host, porta = self._escuta.getsockname()[:2]
+        for _ in range(self.processos):
+            canal = None
+            if self.modo == "despachante":
+                nosso, canal = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+                self._canais.append(nosso)
+            processo = contexto.Process(
+                target=_trabalhador,
+                args=(self.livro.address, chave, self.modo, host, porta, canal, [self._escuta, *self._canais]),
+                daemon=True,
+            )
+            processo.start()
+            if canal is not None:
+                canal.close()
+            self._trabalhadores.append(processo)
+        return host, porta
+
+    async def despachar(self) -> None:
+        """Aceita conexões e as entrega ao trabalhador do fragmento do jogador."""
+        assert self._escuta is not None
+        escuta = self._escuta
+        escuta.listen(socket.SOMAXCONN)
+        escuta.setblocking(False)
+        loop = asyncio.get_running_loop()
+        tarefas: set[asyncio.Task[None]] = set()
+        while True:
+            conexao, _ = await loop.sock_accept(escuta)
+            tarefa = loop.create_task(self._encaminhar(conexao))
+            tarefas.add(tarefa)
+            tarefa.add_done_callback(tarefas.discard)
+
+    async def _encaminhar(self, conexao: socket.socket) -> None:
+        loop = asyncio.get_running_loop()
+        lidos = b""
+        try:
+            while b"\n" not in lidos and len(lidos) <= LIMITE_LINHA:
+                pedaco = await asyncio.wait_for(loop.sock_recv(conexao, LIMITE_LINHA), ESPERA_PRIMEIRA_LINHA)
+                if not pedaco:
+                    return
+                lidos += pedaco
+            canal = self._canais[fragmento(_jogador_da_linha(lidos.partition(b"\n")[0]), len(self._canais))]
+            # Canal bloqueante: se o trabalhador não dá conta, o despachante espera por ele.
+            socket.send_fds(canal, [lidos], [conexao.fileno()])
+        except (TimeoutError, ConnectionError):
+            pass
+        finally:
+            conexao.close()
+
+    def aguardar(self) -> None:
+        """Bloqueia até os trabalhadores terminarem (ou até Ctrl+C)."""
+        if self.modo == "despachante":
+            asyncio.run(self.despachar())
+        else:
+            for processo in self._trabalhadores:
+                processo.join()
+
+    def encerrar(self) -> None:
+        for canal in self._canais:
+            canal.close()
+        for processo in self._trabalhadores:
+            processo.terminate()
+        for processo in self._trabalhadores:
+            processo.join()
+        if self._escuta is not None:
+            self._escuta.close()
+        self.livro.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor de sessões em vários processos.")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: núcleos disponíveis")
+    parser.add_argument("--modo", choices=MODOS, default="despachante")
+    parser.add_argument("--host", default=HOST_PADRAO)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO, help="0 escolhe uma porta livre")
+    args = parser.parse_args()
+
+    servidor = ServidorMultiprocesso(args.processos, args.modo, args.host, args.porta)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    host, porta = servidor.iniciar()
+    print(f"Ouvindo em {host}:{porta}", flush=True)
+    try:
+        servidor.aguardar()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.encerrar()
+
+
+__all__ = ["LivroDeContas", "ServidorMultiprocesso", "fragmento"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,607 @@
+"""Fluxo de jogo independente de interface gráfica.
+
+Cada jogo tem uma ``Sessao`` que interpreta os valores digitados, cria o
+motor a partir da carteira ou de um saldo avulso, reserva na carteira o
+valor em jogo antes de o motor sortear e acerta a reserva com o resultado
+da rodada, grava o histórico, alimenta o
+``MonitorRTP`` (se houver) e monta as mensagens. A cada mudança ela
+entrega aos observadores uma ``Tela`` imutável com o que precisa ser
+exibido: as janelas Tk só desenham essas telas, e benchmarks, simuladores e
+servidores dirigem a mesma sessão sem display. Com um ``Gravador`` (de
+``reproducao``), cada motor criado pela sessão joga com uma semente gravada
+e registra suas ações, para ser reproduzido numa auditoria. Com
+``ativar_justo`` os motores sorteiam com um ``justo.GeradorJusto``: a sessão
+publica o compromisso antes de jogar e ``revelar`` abre a semente depois.
+
+``JogoAutomatico`` joga rodadas seguidas até uma ``Parada``, com aposta fixa
+ou decidida por uma estratégia de ``estrategias``, em lotes: a carteira
+reserva o lote de uma vez e os observadores são avisados uma vez por lote,
+não a cada rodada.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Generic, Protocol, TypeVar
+
+from dinheiro import Centavos, formatar_centavos, para_centavos, para_reais
+
+if TYPE_CHECKING:
+    from carteira import Reserva
+    from estrategias import Estrategia, ModeloJogo
+    from historico import HistoricoStore
+    from justo import GeradorJusto, Revelacao
+    from monitor_rtp import MonitorRTP
+    from reproducao import Gravacao, Gravador
+    from tabelas import Tabela
+
+
+class CarteiraProtocol(Protocol):
+    saldo: float
+
+    def depositar(self, valor: float) -> None: ...
+
+    def retirar(self, valor: float) -> bool: ...
+
+    def reservar(self, valor: float) -> Reserva | None: ...
+
+    def confirmar_reserva(self, reserva: Reserva, credito: float = 0.0) -> None: ...
+
+    def cancelar_reserva(self, reserva: Reserva) -> None: ...
+
+    def assinar(self, assinante: Callable[[float], None]) -> Callable[[], None]: ...
+
+
+class MotorProtocol(Protocol):
+    @property
+    def saldo(self) -> float: ...
+
+    @property
+    def saldo_centavos(self) -> Centavos: ...
+
+    def pode_apostar(self, valor: float) -> bool: ...
+
+
+class ErroSessao(ValueError):
+    """Ação recusada, com título e mensagem prontos para mostrar ao jogador.
+
+    ``aviso`` indica que a ação só não é possível agora (saldo, seleção),
+    em vez de um valor digitado errado.
+    """
+
+    def __init__(self, titulo: str, mensagem: str, aviso: bool = False) -> None:
+        super().__init__(mensagem)
+        self.titulo = titulo
+        self.mensagem = mensagem
+        self.aviso = aviso
+
+
+@dataclass(frozen=True)
+class Tela:
+    """Estado exibível comum a todos os jogos."""
+
+    saldo: float
+    status: str
+    iniciado: bool
+    jogando: bool
+    aposta: str
+    com_carteira: bool
+
+
+@dataclass(frozen=True)
+class Parada:
+    """Quando o jogo automático termina; limites em ``None`` ficam desligados."""
+
+    rodadas: int
+    limite_perda: float | None = None
+    meta_ganho: float | None = None
+
+
+def converter_valor(texto: str | float) -> float:
+    """Interpreta valores como ``"R$ 1.234,56"``; números passam direto. Infinito e NaN são ``ValueError``."""
+    if isinstance(texto, (int, float)):
+        valor = float(texto)
+    else:
+        valor = float(texto.replace("R$", "").strip().replace(".", "").replace(",", "."))
+    if not math.isfinite(valor):
+        raise ValueError(f"Valor não finito: {texto!r}.")
+    return valor
+
+
+def formatar_entrada(valor: float) -> str:
+    return f"{valor:.2f}".replace(".", ",")
+
+
+# Nome de ``estrategias.ApostaFixa``, repetido para não importar as estratégias.
+ESTRATEGIA_FIXA = "fixa"
+
+M = TypeVar("M", bound=MotorProtocol)
+T = TypeVar("T", bound=Tela)
+
+
+class Sessao(Generic[M, T]):
+    """Base das sessões: carteira, histórico, validação e observadores.
+
+    Subclasses definem ``jogo`` (chave no histórico), as mensagens de status,
+    ``_criar_motor`` e ``tela``. ``ACOES`` lista os métodos que clientes
+    remotos podem chamar. Nos jogos com tabela de pagamentos, ``tabela``
+    (``None``: a padrão) é repassada ao motor.
+    """
+
+    jogo = ""
+    ACOES: tuple[str, ...] = ("iniciar",)
+    APOSTA_PADRAO = 10.0
+    STATUS_INICIAL = ""
+    STATUS_CARTEIRA = ""
+    STATUS_INICIO = ""
+    tabela: Tabela | None = None
+
+    def __init__(
+        self,
+        carteira: CarteiraProtocol | None = None,
+        historico: HistoricoStore | None = None,
+        jogador: str = "principal",
+        monitor: MonitorRTP | None = None,
+        gravador: Gravador | None = None,
+    ) -> None:
+        self.carteira = carteira
+        self.historico = historico
+        self.jogador = jogador
+        self.monitor = monitor
+        self.gravador = gravador
+        self.gravacao: Gravacao | None = None
+        self.gerador_justo: GeradorJusto | None = None
+        self.motor: M | None = None
+        self.status = self.STATUS_CARTEIRA if carteira is not None else self.STATUS_INICIAL
+        self.aposta_sugerida = self.APOSTA_PADRAO
+        self._saldo_sincronizado: Centavos = 0
+        self._reservas: list[Reserva] = []
+        self._observadores: tuple[Callable[[T], None], ...] = ()
+
+    @property
+    def saldo(self) -> float:
+        if self.motor is not None:
+            return self.motor.saldo
+        if self.carteira is not None:
+            return self.carteira.saldo
+        return 0.0
+
+    def assinar(self, observador: Callable[[T], None]) -> Callable[[], None]:
+        """Chama ``observador(tela)`` a cada mudança; devolve o cancelamento."""
+        self._observadores += (observador,)
+
+        def cancelar() -> None:
+            self._observadores = tuple(o for o in self._observadores if o is not observador)
+
+        return cancelar
+
+    def conectar_carteira(self, carteira: CarteiraProtocol) -> None:
+        """Passa a jogar com ``carteira``; o motor será recriado a partir dela."""
+        self._sincronizar()
+        self._concluir_gravacao()
+        self.carteira = carteira
+        self.motor = None
+        self.status = self.STATUS_CARTEIRA
+        self._limpar_rodada()
+        self._emitir()
+
+    def resetar(self) -> None:
+        """Volta ao estado de uma sessão nova, sem carteira."""
+        self._sincronizar()
+        self._concluir_gravacao()
+        self.carteira = None
+        self.motor = None
+        self.status = self.STATUS_INICIAL
+        self.aposta_sugerida = self.APOSTA_PADRAO
+        self._limpar_rodada()
+        self._emitir()
+
+    def iniciar(self, saldo_avulso: str | float | None = None) -> None:
+        """Cria o motor com o saldo da carteira ou, sem carteira, com ``saldo_avulso``."""
+        self.motor = self._novo_motor(self._saldo_inicial(saldo_avulso))
+        self._saldo_sincronizado = self.motor.saldo_centavos
+        self.aposta_sugerida = min(self.motor.saldo, self.APOSTA_PADRAO)
+        self.status = self.STATUS_INICIO
+        self._limpar_rodada()
+        self._emitir()
+
+    def ler_aposta(self, texto: str | float) -> float:
+        """Converte e valida a aposta contra o saldo do motor."""
+        if self.motor is None:
+            raise ErroSessao("Jogo não iniciado", "Inicie o jogo antes de apostar.", aviso=True)
+        try:
+            aposta = converter_valor(texto)
+        except ValueError:
+            raise ErroSessao("Valor inválido", "Informe um número válido para a aposta.") from None
+        if not self.motor.pode_apostar(aposta):
+            raise ErroSessao(
+                "Aposta inválida",
+                "A aposta precisa ser maior que zero e não pode ultrapassar o saldo atual.",
+                aviso=True,
+            )
+        return aposta
+
+    def automatico(self, aposta: str | float, parada: Parada, estrategia: str | None = None) -> JogoAutomatico:
+        """Prepara rodadas automáticas; quem chama decide o tamanho dos lotes.
+
+        Sem ``estrategia`` toda rodada usa ``aposta``; com o nome de uma
+        estratégia, ``aposta`` é a aposta base dela. A ``"fixa"`` não
+        depende dos resultados e segue, como sem estratégia, em lotes no motor.
+        """
+        valor = self.ler_aposta(aposta)
+        progressao = None
+        if estrategia is not None and estrategia != ESTRATEGIA_FIXA:
+            # Importado aqui: as estratégias só pesam na importação de quem joga no automático.
+            from estrategias import criar_estrategia
+
+            try:
+                progressao = criar_estrategia(estrategia, para_centavos(valor), self.modelo())
+            except ValueError as erro:
+                raise ErroSessao("Estratégia", str(erro)) from None
+        return JogoAutomatico(self, valor, parada, progressao)
+
+    def ativar_justo(self, semente_cliente: str = "") -> str:
+        """Passa a sortear com ``justo.GeradorJusto`` e devolve o compromisso da semente do servidor.
+
+        Vale para os motores criados daqui em diante, por isso só antes de
+        iniciar o jogo.
+        """
+        if self.motor is not None:
+            raise ErroSessao("Modo justo", "Ative o modo justo antes de iniciar o jogo.", aviso=True)
+        from justo import GeradorJusto
+
+        self.gerador_justo = GeradorJusto(semente_cliente=str(semente_cliente))
+        return self.gerador_justo.compromisso
+
+    def revelar(self) -> Revelacao:
+        """Abre a semente do servidor e passa a uma nova, com novo compromisso, entre rodadas.
+
+        Cada motor joga com uma só semente: o atual é trocado por um novo
+        (``_trocar_motor``), e a gravação dele termina aqui.
+        """
+        if self.gerador_justo is None:
+            raise ErroSessao("Modo justo", "O modo justo não está ativo nesta sessão.", aviso=True)
+        if self._reservas:
+            raise ErroSessao("Modo justo", "Termine a rodada em andamento antes de revelar a semente.", aviso=True)
+        revelacao = self.gerador_justo.revelar()
+        if self.motor is not None:
+            self._trocar_motor()
+        self._emitir()
+        return revelacao
+
+    def trocar_tabela(self, tabela: Tabela) -> None:
+        """Joga com ``tabela`` (de ``tabelas``) a partir da próxima rodada, sem recriar o motor."""
+        self.tabela = tabela
+        if self.motor is not None:
+            self.motor.tabela = tabela  # type: ignore[attr-defined]
+
+    def modelo(self) -> ModeloJogo:
+        """Probabilidades e retornos de uma rodada, para as estratégias."""
+        raise NotImplementedError
+
+    def tela(self) -> T:
+        raise NotImplementedError
+
+    def _criar_motor(self, saldo: float) -> M:
+        raise NotImplementedError
+
+    def _novo_motor(self, saldo: float) -> M:
+        """``_criar_motor``, ligado ao gerador justo se houver, e, com gravador, a gravação dele."""
+        motor = self._criar_motor(saldo)
+        if self.gerador_justo is not None:
+            from justo import aplicar
+
+            aplicar(self.jogo, motor, self.gerador_justo)
+        if self.gravador is not None:
+            self._concluir_gravacao()
+            self.gravacao = self.gravador.gravar(self.jogo, motor, self.jogador)
+        return motor
+
+    def _trocar_motor(self) -> None:
+        """Recria o motor com o mesmo saldo, depois de ``revelar``."""
+        assert self.motor is not None
+        self.motor = self._novo_motor(self.motor.saldo)
+        self._saldo_sincronizado = self.motor.saldo_centavos
+
+    def _concluir_gravacao(self) -> None:
+        if self.gravacao is not None:
+            assert self.gravador is not None
+            self.gravador.concluir(self.gravacao)
+            self.gravacao = None
+
+    def _rodada(self, aposta: float) -> Any:
+        """Uma rodada no motor, sem carteira, histórico nem mensagens."""
+        raise NotImplementedError
+
+    def _rodadas(self, aposta: float, quantidade: int) -> list[Any]:
+        """Até ``quantidade`` rodadas com ``aposta``, parando quando o saldo não a cobre.
+
+        Os jogos com sorteio em lote no motor resolvem todas numa chamada.
+        """
+        assert self.motor is not None
+        resultados = []
+        for _ in range(quantidade):
+            if not self.motor.pode_apostar(aposta):
+                break
+            resultados.append(self._rodada(aposta))
+        return resultados
+
+    def _maior_ganho(self, aposta: float) -> Centavos | None:
+        """O maior lucro de uma rodada com ``aposta`` (``None``: sem limite conhecido)."""
+        return None
+
+    def _jogar(self, aposta: float) -> Any:
+        """``_rodada`` com o valor em jogo reservado na carteira antes do sorteio."""
+        self._reter(self._risco(aposta))
+        try:
+            return self._rodada(aposta)
+        except BaseException:
+            self._sincronizar()
+            raise
+
+    def _risco(self, aposta: float) -> Centavos:
+        """Quanto uma rodada com ``aposta`` pode tirar do saldo."""
+        return para_centavos(aposta)
+
+    def _reter(self, valor: Centavos, minimo: Centavos | None = None) -> Centavos | None:
+        """Reserva ``valor`` na carteira e devolve quanto ficou retido (``None``: sem carteira).
+
+        Com ``minimo``, se a carteira não cobre ``valor``, retém o saldo dela
+        desde que cubra ``minimo``. Sem isso, ``ErroSessao``: o motor só
+        conhece a cópia do saldo, e outras sessões podem ter gasto a carteira.
+        """
+        if self.carteira is None:
+            return None
+        reserva = self.carteira.reservar(para_reais(valor))
+        if reserva is None and minimo is not None:
+            disponivel = para_centavos(self.carteira.saldo)
+            if minimo <= disponivel < valor:
+                reserva = self.carteira.reservar(para_reais(disponivel))
+        if reserva is None:
+            raise ErroSessao("Saldo insuficiente", "O saldo da carteira não cobre esta aposta.", aviso=True)
+        self._reservas.append(reserva)
+        return reserva.valor
+
+    def _anunciar(self, resultado: Any) -> None:
+        """Guarda ``resultado`` para a tela e monta a mensagem de status."""
+
+    def _limpar_rodada(self) -> None:
+        """Esquece o último resultado exibido; chamado ao (re)começar."""
+
+    def _saldo_inicial(self, saldo_avulso: str | float | None) -> float:
+        if self.carteira is not None:
+            saldo = self.carteira.saldo
+            if saldo <= 0:
+                raise ErroSessao(
+                    "Carteira vazia", "Adicione saldo na tela principal para continuar jogando.", aviso=True
+                )
+            return saldo
+        try:
+            saldo = converter_valor(saldo_avulso)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            raise ErroSessao("Valor inválido", "Informe um número válido para o saldo inicial.") from None
+        if saldo <= 0:
+            raise ErroSessao("Saldo inválido", "O saldo inicial precisa ser maior que zero.")
+        return saldo
+
+    def _campos_tela(self) -> dict[str, Any]:
+        return {
+            "saldo": self.saldo,
+            "status": self.status,
+            "iniciado": self.motor is not None,
+            "jogando": self.motor is not None and self.motor.saldo_centavos > 0,
+            "aposta": formatar_entrada(max(self.aposta_sugerida, 0.0)),
+            "com_carteira": self.carteira is not None,
+        }
+
+    def _emitir(self) -> None:
+        if not self._observadores:
+            return
+        tela = self.tela()
+        for observador in self._observadores:
+            observador(tela)
+
+    def _concluir_rodada(self, resultado: object, aposta: float | None = None) -> None:
+        """Repassa o saldo à carteira e grava a rodada no histórico."""
+        self._sincronizar()
+        self._registrar(resultado, aposta)
+
+    def _maior_aposta(self, saldo: Centavos) -> Centavos:
+        """A maior aposta que ``saldo`` cobre; o jogo automático limita as estratégias a ela."""
+        return saldo
+
+    def _registrar(self, resultado: object, aposta: float | None) -> None:
+        if self.historico is not None and self.motor is not None:
+            self.historico.registrar_rodada(
+                self.jogo, resultado, self.motor.saldo_centavos, jogador=self.jogador, aposta=aposta
+            )
+        if self.monitor is not None:
+            self.monitor.registrar(self.jogo, resultado, aposta, getattr(self.motor, "tabela", None))
+
+    def _sincronizar(self) -> None:
+        """Confirma as reservas abertas, creditando o retido mais o resultado desde a última vez."""
+        if self.carteira is None or self.motor is None or not self._reservas:
+            return
+        primeira, *demais = self._reservas
+        self._reservas = []
+        retido = sum(reserva.valor for reserva in demais) + primeira.valor
+        credito = retido + self.motor.saldo_centavos - self._saldo_sincronizado
+        if credito < 0:
+            # Toda rodada reserva o que pode perder antes de sortear, então o motor perdeu mais do que
+            # a carteira reteve: as reservas voltam à carteira e o acerto recomeça do saldo atual.
+            for reserva in (primeira, *demais):
+                self.carteira.cancelar_reserva(reserva)
+            self._saldo_sincronizado = self.motor.saldo_centavos
+            raise RuntimeError(f"O motor perdeu {-credito} centavos além dos {retido} retidos na carteira.")
+        self.carteira.confirmar_reserva(primeira, para_reais(credito))
+        for reserva in demais:
+            self.carteira.confirmar_reserva(reserva)
+        self._saldo_sincronizado = self.motor.saldo_centavos
+
+
+class JogoAutomatico:
+    """Rodadas seguidas, resolvidas em lotes.
+
+    Com aposta fixa, ``proximo_lote`` resolve as rodadas em lotes no motor
+    (``Sessao._rodadas``): cada chamada joga quantas rodadas nem o pior
+    caso deixaria passar da ``Parada`` ou do retido na carteira. Com
+    ``estrategia``, que decide a aposta pelo resultado anterior, o motor
+    joga uma rodada por vez. Cada rodada é gravada no histórico, mas a
+    carteira só é acertada e a tela emitida ao fim do lote; a carteira
+    reserva antes o que o lote pode perder. A aposta é sempre ``aposta`` ou,
+    com ``estrategia``, a que ela pedir, limitada ao saldo. ``motivo`` diz
+    por que parou: a ``Parada``, o saldo que não cobre ``aposta`` ou o
+    retido na carteira.
+    """
+
+    def __init__(
+        self, sessao: Sessao[Any, Any], aposta: float, parada: Parada, estrategia: Estrategia | None = None
+    ) -> None:
+        if parada.rodadas <= 0:
+            raise ErroSessao("Jogo automático", "Informe quantas rodadas jogar.", aviso=True)
+        assert sessao.motor is not None
+        self.sessao = sessao
+        self.aposta = aposta
+        self.parada = parada
+        self.estrategia = estrategia
+        self.jogadas = 0
+        self.motivo: str | None = None
+        self._inicial = sessao.motor.saldo_centavos
+        self._perda_maxima = None if parada.limite_perda is None else para_centavos(parada.limite_perda)
+        self._meta = None if parada.meta_ganho is None else para_centavos(parada.meta_ganho)
+
+    @property
+    def encerrado(self) -> bool:
+        return self.motivo is not None
+
+    @property
+    def lucro_centavos(self) -> Centavos:
+        motor = self.sessao.motor
+        return (motor.saldo_centavos if motor is not None else self._inicial) - self._inicial
+
+    def proximo_lote(self, tamanho: int) -> list[Any]:
+        """Joga até ``tamanho`` rodadas; devolve os resultados (vazio se já encerrado)."""
+        sessao = self.sessao
+        resultados: list[Any] = []
+        if self.motivo is None and sessao.motor is None:
+            self.motivo = "jogo encerrado"
+        retido = self._reter_lote(tamanho) if self.motivo is None and tamanho > 0 else None
+        try:
+            if self.estrategia is None:
+                self._jogar_em_lotes(resultados, tamanho, retido)
+            else:
+                self._jogar_com_estrategia(self.estrategia, resultados, tamanho, retido)
+        finally:
+            sessao._sincronizar()
+        if resultados:
+            sessao._anunciar(resultados[-1])
+        self._atualizar_status()
+        sessao._emitir()
+        return resultados
+
+    def _jogar_em_lotes(self, resultados: list[Any], tamanho: int, retido: Centavos | None) -> None:
+        """Joga ``aposta`` fixa em lotes do motor, cada um do tamanho que a ``Parada`` e o retido permitem."""
+        sessao = self.sessao
+        motor = sessao.motor
+        assert motor is not None
+        risco = sessao._risco(self.aposta)
+        ganho = sessao._maior_ganho(self.aposta)
+        while len(resultados) < tamanho and self.motivo is None:
+            # Até a última rodada do lote, nem perdendo (ou ganhando) sempre a Parada é atingida.
+            lucro = self.lucro_centavos
+            quantidade = min(tamanho - len(resultados), self.parada.rodadas - self.jogadas)
+            if self._perda_maxima is not None:
+                quantidade = min(quantidade, max(1, -(-(self._perda_maxima + lucro) // risco)))
+            if self._meta is not None and ganho != 0:
+                quantidade = 1 if ganho is None else min(quantidade, max(1, -(-(self._meta - lucro) // ganho)))
+            if retido is not None:
+                quantidade = min(quantidade, (retido - sessao._saldo_sincronizado + motor.saldo_centavos) // risco)
+                if quantidade <= 0:
+                    if not resultados:
+                        self.motivo = "saldo insuficiente na carteira"
+                    return
+            lote = sessao._rodadas(self.aposta, quantidade)
+            for resultado in lote:
+                sessao._registrar(resultado, self.aposta)
+            resultados.extend(lote)
+            self.jogadas += len(lote)
+            self.motivo = self._motivo_parada()
+
+    def _jogar_com_estrategia(
+        self, estrategia: Estrategia, resultados: list[Any], tamanho: int, retido: Centavos | None
+    ) -> None:
+        """Joga rodada a rodada, com a aposta que ``estrategia`` pede depois de cada resultado."""
+        sessao = self.sessao
+        motor = sessao.motor
+        assert motor is not None
+        while len(resultados) < tamanho and self.motivo is None:
+            saldo = motor.saldo_centavos
+            centavos = min(estrategia.proxima_aposta(saldo), sessao._maior_aposta(saldo))
+            if centavos <= 0:
+                self.motivo = "estratégia não aposta"
+                return
+            aposta = para_reais(centavos)
+            if retido is not None and sessao._saldo_sincronizado - saldo + sessao._risco(aposta) > retido:
+                if not resultados:
+                    self.motivo = "saldo insuficiente na carteira"
+                return
+            resultado = sessao._rodada(aposta)
+            estrategia.registrar(motor.saldo_centavos - saldo)
+            sessao._registrar(resultado, aposta)
+            resultados.append(resultado)
+            self.jogadas += 1
+            self.motivo = self._motivo_parada()
+
+    def _reter_lote(self, tamanho: int) -> Centavos | None:
+        """Reserva na carteira o que ``tamanho`` rodadas podem perder, limitado ao saldo do motor."""
+        sessao = self.sessao
+        assert sessao.motor is not None
+        saldo = sessao.motor.saldo_centavos
+        risco = sessao._risco(self.aposta)
+        desejado = saldo if self.estrategia is not None else min(saldo, tamanho * risco)
+        try:
+            return sessao._reter(desejado, minimo=1 if self.estrategia is not None else risco)
+        except ErroSessao:
+            self.motivo = "saldo insuficiente na carteira"
+            return None
+
+    def parar(self) -> None:
+        if self.motivo is None:
+            self.motivo = "interrompido"
+            self._atualizar_status()
+            self.sessao._emitir()
+
+    def _motivo_parada(self) -> str | None:
+        lucro = self.lucro_centavos
+        if self._perda_maxima is not None and -lucro >= self._perda_maxima:
+            return "limite de perda atingido"
+        if self._meta is not None and lucro >= self._meta:
+            return "meta de ganho atingida"
+        if self.jogadas >= self.parada.rodadas:
+            return "rodadas concluídas"
+        assert self.sessao.motor is not None
+        if not self.sessao.motor.pode_apostar(self.aposta):
+            return "saldo insuficiente"
+        return None
+
+    def _atualizar_status(self) -> None:
+        lucro = self.lucro_centavos
+        resultado = ("+" if lucro > 0 else "") + formatar_centavos(lucro)
+        if self.motivo is None:
+            self.sessao.status = f"Automático: {self.jogadas}/{self.parada.rodadas} rodadas, {resultado}."
+        else:
+            self.sessao.status = f"Automático encerrado ({self.motivo}) após {self.jogadas} rodadas: {resultado}."
+
+
+__all__ = [
+    "CarteiraProtocol",
+    "ErroSessao",
+    "JogoAutomatico",
+    "MotorProtocol",
+    "Parada",
+    "Sessao",
+    "Tela",
+    "converter_valor",
+    "formatar_entrada",
+]
@@ -0,0 +1,414 @@
+"""Tabelas de pagamento em arquivos TOML ou JSON, validadas e compiladas.
+
+Cada arquivo declara ``formato`` (a versão do esquema, hoje 1), ``jogo`` e
+``versao`` (livre, para o operador identificar a configuração). Ao carregar,
+os dados são validados e compilados em estruturas prontas para o sorteio:
+
+* caça-níquel: o prêmio em décimos da aposta de cada combinação de
+  símbolos, um por rolo, num vetor plano de ``n**rolos`` posições, a faixa
+  de cada rolo e, por parada da faixa, os símbolos à vista e a contribuição
+  já empacotada da coluna às linhas de pagamento;
+* roleta: a cor de cada casa e, por cor apostada, o retorno de cada casa;
+* truco: a meta da partida e os valores que a mão assume a cada truco.
+
+As tabelas compiladas são imutáveis e ficam num cache pelo SHA-256 do
+conteúdo: carregar de novo o mesmo arquivo devolve o mesmo objeto. Os
+motores guardam a tabela em ``tabela``; trocar esse atributo muda as regras
+a partir da próxima rodada, sem reiniciar nada e sem custo por rodada.
+
+Os analisadores de TOML e JSON só são importados ao carregar a primeira
+tabela, para não pesar na importação dos motores.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import operator
+import os
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+if TYPE_CHECKING:
+    from fractions import Fraction
+
+# os.path em vez de pathlib: este módulo entra na importação dos motores.
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+FORMATO_ATUAL = 1
+# Limite de combinações do caça-níquel (n**rolos) que a tabela plana aceita.
+COMBINACOES_MAXIMAS = 1 << 20
+
+
+class ErroTabela(ValueError):
+    """Arquivo de tabela inválido; a mensagem diz qual campo e por quê."""
+
+
+@dataclass(frozen=True, eq=False)
+class TabelaSlot:
+    """Rolos com faixas de símbolos, ``altura`` fileiras à vista e ``linhas`` de pagamento.
+
+    O sorteio escolhe uma parada em cada faixa; a coluna à vista são os
+    ``altura`` símbolos a partir dela (``janelas[rolo][parada]``), dando a
+    volta no fim da faixa. As linhas são avaliadas juntas num inteiro com um
+    campo de ``tipo_campo`` (``array``) por linha: ``colunas[rolo][parada]``
+    soma, em cada campo, a contribuição daquela coluna ao índice em
+    ``premios`` da linha. Somando a coluna de cada rolo, cada campo guarda o
+    índice do prêmio da sua linha, quantas linhas houver.
+    """
+
+    versao: str
+    hash: str
+    nomes: tuple[str, ...]
+    # Quantas vezes cada símbolo aparece na faixa de cada rolo.
+    pesos_rolos: tuple[tuple[int, ...], ...]
+    # Prêmio em décimos da aposta da combinação (i, j, k) em (i * n + j) * n + k,
+    # e assim por diante com mais rolos.
+    premios: tuple[int, ...]
+    rolos: int
+    altura: int
+    # Fileira de cada rolo em cada linha de pagamento; a primeira é a principal.
+    linhas: tuple[tuple[int, ...], ...]
+    faixas: tuple[tuple[int, ...], ...]
+    janelas: tuple[tuple[tuple[str, ...], ...], ...]
+    colunas: tuple[tuple[int, ...], ...]
+    tipo_campo: str
+    # Parte de cada aposta que vai ao jackpot, em pontos-base (0: sem jackpot),
+    # e a combinação da linha principal que leva o fundo.
+    jackpot_pontos_base: int = 0
+    jackpot_simbolos: tuple[str, ...] = ()
+
+    @property
+    def indices(self) -> range:
+        return range(len(self.nomes))
+
+    def premio_decimos(self, simbolos: tuple[str, ...]) -> int:
+        indice = 0
+        for simbolo in simbolos:
+            indice = indice * len(self.nomes) + self.nomes.index(simbolo)
+        return self.premios[indice]
+
+    def rtp(self) -> Fraction:
+        """Retorno exato de uma linha por real apostado, pela composição das faixas.
+
+        Toda fileira de um rolo mostra cada parada com a mesma chance, então
+        qualquer linha tem esta distribuição; com várias linhas o retorno
+        médio do giro é o mesmo.
+        """
+        from fractions import Fraction
+
+        total = 0
+        for combinacao, premio in zip(itertools.product(*self.pesos_rolos), self.premios):
+            if premio:
+                total += premio * math.prod(combinacao)
+        return Fraction(total, 10 * math.prod(map(len, self.faixas)))
+
+
+@dataclass(frozen=True, eq=False)
+class TabelaRoleta:
+    versao: str
+    hash: str
+    cores: tuple[str, ...]
+    # Por cor apostada, o retorno em décimos da aposta em cada casa (0: perdeu).
+    retornos: dict[str, tuple[int, ...]]
+
+    @property
+    def casas(self) -> int:
+        return len(self.cores)
+
+    def numeros(self, cor: str) -> frozenset[int]:
+        return frozenset(numero for numero, c in enumerate(self.cores) if c == cor)
+
+
+@dataclass(frozen=True, eq=False)
+class TabelaTruco:
+    versao: str
+    hash: str
+    meta_partida: int
+    valores_mao: tuple[int, ...]
+
+    def proximo_valor(self, atual: int) -> int | None:
+        """Quanto a mão passa a valer com mais um truco; ``None`` se já está no máximo."""
+        return next((valor for valor in self.valores_mao if valor > atual), None)
+
+
+Tabela = Union[TabelaSlot, TabelaRoleta, TabelaTruco]
+
+_COMPILADAS: dict[str, Tabela] = {}
+
+
+def _campo(dados: dict[str, Any], nome: str, tipo: type | tuple[type, ...]) -> Any:
+    if nome not in dados:
+        raise ErroTabela(f"Campo obrigatório ausente: {nome!r}.")
+    valor = dados[nome]
+    if isinstance(valor, bool) or not isinstance(valor, tipo):
+        raise ErroTabela(f"Campo {nome!r} com tipo inválido: {type(valor).__name__}.")
+    return valor
+
+
+def _decimos(valor: Any, campo: str) -> int:
+    """Multiplicador em décimos; só aceita valores com no máximo uma casa decimal."""
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor) or valor < 0:
+        raise ErroTabela(f"{campo} precisa ser um número não negativo.")
+    decimos = round(valor * 10)
+    if abs(decimos - valor * 10) > 1e-9:
+        raise ErroTabela(f"{campo} aceita no máximo uma casa decimal: {valor}.")
+    return decimos
+
+
+def faixa_dos_pesos(pesos: list[int] | tuple[int, ...]) -> list[int]:
+    """Faixa com cada símbolo ``pesos[s]`` vezes, espalhado pela faixa em vez de agrupado."""
+    # A k-ésima cópia de um símbolo de peso p vai para (k + 1/2) / p da faixa.
+    copias = sorted(((k + 0.5) / peso, simbolo) for simbolo, peso in enumerate(pesos) for k in range(peso))
+    return [simbolo for _, simbolo in copias]
+
+
+def _faixas(
+    grade: dict[str, Any], nomes: list[str], pesos: list[int | None], rolos: int, altura: int
+) -> list[list[int]]:
+    declaradas = grade.get("faixas")
+    if declaradas is None:
+        if None in pesos:
+            raise ErroTabela("Sem grade.faixas, todo símbolo precisa de peso.")
+        return [faixa_dos_pesos(pesos)] * rolos  # type: ignore[arg-type]
+    if not isinstance(declaradas, list) or len(declaradas) != rolos:
+        raise ErroTabela(f"grade.faixas precisa ter uma faixa para cada um dos {rolos} rolos.")
+    faixas = []
+    for rolo, faixa in enumerate(declaradas, 1):
+        if not isinstance(faixa, list) or len(faixa) < altura or any(nome not in nomes for nome in faixa):
+            raise ErroTabela(f"Faixa do rolo {rolo}: ao menos {altura} símbolos, todos declarados.")
+        faixas.append([nomes.index(nome) for nome in faixa])
+    return faixas
+
+
+def compilar_slot(dados: dict[str, Any], hash_: str) -> TabelaSlot:
+    simbolos = _campo(dados, "simbolos", list)
+    if len(simbolos) < 2:
+        raise ErroTabela("O caça-níquel precisa de ao menos dois símbolos.")
+    nomes: list[str] = []
+    pesos: list[int | None] = []
+    trincas = []
+    for posicao, simbolo in enumerate(simbolos, 1):
+        if not isinstance(simbolo, dict):
+            raise ErroTabela(f"Símbolo {posicao} precisa ser uma tabela.")
+        nome = _campo(simbolo, "nome", str)
+        if not nome or nome in nomes:
+            raise ErroTabela(f"Nome de símbolo vazio ou repetido: {nome!r}.")
+        # Com faixas declaradas o peso sai delas e pode faltar.
+        peso = _campo(simbolo, "peso", int) if "peso" in simbolo else None
+        if peso is not None and peso <= 0:
+            raise ErroTabela(f"O peso de {nome} precisa ser positivo.")
+        nomes.append(nome)
+        pesos.append(peso)
+        trincas.append(_decimos(_campo(simbolo, "trinca", (int, float)), f"trinca de {nome}"))
+
+    grade = dados.get("grade", {})
+    if not isinstance(grade, dict):
+        raise ErroTabela("grade precisa ser uma tabela.")
+    rolos = grade.get("rolos", 3)
+    altura = grade.get("altura", 3)
+    for campo, valor in (("grade.rolos", rolos), ("grade.altura", altura)):
+        if isinstance(valor, bool) or not isinstance(valor, int) or valor < 1:
+            raise ErroTabela(f"{campo} precisa ser um inteiro positivo.")
+    if len(nomes) ** rolos > COMBINACOES_MAXIMAS:
+        raise ErroTabela(f"{len(nomes)} símbolos em {rolos} rolos passam de {COMBINACOES_MAXIMAS} combinações.")
+    linhas = grade.get("linhas", [[altura // 2] * rolos])
+    if not isinstance(linhas, list) or not linhas:
+        raise ErroTabela("grade.linhas precisa listar ao menos uma linha de pagamento.")
+    for numero, linha in enumerate(linhas, 1):
+        if (
+            not isinstance(linha, list)
+            or len(linha) != rolos
+            or any(isinstance(f, bool) or not isinstance(f, int) or not 0 <= f < altura for f in linha)
+        ):
+            raise ErroTabela(f"Linha {numero}: informe uma fileira de 0 a {altura - 1} para cada um dos {rolos} rolos.")
+    if len({tuple(linha) for linha in linhas}) != len(linhas):
+        raise ErroTabela("grade.linhas tem linhas repetidas.")
+    faixas = _faixas(grade, nomes, pesos, rolos, altura)
+
+    premios = _campo(dados, "premios", dict)
+    par = _decimos(_campo(premios, "par", (int, float)), "premios.par")
+    sequencia = _decimos(premios.get("sequencia", 0), "premios.sequencia")
+    nomes_sequencia = premios.get("sequencia_simbolos", [])
+    if not isinstance(nomes_sequencia, list) or any(nome not in nomes for nome in nomes_sequencia):
+        raise ErroTabela("premios.sequencia_simbolos precisa listar símbolos declarados.")
+    if nomes_sequencia and len(set(nomes_sequencia)) != rolos:
+        raise ErroTabela(f"premios.sequencia_simbolos precisa ter {rolos} símbolos distintos, um por rolo.")
+    alvo = {nomes.index(nome) for nome in nomes_sequencia}
+
+    # Todos iguais pagam a trinca do símbolo; algum repetido, o par.
+    plano = []
+    for combinacao in itertools.product(range(len(nomes)), repeat=rolos):
+        distintos = set(combinacao)
+        if len(distintos) == 1:
+            plano.append(trincas[combinacao[0]])
+        elif len(distintos) < rolos:
+            plano.append(par)
+        elif alvo and distintos == alvo:
+            plano.append(sequencia)
+        else:
+            plano.append(0)
+
+    jackpot = dados.get("jackpot", {})
+    if not isinstance(jackpot, dict):
+        raise ErroTabela("jackpot precisa ser uma tabela.")
+    pontos_base = 0
+    simbolos_jackpot: list[str] = []
+    if jackpot:
+        percentual = _campo(jackpot, "percentual", (int, float))
+        pontos_base = round(percentual * 100)
+        if not 0 < pontos_base <= 10_000 or abs(pontos_base - percentual * 100) > 1e-9:
+            raise ErroTabela("jackpot.percentual vai de 0,01 a 100, com até duas casas decimais.")
+        simbolos_jackpot = _campo(jackpot, "simbolos", list)
+        if len(simbolos_jackpot) != rolos or any(nome not in nomes for nome in simbolos_jackpot):
+            raise ErroTabela(f"jackpot.simbolos precisa dar um símbolo declarado para cada um dos {rolos} rolos.")
+
+    n = len(nomes)
+    tipo_campo = "H" if n**rolos <= 1 << 16 else "I"
+    bits = 16 if tipo_campo == "H" else 32
+    janelas, colunas = [], []
+    for rolo, faixa in enumerate(faixas):
+        peso_rolo = n ** (rolos - 1 - rolo)
+        # Um bit no início do campo de cada linha que passa pela fileira.
+        mascaras = [
+            sum(1 << bits * numero for numero, linha in enumerate(linhas) if linha[rolo] == fileira)
+            for fileira in range(altura)
+        ]
+        visiveis = [
+            [faixa[(parada + fileira) % len(faixa)] for fileira in range(altura)] for parada in range(len(faixa))
+        ]
+        janelas.append(tuple(tuple(nomes[simbolo] for simbolo in janela) for janela in visiveis))
+        colunas.append(tuple(peso_rolo * sum(map(operator.mul, janela, mascaras)) for janela in visiveis))
+    return TabelaSlot(
+        str(dados.get("versao", "")), hash_, tuple(nomes),
+        tuple(tuple(faixa.count(simbolo) for simbolo in range(n)) for faixa in faixas),
+        tuple(plano), rolos, altura, tuple(map(tuple, linhas)), tuple(map(tuple, faixas)), tuple(janelas),
+        tuple(colunas), tipo_campo, pontos_base, tuple(simbolos_jackpot),
+    )
+
+
+def compilar_roleta(dados: dict[str, Any], hash_: str) -> TabelaRoleta:
+    casas = _campo(dados, "casas", int)
+    if casas < 2:
+        raise ErroTabela("A roleta precisa de ao menos duas casas.")
+    cores_declaradas = _campo(dados, "cores", dict)
+    cores: list[str | None] = [None] * casas
+    for cor, numeros in cores_declaradas.items():
+        if not isinstance(numeros, list):
+            raise ErroTabela(f"cores.{cor} precisa ser uma lista de casas.")
+        for numero in numeros:
+            if isinstance(numero, bool) or not isinstance(numero, int) or not 0 <= numero < casas:
+                raise ErroTabela(f"cores.{cor}: casa fora da roda: {numero!r}.")
+            if cores[numero] is not None:
+                raise ErroTabela(f"A casa {numero} aparece em {cores[numero]} e em {cor}.")
+            cores[numero] = cor
+    sem_cor = [numero for numero, cor in enumerate(cores) if cor is None]
+    if sem_cor:
+        raise ErroTabela(f"Casas sem cor: {sem_cor}.")
+
+    pagamentos = _campo(dados, "pagamentos", dict)
+    retornos = {}
+    for cor, pagamento in pagamentos.items():
+        if cor not in cores_declaradas:
+            raise ErroTabela(f"pagamentos.{cor} não corresponde a nenhuma cor.")
+        # "Paga N por 1": devolve a aposta mais N apostas.
+        retorno = _decimos(pagamento, f"pagamentos.{cor}") + 10
+        retornos[cor] = tuple(retorno if c == cor else 0 for c in cores)
+    return TabelaRoleta(str(dados.get("versao", "")), hash_, tuple(cores), retornos)  # type: ignore[arg-type]
+
+
+def compilar_truco(dados: dict[str, Any], hash_: str) -> TabelaTruco:
+    meta = _campo(dados, "meta_partida", int)
+    if meta <= 0:
+        raise ErroTabela("meta_partida precisa ser positiva.")
+    valores = _campo(dados, "valores_mao", list)
+    if (
+        not valores
+        or any(isinstance(v, bool) or not isinstance(v, int) for v in valores)
+        or valores[0] < 1
+        or any(b <= a for a, b in zip(valores, valores[1:]))
+    ):
+        raise ErroTabela("valores_mao precisa ser uma lista crescente de inteiros a partir de 1.")
+    return TabelaTruco(str(dados.get("versao", "")), hash_, meta, tuple(valores))
+
+
+COMPILADORES: dict[str, Callable[[dict[str, Any], str], Tabela]] = {
+    "slot": compilar_slot,
+    "roleta": compilar_roleta,
+    "truco": compilar_truco,
+}
+
+
+def compilar(conteudo: bytes, formato: str = "toml") -> Tabela:
+    """Valida e compila ``conteudo``; o mesmo conteúdo devolve a mesma tabela do cache."""
+    import hashlib
+
+    hash_ = hashlib.sha256(conteudo).hexdigest()
+    tabela = _COMPILADAS.get(hash_)
+    if tabela is not None:
+        return tabela
+    if formato not in ("toml", "json"):
+        raise ErroTabela(f"Formato de tabela desconhecido: {formato!r}.")
+    try:
+        if formato == "toml":
+            import tomllib
+
+            dados = tomllib.loads(conteudo.decode("utf-8"))
+        else:
+            import json
+
+            dados = json.loads(conteudo)
+    except (UnicodeDecodeError, ValueError) as erro:
+        raise ErroTabela(f"Arquivo ilegível: {erro}") from None
+    if not isinstance(dados, dict):
+        raise ErroTabela("A tabela precisa ser um objeto.")
+    if _campo(dados, "formato", int) != FORMATO_ATUAL:
+        raise ErroTabela(f"Formato {dados['formato']} não suportado (esperado {FORMATO_ATUAL}).")
+    jogo = _campo(dados, "jogo", str)
+    if jogo not in COMPILADORES:
+        raise ErroTabela(f"Jogo sem tabela de pagamentos: {jogo!r}.")
+    return _COMPILADAS.setdefault(hash_, COMPILADORES[jogo](dados, hash_))
+
+
+def carregar(caminho: str | os.PathLike[str]) -> Tabela:
+    """Lê e compila um arquivo ``.toml`` ou ``.json``."""
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    return compilar(conteudo, os.path.splitext(caminho)[1].lstrip(".").lower())
+
+
+def por_hash(hash_: str) -> Tabela:
+    """A tabela de conteúdo ``hash_``, já compilada ou entre os arquivos de ``DIRETORIO``.
+
+    Serve para refazer rodadas gravadas com o hash da tabela; tabelas de
+    fora do diretório precisam ter sido carregadas antes no processo.
+    """
+    tabela = _COMPILADAS.get(hash_)
+    if tabela is None:
+        for nome in sorted(os.listdir(DIRETORIO)):
+            if nome.endswith((".toml", ".json")):
+                carregar(os.path.join(DIRETORIO, nome))
+        tabela = _COMPILADAS.get(hash_)
+    if tabela is None:
+        raise ErroTabela(f"Nenhuma tabela conhecida com o hash {hash_}.")
+    return tabela
+
+
+@cache
+def padrao(jogo: str) -> Any:
+    """A tabela que acompanha o jogo, em ``tabelas/<jogo>.toml``; lida uma vez."""
+    return carregar(os.path.join(DIRETORIO, f"{jogo}.toml"))
+
+
+__all__ = [
+    "ErroTabela",
+    "Tabela",
+    "TabelaRoleta",
+    "TabelaSlot",
+    "TabelaTruco",
+    "carregar",
+    "compilar",
+    "faixa_dos_pesos",
+    "padrao",
+    "por_hash",
+]
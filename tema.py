@@ -0,0 +1,113 @@
+"""Paleta, estilos ttk e fontes compartilhados pelo Hub e pelos jogos.
+
+Estilos do ttk valem para o interpretador Tk inteiro, então basta
+configurá-los uma vez por raiz: ``aplicar_tema`` lembra quais raízes já
+foram configuradas e nas chamadas seguintes só devolve o ``ttk.Style``.
+As fontes viram objetos ``tkfont.Font`` nomeados, criados uma única vez por
+raiz e reaproveitados por todas as janelas.
+"""
+
+from __future__ import annotations
+
+import tkinter as tk
+import weakref
+from tkinter import font as tkfont
+from tkinter import messagebox, ttk
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sessao import ErroSessao
+
+FUNDO = "#1f1f2e"
+SUPERFICIE = "#3d3d5c"
+SUPERFICIE_ATIVA = "#4d4d70"
+TEXTO = "#ffffff"
+TEXTO_ESCURO = "#0f0f1a"
+DESTAQUE = "#00ff88"
+DESTAQUE_ATIVO = "#00cc6a"
+
+_raizes_com_tema: weakref.WeakSet[tk.Misc] = weakref.WeakSet()
+_fontes: weakref.WeakKeyDictionary[tk.Misc, dict[tuple[str, int, tuple[str, ...]], tkfont.Font]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def fonte(widget: tk.Misc, familia: str, tamanho: int, *estilos: str) -> tkfont.Font:
+    """Fonte nomeada compartilhada; ``estilos`` aceita ``"bold"`` e ``"italic"``."""
+    raiz = widget.nametowidget(".")
+    por_raiz = _fontes.setdefault(raiz, {})
+    chave = (familia, tamanho, estilos)
+    objeto = por_raiz.get(chave)
+    if objeto is None:
+        objeto = por_raiz[chave] = tkfont.Font(
+            root=raiz,
+            family=familia,
+            size=tamanho,
+            weight="bold" if "bold" in estilos else "normal",
+            slant="italic" if "italic" in estilos else "roman",
+        )
+    return objeto
+
+
+def aplicar_tema(widget: tk.Misc) -> ttk.Style:
+    """Configura tema e estilos na raiz de ``widget`` apenas na primeira chamada.
+
+    Estilos disponíveis: ``Action.TButton`` (verde), ``Jackpot.TButton``
+    (amarelo, caça-níquel) e ``Danger.TButton`` (vermelho).
+    """
+    raiz = widget.nametowidget(".")
+    estilo = ttk.Style(raiz)
+    if raiz in _raizes_com_tema:
+        return estilo
+    _raizes_com_tema.add(raiz)
+
+    estilo.theme_use("clam")
+    estilo.configure("TFrame", background=FUNDO)
+    estilo.configure("TLabel", background=FUNDO, foreground=TEXTO, font=fonte(raiz, "Segoe UI", 10))
+    estilo.configure(
+        "TButton",
+        font=fonte(raiz, "Segoe UI", 10, "bold"),
+        background=SUPERFICIE,
+        foreground=TEXTO,
+        borderwidth=0,
+    )
+    estilo.map("TButton", background=[("active", SUPERFICIE_ATIVA)])
+    estilo.configure("TCheckbutton", background=FUNDO, foreground=TEXTO, font=fonte(raiz, "Segoe UI", 10))
+    estilo.map("TCheckbutton", background=[("active", FUNDO)])
+    estilo.configure(
+        "Action.TButton",
+        background=DESTAQUE,
+        foreground=TEXTO_ESCURO,
+        font=fonte(raiz, "Segoe UI", 11, "bold"),
+    )
+    estilo.map("Action.TButton", background=[("active", DESTAQUE_ATIVO)])
+    estilo.configure(
+        "Jackpot.TButton",
+        background="#ffcc00",
+        foreground=TEXTO_ESCURO,
+        font=fonte(raiz, "Segoe UI", 12, "bold"),
+    )
+    estilo.map("Jackpot.TButton", background=[("active", "#ffaa00")])
+    estilo.configure("Danger.TButton", background="#ff6b6b", foreground=TEXTO)
+    estilo.map("Danger.TButton", background=[("active", "#ff4444")])
+    return estilo
+
+
+def mostrar_erro(erro: ErroSessao) -> None:
+    """Exibe uma ação recusada pela sessão como aviso ou erro."""
+    exibir = messagebox.showwarning if erro.aviso else messagebox.showerror
+    exibir(erro.titulo, erro.mensagem)
+
+
+__all__ = [
+    "DESTAQUE",
+    "DESTAQUE_ATIVO",
+    "FUNDO",
+    "SUPERFICIE",
+    "SUPERFICIE_ATIVA",
+    "TEXTO",
+    "TEXTO_ESCURO",
+    "aplicar_tema",
+    "fonte",
+    "mostrar_erro",
+]